@@ -73,9 +73,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up from UI."""
     from .storage import DashboardStorage
     from .panel import async_register_panel
+    from .api.views import async_preload_compiler_caches
 
     storage = DashboardStorage(hass, entry.entry_id)
     await storage.async_load()
+    await async_preload_compiler_caches(hass)
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
@@ -94,9 +96,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     from .panel import _unregister_panel
+    from .api.views import shutdown_compile_pool, shutdown_entity_index
 
     _unregister_panel(hass)
+    shutdown_compile_pool()
+    shutdown_entity_index(hass)
     if DOMAIN in hass.data and entry.entry_id in hass.data[DOMAIN]:
+        # Write any debounced project edits before the storage object goes away
+        await hass.data[DOMAIN][entry.entry_id]["storage"].async_flush()
         hass.data[DOMAIN].pop(entry.entry_id)
     if hass.data.get(DOMAIN, {}).get("active_entry_id") == entry.entry_id:
         hass.data[DOMAIN].pop("active_entry_id", None)
@@ -1,9 +1,22 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
 import colorsys
+import contextlib
+import contextvars
+import dataclasses
+import functools
+import heapq
+import itertools
 import json
 import tempfile
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
@@ -38,8 +51,9 @@ except ImportError:
     SECTION_CATEGORIES = {}
 
 
+@functools.lru_cache(maxsize=1)
 def _integration_version() -> str:
-    """Best-effort integration version (from manifest.json)."""
+    """Best-effort integration version (from manifest.json). Read once per process."""
     try:
         manifest_path = Path(__file__).resolve().parent.parent / "manifest.json"
         data = json.loads(manifest_path.read_text("utf-8"))
@@ -48,7 +62,189 @@ def _integration_version() -> str:
         return "0.0.0"
 
 
+# --- Opt-in compile profiling (CompileView ?profile=1 or the compile_profiling option) ---
+
+
+class _CompileProfile:
+    """Wall time, call count and allocated bytes per compiler stage for one compile.
+
+    Stages nest (e.g. lvgl_pages inside sections), so each stage reports inclusive figures.
+    alloc_bytes is the tracemalloc peak above the memory in use when the stage started (0 unless
+    trace_memory; tracemalloc is process-wide, so callers hold _TRACE_MEMORY_LOCK while tracing).
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.stages: dict[str, dict] = {}
+        self.counters: dict[str, int] = {}
+        self.trace_memory = trace_memory
+        self._started_tracing = False
+        self._mem_stack: list[list[int]] = []  # per open stage: [start_current, peak_seen]
+        self._t0 = 0.0
+        self.total_seconds = 0.0
+        self.peak_bytes = 0
+
+    def __enter__(self) -> "_CompileProfile":
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.trace_memory:
+            self._mem_stack.append([tracemalloc.get_traced_memory()[0], 0])
+            tracemalloc.reset_peak()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.total_seconds = time.perf_counter() - self._t0
+        if self.trace_memory:
+            self.peak_bytes = self._pop_mem()
+            if self._started_tracing:
+                tracemalloc.stop()
+
+    def _push_mem(self) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        if self._mem_stack:
+            self._mem_stack[-1][1] = max(self._mem_stack[-1][1], peak)
+        self._mem_stack.append([current, 0])
+        tracemalloc.reset_peak()
+
+    def _pop_mem(self) -> int:
+        start, seen = self._mem_stack.pop()
+        peak = max(seen, tracemalloc.get_traced_memory()[1])
+        if self._mem_stack:
+            self._mem_stack[-1][1] = max(self._mem_stack[-1][1], peak)
+        return max(0, peak - start)
+
+    def count(self, name: str) -> None:
+        self.counters[name] = self.counters.get(name, 0) + 1
+
+    def call(self, name: str, fn, *args, **kwargs):
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            self._push_mem()
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - t0
+            alloc = self._pop_mem() if tracing else 0
+            st = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0, "alloc_bytes": 0})
+            st["seconds"] += elapsed
+            st["calls"] += 1
+            st["alloc_bytes"] = max(st["alloc_bytes"], alloc)
+
+    def as_dict(self) -> dict:
+        return {
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "memory_traced": self.trace_memory,
+            "peak_bytes": self.peak_bytes,
+            "stages": {
+                name: {"ms": round(st["seconds"] * 1000, 3), "calls": st["calls"], "alloc_bytes": st["alloc_bytes"]}
+                for name, st in sorted(self.stages.items(), key=lambda kv: -kv[1]["seconds"])
+            },
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+
+_ACTIVE_PROFILE: contextvars.ContextVar[_CompileProfile | None] = contextvars.ContextVar(
+    "etd_compile_profile", default=None
+)
+# tracemalloc start/reset_peak/stop act on the whole process: one memory-traced compile at a time.
+_TRACE_MEMORY_LOCK = threading.Lock()
+
+# Set by _CompilePool inside worker threads; a set event aborts the compile at the next stage.
+_COMPILE_CANCEL: contextvars.ContextVar[threading.Event | None] = contextvars.ContextVar(
+    "etd_compile_cancel", default=None
+)
+
+
+class CompileSuperseded(Exception):
+    """A preview compile was abandoned because a newer one for the same device arrived."""
+
+
+def _profiled(stage: str):
+    """Record fn as compiler stage `stage` while a profile is active; a plain call otherwise.
+
+    Stage entry is also the cancellation point for superseded pool compiles.
+    """
+
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            cancel = _COMPILE_CANCEL.get()
+            if cancel is not None and cancel.is_set():
+                raise CompileSuperseded(stage)
+            profile = _ACTIVE_PROFILE.get()
+            if profile is None:
+                return fn(*args, **kwargs)
+            return profile.call(stage, fn, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def _profile_count(name: str) -> None:
+    profile = _ACTIVE_PROFILE.get()
+    if profile is not None:
+        profile.count(name)
+
+
+class _ProfileHistory:
+    """Rolling window of recent compile profiles, summarised as per-stage latency histograms."""
+
+    # histogram[i] counts compiles with stage time <= BUCKETS_MS[i]; the last slot is the overflow.
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self, window: int = 200) -> None:
+        self._profiles: deque[dict[str, float]] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.window = window
+
+    def record(self, profile: _CompileProfile) -> None:
+        sample = {name: st["seconds"] * 1000 for name, st in profile.stages.items()}
+        sample["total"] = profile.total_seconds * 1000
+        with self._lock:
+            self._profiles.append(sample)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            samples = list(self._profiles)
+        by_stage: dict[str, list[float]] = {}
+        for sample in samples:
+            for name, ms in sample.items():
+                by_stage.setdefault(name, []).append(ms)
+        stages = {}
+        for name, values in sorted(by_stage.items()):
+            values.sort()
+            histogram = [0] * (len(self.BUCKETS_MS) + 1)
+            for ms in values:
+                histogram[bisect.bisect_left(self.BUCKETS_MS, ms)] += 1
+            stages[name] = {
+                "count": len(values),
+                "p50_ms": round(values[len(values) // 2], 3),
+                "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))], 3),
+                "max_ms": round(values[-1], 3),
+                "histogram": histogram,
+            }
+        return {"profiles": len(samples), "window": self.window, "buckets_ms": list(self.BUCKETS_MS), "stages": stages}
+
+
+_PROFILE_HISTORY = _ProfileHistory()
+
+
 def list_builtin_recipes() -> list[dict]:
+    """Builtin recipes (id, name, kind, path): from the precompiled bundle when it is current."""
+    bundled = _BUILTIN_BUNDLE.listing()
+    if bundled is not None:
+        return bundled
+    return _scan_builtin_recipes()
+
+
+def _scan_builtin_recipes() -> list[dict]:
     label_map = {
         "sunton_2432s028r_320x240": 'Sunton ESP32-2432S028R (2.8" 320x240)',
         "elecrow_dis05035h_480x320": 'Elecrow CrowPanel DIS05035H (3.5" 480x320)',
@@ -90,12 +286,20 @@ def _section_full_block(key: str, body: str) -> str:
     return key + ":\n" + (body or "").rstrip()
 
 
+# Line breaks str.splitlines() honours besides "\n"; bodies without them can be sliced instead of split and re-joined.
+_OTHER_LINE_BREAKS_RE = re.compile("[\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
+
+
 def _section_body_from_value(value: str | None, key: str) -> str:
     """Extract body from stored value. If value is full block (starts with 'key:'), return lines after first (indent preserved); else return value (legacy body-only)."""
     if not value or not value.strip():
         return ""
     s = value.strip()
     if s.startswith(key + ":") or s.startswith(key + " :"):
+        if not _OTHER_LINE_BREAKS_RE.search(s):
+            # Plain "\n" text (e.g. the compiled lvgl body): slice off the header line, no re-split.
+            nl = s.find("\n")
+            return s[nl + 1:].rstrip() if nl >= 0 else ""
         lines = s.splitlines()
         if len(lines) <= 1:
             return ""
@@ -136,24 +340,141 @@ SECTION_KEYS_WITH_WIDGET_REF: tuple[str, ...] = (
 _WIDGET_REF_RE = re.compile(r"widget:\s*[\"']?([a-zA-Z0-9_]+)[\"']?")
 
 
-def _collect_widget_ids_from_project(project: dict) -> set[str]:
-    """Recursively collect all widget ids from project.pages[].widgets (including nested widgets)."""
-    ids: set[str] = set()
-    pages = project.get("pages") or []
-    if not isinstance(pages, list):
-        return ids
+def _widget_option_list(w: dict) -> list[str]:
+    """Dropdown/roller options from props.options (newline string or list); never empty."""
+    props = w.get("props") or {}
+    opts = props.get("options") or ["Option A", "Option B"]
+    if isinstance(opts, str):
+        opts = [s.strip() for s in opts.replace("\\n", "\n").split("\n") if s.strip()]
+    else:
+        opts = [str(o).strip() for o in opts if str(o).strip()]
+    return opts if opts else ["(none)"]
+
 
-    def collect(widgets: list) -> None:
-        for w in widgets or []:
-            if isinstance(w, dict) and w.get("id"):
-                ids.add(str(w["id"]).strip())
-            if isinstance(w, dict):
-                collect(w.get("widgets") or [])
+def _parse_asset_font(value) -> tuple[str, int] | None:
+    """Parse a props.font descriptor "asset:<filename>:<size>" into (filename, size), or None."""
+    if not isinstance(value, str):
+        return None
+    f = value.strip()
+    if not f.startswith("asset:"):
+        return None
+    try:
+        _, rest = f.split("asset:", 1)
+        filename, size_s = rest.rsplit(":", 1)
+        filename = filename.strip()
+        size = int(size_s.strip())
+    except Exception:
+        return None
+    if not filename or size <= 0:
+        return None
+    return filename, size
+
+
+@dataclass
+class ProjectIndex:
+    """Everything the compiler stages need from the widget tree, built in one traversal.
+
+    Covers every page (flat parent_id children and nested `widgets` lists) plus
+    lvgl_config.top_layer, so no stage only sees top-level page widgets.
+    """
+
+    widgets: list[dict] = field(default_factory=list)  # pages (pre-order) then top_layer
+    ids: set[str] = field(default_factory=set)
+    type_by_id: dict[str, str] = field(default_factory=dict)
+    parent_by_id: dict[str, str] = field(default_factory=dict)
+    widget_by_id: dict[str, dict] = field(default_factory=dict)  # stripped id -> first widget with it
+    options_by_id: dict[str, list[str]] = field(default_factory=dict)  # dropdown + roller
+    dropdown_options: dict[str, list[str]] = field(default_factory=dict)
+    roller_options: dict[str, list[str]] = field(default_factory=dict)
+    container_spinbox_child: dict[str, str] = field(default_factory=dict)
+    font_refs: set[tuple[str, int]] = field(default_factory=set)
+    image_assets: dict[str, str] = field(default_factory=dict)  # asset id -> filename
+    action_bindings_by_widget: dict[str, list[dict]] = field(default_factory=dict)
+    on_click_bound: set[str] = field(default_factory=set)
+    links_by_entity: dict[str, list[dict]] = field(default_factory=dict)
+    # Per emitted widget list (one per page, then top_layer): parent_id -> direct children, in order.
+    page_children: list[dict[str, list[dict]]] = field(default_factory=list)
+    top_layer_children: dict[str, list[dict]] = field(default_factory=dict)
+
+    @classmethod
+    @_profiled("index")
+    def build(cls, project: dict) -> "ProjectIndex":
+        idx = cls()
+
+        def visit(widgets: list, nest_parent: str, children: dict[str, list[dict]] | None) -> None:
+            for w in widgets or []:
+                if not isinstance(w, dict):
+                    continue
+                idx.widgets.append(w)
+                raw_id = w.get("id")
+                wid = str(raw_id).strip() if raw_id else ""
+                wtype = str(w.get("type") or "")
+                parent = str(w.get("parent_id") or "") or nest_parent
+                if children is not None and w.get("parent_id"):
+                    children.setdefault(str(w["parent_id"]), []).append(w)
+                if raw_id:
+                    idx.ids.add(wid)
+                    key = str(raw_id)
+                    idx.type_by_id[key] = wtype or "label"
+                    if parent:
+                        idx.parent_by_id[key] = parent
+                    idx.widget_by_id.setdefault(wid, w)
+                    if wtype in ("dropdown", "roller"):
+                        opts = _widget_option_list(w)
+                        idx.options_by_id[key] = opts
+                        (idx.dropdown_options if wtype == "dropdown" else idx.roller_options)[key] = opts
+                    if wtype == "spinbox" and w.get("parent_id"):
+                        idx.container_spinbox_child[str(w["parent_id"])] = key
+                props = w.get("props") or {}
+                style = w.get("style") or {}
+                for font_value in (props.get("font"), style.get("text_font"), style.get("label_text_font")):
+                    font = _parse_asset_font(font_value)
+                    if font:
+                        idx.font_refs.add(font)
+                if wtype == "image":
+                    src = str(props.get("src") or "").strip()
+                    if src.startswith("asset:"):
+                        fn = src.split(":", 1)[1].strip()
+                        if fn:
+                            idx.image_assets["asset_" + _safe_id(fn)] = fn
+                visit(w.get("widgets") or [], str(raw_id or ""), None)
+
+        pages = project.get("pages") or []
+        for page in pages if isinstance(pages, list) else []:
+            children: dict[str, list[dict]] = {}
+            idx.page_children.append(children)
+            if isinstance(page, dict):
+                visit(page.get("widgets") or [], "", children)
+        top_layer = (project.get("lvgl_config") or {}).get("top_layer") or {}
+        tl_widgets = top_layer.get("widgets") or [] if isinstance(top_layer, dict) else []
+        visit(tl_widgets if isinstance(tl_widgets, list) else [], "", idx.top_layer_children)
+
+        for ab in project.get("action_bindings") or []:
+            if not isinstance(ab, dict):
+                continue
+            wid = str(ab.get("widget_id") or "").strip()
+            if not wid:
+                continue
+            idx.action_bindings_by_widget.setdefault(wid, []).append(ab)
+            if str(ab.get("event") or "").strip().lower() == "on_click":
+                idx.on_click_bound.add(wid)
 
-    for p in pages:
-        if isinstance(p, dict):
-            collect(p.get("widgets") or [])
-    return ids
+        links = project.get("links") or []
+        for ln in links if isinstance(links, list) else []:
+            if not isinstance(ln, dict):
+                continue
+            eid = str((ln.get("source") or {}).get("entity_id") or "").strip()
+            if eid and "." in eid:
+                idx.links_by_entity.setdefault(eid, []).append(ln)
+        return idx
+
+    def widgets_of_type(self, wtype: str) -> list[dict]:
+        return [w for w in self.widgets if str(w.get("type") or "") == wtype]
+
+
+def _collect_widget_ids_from_project(project: dict, index: ProjectIndex | None = None) -> set[str]:
+    """All widget ids in the project (pages, nested widgets and top_layer)."""
+    return (index or ProjectIndex.build(project)).ids
 
 
 def _widget_refs_in_block(block: str) -> list[str]:
@@ -250,6 +571,7 @@ def _remove_orphaned_widget_refs_from_esphome_components(project: dict) -> list[
     return removed
 
 
+@_profiled("warnings")
 def _compile_warnings(project: dict) -> list[dict]:
     """Return list of warnings for compile (e.g. widget: refs in project.sections that point to non-existent widgets)."""
     warnings: list[dict] = []
@@ -295,6 +617,7 @@ def _display_id_from_recipe(recipe_text: str) -> str | None:
     return None
 
 
+@_profiled("recipe_parse")
 def _parse_recipe_into_sections(recipe_text: str) -> dict[str, str]:
     """Split recipe YAML into top-level key -> content (content = lines under key, indent preserved)."""
     sections: dict[str, str] = {}
@@ -322,6 +645,86 @@ def _parse_recipe_into_sections(recipe_text: str) -> dict[str, str]:
     return sections
 
 
+class _RecipeAnalysis:
+    """Parsed sections, display id and metadata per recipe text, computed once per process.
+
+    Keyed by the sha256 of the recipe text, so the same recipe (builtin or user, after any user
+    injection) is split into sections and YAML-parsed for metadata only on first use, however
+    many compiles, section-engine passes and project GETs read it. Bounded LRU over texts.
+    Callers get copies and may modify them.
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def seed(self, text_sha256: str, values: dict) -> None:
+        """Preload analysis results computed elsewhere (the builtin recipe bundle)."""
+        with self._lock:
+            self._entries.setdefault(text_sha256, {}).update(values)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get(self, recipe_text: str, name: str, build):
+        key = sha256(recipe_text or "")
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if name in entry:
+                    self.hits += 1
+                    _profile_count("memo_hit:recipe")
+                    return entry[name]
+            self.misses += 1
+        _profile_count("memo_miss:recipe")
+        value = build(recipe_text or "")
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            self._entries.move_to_end(key)
+            entry[name] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def sections(self, recipe_text: str) -> dict[str, str]:
+        """_parse_recipe_into_sections(recipe_text)."""
+        return dict(self._get(recipe_text, "sections", _parse_recipe_into_sections))
+
+    def display_id(self, recipe_text: str) -> str | None:
+        """_display_id_from_recipe(recipe_text)."""
+        return self._get(recipe_text, "display_id", _display_id_from_recipe)
+
+    def default_pieces(self, recipe_text: str) -> dict[str, str]:
+        """_recipe_default_pieces(recipe_text)."""
+        return dict(self._get(recipe_text, "default_pieces", _recipe_default_pieces))
+
+    def metadata(self, recipe_text: str, recipe_id: str | None = None) -> dict:
+        """_extract_recipe_metadata_from_text(recipe_text, recipe_id) (board, resolution, label, ...)."""
+        meta = self._get(
+            recipe_text, f"metadata:{recipe_id or ''}",
+            lambda text: _extract_recipe_metadata_from_text(text, recipe_id=recipe_id),
+        )
+        return {k: (dict(v) if isinstance(v, dict) else list(v) if isinstance(v, list) else v) for k, v in meta.items()}
+
+    def resolution(self, recipe_text: str, recipe_id: str | None = None) -> dict | None:
+        res = self.metadata(recipe_text, recipe_id).get("resolution")
+        return res if isinstance(res, dict) else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+
+
+_RECIPE_ANALYSIS = _RecipeAnalysis()
+
+
 def _yaml_str_to_section_map(yaml_str: str, merge_duplicate_keys: bool = False) -> dict[str, str]:
     """Split a multi-section YAML string (e.g. compiler output) into key -> content.
     Content is the body under each key (first line after 'key:' onward until next key).
@@ -401,39 +804,192 @@ def _strip_section_key(block: str, key: str) -> str:
     return block.strip()
 
 
+# Top-level keys of a list item that identify it across compiler and user copies. entity_id is not
+# one of them: several items may read one entity (e.g. different attributes of a climate entity).
+_LIST_ITEM_KEY_FIELDS = ("platform", "id", "widget")
+_LIST_ITEM_FIELD_RE = re.compile(r"(platform|id|widget)\s*:\s*(.*?)\s*(?:#.*)?$")
+
+
+def _split_list_items(body: str) -> list[str]:
+    """Split a list-section body into its items (each starting at a "  - " line), one pass over the lines.
+    Text before the first "  - " line belongs to the first item; items are stripped and re-prefixed with "  - "
+    (a first item that starts with "- " too, so a user's first item can take a compiler item's place)."""
+    if not (body or "").strip():
+        return []
+    items: list[str] = []
+    current: list[str] = []
+    for ln in body.strip().split("\n"):
+        if current and ln.startswith("  - "):
+            items.append("\n".join(current))
+            current = [ln[4:]]
+        else:
+            current.append(ln)
+    items.append("\n".join(current))
+    first = items[0].strip()
+    out = ["  " + first if first.startswith("- ") else first]
+    for item in items[1:]:
+        if item.strip():
+            out.append("  - " + item.strip())
+    return out
+
+
+def _list_item_key(item: str) -> tuple | None:
+    """(platform, id, widget) from the item's own top-level keys; None when it has neither id nor widget.
+    Nested keys (e.g. an id inside on_value actions) are ignored: only the first line and lines at the item's
+    shallowest body indent are read."""
+    lines = item.split("\n")
+    fields: dict[str, str] = {}
+    first = lines[0].lstrip()
+    if first.startswith("- "):
+        m = _LIST_ITEM_FIELD_RE.match(first[2:].lstrip())
+        if m:
+            fields[m.group(1)] = m.group(2)
+    body_lines = [ln for ln in lines[1:] if ln.strip() and not ln.lstrip().startswith("#")]
+    if body_lines:
+        body_indent = min(len(ln) - len(ln.lstrip()) for ln in body_lines)
+        for ln in body_lines:
+            if len(ln) - len(ln.lstrip()) != body_indent:
+                continue
+            m = _LIST_ITEM_FIELD_RE.match(ln[body_indent:])
+            if m and m.group(1) not in fields:
+                fields[m.group(1)] = m.group(2)
+    if not (fields.get("id") or fields.get("widget")):
+        return None
+    return tuple(fields.get(k, "").strip("\"'") or None for k in _LIST_ITEM_KEY_FIELDS)
+
+
+_ITEM_TOP_KEY_RE = re.compile(r"([\w-]+)\s*:")
+
+
+def _item_top_level_blocks(item: str) -> tuple[int, list[tuple[str | None, list[str]]]]:
+    """(body indent, [(top-level key, lines)]) for one list item. The "- key: value" line becomes a
+    block of its own written at the body indent; comments and nested lines stay with the key above."""
+    lines = item.split("\n")
+    first = lines[0].lstrip()
+    first = first[2:].lstrip() if first.startswith("- ") else first
+    body = [ln for ln in lines[1:] if ln.strip() and not ln.lstrip().startswith("#")]
+    indent = min((len(ln) - len(ln.lstrip()) for ln in body), default=len(lines[0]) - len(lines[0].lstrip()) + 2)
+    blocks: list[tuple[str | None, list[str]]] = []
+    m = _ITEM_TOP_KEY_RE.match(first)
+    blocks.append((m.group(1) if m else None, [" " * indent + first]))
+    for ln in lines[1:]:
+        m = _ITEM_TOP_KEY_RE.match(ln[indent:]) if len(ln) - len(ln.lstrip()) == indent else None
+        if m:
+            blocks.append((m.group(1), [ln]))
+        else:
+            blocks[-1][1].append(ln)
+    return indent, blocks
+
+
+def _reindent_block(lines: list[str], from_indent: int, to_indent: int) -> list[str]:
+    """Lines of one top-level block moved from one item body indent to another."""
+    if from_indent == to_indent:
+        return list(lines)
+    out = []
+    for ln in lines:
+        shift = min(len(ln) - len(ln.lstrip()), from_indent)
+        out.append(" " * to_indent + ln[shift:] if ln.strip() else ln)
+    return out
+
+
+def _item_actions(lines: list[str]) -> tuple[int, int, list[list[str]]] | None:
+    """(insert index, action indent, actions) of an on_* block: the "- " items under its "then:", or
+    directly under the key. None when the block has no action list this can read (inline values)."""
+    nested = [(i, ln) for i, ln in enumerate(lines) if i and ln.strip() and not ln.lstrip().startswith("#")]
+    if not nested:
+        return None
+    start, head = nested[0]
+    if head.strip() == "then:":
+        then_indent = len(head) - len(head.lstrip())
+        nested = [(i, ln) for i, ln in nested if i > start]
+        if any(len(ln) - len(ln.lstrip()) < then_indent for _, ln in nested):
+            return None
+    if not nested or not nested[0][1].lstrip().startswith("- "):
+        return None
+    indent = len(nested[0][1]) - len(nested[0][1].lstrip())
+    actions: list[list[str]] = []
+    for _, ln in nested:
+        if len(ln) - len(ln.lstrip()) == indent and ln.lstrip().startswith("- "):
+            actions.append([ln])
+        elif len(ln) - len(ln.lstrip()) > indent:
+            actions[-1].append(ln)
+        else:
+            return None
+    return nested[-1][0] + 1, indent, actions
+
+
+def _merge_action_block(user_lines: list[str], auto_lines: list[str]) -> list[str]:
+    """The user's on_* block with the compiler's actions it does not already contain appended."""
+    user = _item_actions(user_lines)
+    auto = _item_actions(auto_lines)
+    if user is None or auto is None:
+        return user_lines
+    insert_at, indent, user_actions = user
+    _, auto_indent, auto_actions = auto
+    have = {" ".join(" ".join(action).split()) for action in user_actions}
+    added: list[str] = []
+    for action in auto_actions:
+        if " ".join(" ".join(action).split()) in have:
+            continue
+        for ln in action:
+            added.append(" " * indent + ln[auto_indent:] if ln.strip() else ln)
+    return user_lines[:insert_at] + added + user_lines[insert_at:]
+
+
+def _layer_user_item(auto_item: str, user_item: str) -> str:
+    """The user's copy of a compiler item, with what the compiler has and the copy lacks added.
+
+    The user's text and values win for every key the copy writes; for on_* action keys the compiler's
+    actions missing from the user's list are appended (so bindings added after the copy was saved still
+    update their widgets); top-level keys only the compiler writes are appended at the user's indent.
+    """
+    auto_indent, auto_blocks = _item_top_level_blocks(auto_item)
+    auto_by_key = {key: lines for key, lines in auto_blocks if key is not None}
+    indent, user_blocks = _item_top_level_blocks(user_item)
+    user_keys = {key for key, _ in user_blocks}
+    first = user_item.split("\n", 1)[0]
+    out: list[str] = []
+    for n, (key, lines) in enumerate(user_blocks):
+        if key is not None and key.startswith("on_") and key in auto_by_key:
+            lines = _merge_action_block(lines, _reindent_block(auto_by_key[key], auto_indent, indent))
+        out.extend([first] + lines[1:] if n == 0 else lines)
+    for key, lines in auto_blocks:
+        if key is not None and key not in user_keys:
+            out.extend(_reindent_block(lines, auto_indent, indent))
+    return "\n".join(out)
+
+
+@_profiled("list_merge")
 def _merge_list_section_bodies(auto_body: str, user_body: str) -> str:
     """Merge two list-section bodies (e.g. sensor, light, switch) and deduplicate list items.
 
     When project.sections contains the same content as recipe/compiler (e.g. after Create Component
     sync or panel default), concatenating would emit duplicate blocks and break esphome config.
-    We split each body into YAML list items (lines starting with '  - ') and emit each unique
-    block once (order: auto items first, then user items not already present).
+    Items are keyed by (platform, id, widget) in one pass: auto items first, then user
+    items. A user item with the key of an auto item is layered onto it (_layer_user_item: the
+    user's values win, the compiler's missing actions and keys are added); a later user item with the key of an
+    earlier user item replaces it in place. Items without an id or widget are deduplicated on
+    whitespace-normalized text.
     """
-    def _split_items(body: str) -> list[str]:
-        if not (body or "").strip():
-            return []
-        b = body.strip()
-        parts = b.split("\n  - ")
-        if not parts:
-            return []
-        items = [parts[0].strip()]
-        for p in parts[1:]:
-            if p.strip():
-                items.append("  - " + p.strip())
-        return items
-
-    def _normalize(item: str) -> str:
-        return re.sub(r"\s+", " ", item.strip()) if item else ""
-
-    auto_items = _split_items(auto_body)
-    user_items = _split_items(user_body)
-    seen: set[str] = set()
     out: list[str] = []
-    for item in auto_items + user_items:
-        norm = _normalize(item)
-        if norm and norm not in seen:
-            seen.add(norm)
+    from_auto: list[bool] = []
+    slot_by_key: dict[tuple | str, int] = {}
+    auto_items = _split_list_items(auto_body)
+    for n, item in enumerate(auto_items + _split_list_items(user_body)):
+        if not item:
+            continue
+        is_auto = n < len(auto_items)
+        key = _list_item_key(item) or " ".join(item.split())
+        slot = slot_by_key.get(key)
+        if slot is None:
+            slot_by_key[key] = len(out)
             out.append(item)
+            from_auto.append(is_auto)
+        elif from_auto[slot] and not is_auto and isinstance(key, tuple):
+            out[slot] = _layer_user_item(out[slot], item)
+        else:
+            out[slot] = item
+            from_auto[slot] = is_auto
     return "\n\n".join(out).rstrip() if out else ""
 
 
@@ -536,7 +1092,8 @@ def _safe_id(s: str) -> str:
 
 
 
-def _compile_ha_bindings(project: dict) -> str:
+@_profiled("ha_bindings")
+def _compile_ha_bindings(project: dict, index: ProjectIndex | None = None) -> str:
     """Generate ESPHome homeassistant sensors for bound entities + attach live-update triggers.
 
     v0.9 scope:
@@ -573,84 +1130,13 @@ def _compile_ha_bindings(project: dict) -> str:
             continue
         link_map.setdefault((kind, entity_id, attr), []).append(ln)
 
-    # Widget id -> type (label, button, arc, slider, ...) for correct lvgl.*.update
-    def _collect_widget_types(widgets: list, m: dict[str, str]) -> None:
-        for w in widgets or []:
-            if not isinstance(w, dict):
-                continue
-            if w.get("id"):
-                m[str(w["id"])] = str(w.get("type") or "label")
-            _collect_widget_types(w.get("widgets") or [], m)
-
-    def _widget_type_map() -> dict[str, str]:
-        m: dict[str, str] = {}
-        for page in project.get("pages") or []:
-            if isinstance(page, dict):
-                _collect_widget_types(page.get("widgets") or [], m)
-        return m
-
-    # Widget id -> list of option strings (for dropdowns); used to emit selected_index lambda from text.
-    def _collect_dropdown_options(widgets: list, m: dict[str, list[str]]) -> None:
-        for w in widgets or []:
-            if not isinstance(w, dict):
-                continue
-            if w.get("type") == "dropdown" and w.get("id"):
-                props = w.get("props") or {}
-                opts = props.get("options") or ["Option A", "Option B"]
-                if isinstance(opts, str):
-                    opts = [s.strip() for s in opts.replace("\\n", "\n").split("\n") if s.strip()]
-                else:
-                    opts = [str(o).strip() for o in opts if str(o).strip()]
-                m[str(w["id"])] = opts if opts else ["(none)"]
-            _collect_dropdown_options(w.get("widgets") or [], m)
-
-    def _dropdown_options_map() -> dict[str, list[str]]:
-        m: dict[str, list[str]] = {}
-        for page in project.get("pages") or []:
-            if isinstance(page, dict):
-                _collect_dropdown_options(page.get("widgets") or [], m)
-        return m
-
-    def _collect_roller_options(widgets: list, m: dict[str, list[str]]) -> None:
-        for w in widgets or []:
-            if not isinstance(w, dict):
-                continue
-            if w.get("type") == "roller" and w.get("id"):
-                props = w.get("props") or {}
-                opts = props.get("options") or ["Option A", "Option B"]
-                if isinstance(opts, str):
-                    opts = [s.strip() for s in opts.replace("\\n", "\n").split("\n") if s.strip()]
-                else:
-                    opts = [str(o).strip() for o in opts if str(o).strip()]
-                m[str(w["id"])] = opts if opts else ["(none)"]
-            _collect_roller_options(w.get("widgets") or [], m)
-
-    def _roller_options_map() -> dict[str, list[str]]:
-        m: dict[str, list[str]] = {}
-        for page in project.get("pages") or []:
-            if isinstance(page, dict):
-                _collect_roller_options(page.get("widgets") or [], m)
-        return m
-
-    widget_type_by_id = _widget_type_map()
-    dropdown_options_by_id = _dropdown_options_map()
-    roller_options_by_id = _roller_options_map()
-
-    # Container id -> spinbox child id (for "Spinbox with +/-" prebuilt: link targets container, we update the spinbox child)
-    def _container_spinbox_child_map() -> dict[str, str]:
-        out: dict[str, str] = {}
-        for page in project.get("pages") or []:
-            if not isinstance(page, dict):
-                continue
-            for w in page.get("widgets") or []:
-                if not isinstance(w, dict):
-                    continue
-                pid = w.get("parent_id")
-                if pid and str(w.get("type") or "") == "spinbox" and w.get("id"):
-                    out[str(pid)] = str(w["id"])
-        return out
-
-    container_spinbox_child = _container_spinbox_child_map()
+    # Widget id -> type (for correct lvgl.*.update), dropdown/roller options (selected_index lambda from text)
+    # and container -> spinbox child ("Spinbox with +/-" prebuilt: link targets container, we update the child).
+    index = index or ProjectIndex.build(project)
+    widget_type_by_id = index.type_by_id
+    dropdown_options_by_id = index.dropdown_options
+    roller_options_by_id = index.roller_options
+    container_spinbox_child = index.container_spinbox_child
 
     def emit_lvgl_updates(kind: str, entity_id: str, attr: str) -> str:
         # After caller adds "  ": "- if:" at 8, condition/then at 12, lambda/- lvgl at 14, id/text at 18 (2 under lvgl key)
@@ -970,6 +1456,7 @@ def _compile_ha_bindings(project: dict) -> str:
     return "".join(out).rstrip() + "\n" if any(out) else ""
 
 
+@_profiled("scripts")
 def _compile_scripts(project: dict) -> str:
     """Emit ESPHome script: block for project.scripts (e.g. thermostat +/- setpoint inc/dec).
 
@@ -1102,36 +1589,14 @@ def _merge_scripts_into_rest(rest: str, scripts_yaml: str) -> str:
     return "".join(new_lines)
 
 
-def _all_widgets_flat(project: dict) -> list[dict]:
-    """Return a flat list of all widgets from pages and top_layer, each with '_parent_id' set."""
-    out: list[dict] = []
-
-    def collect(widgets: list, parent_id: str = "") -> None:
-        for w in widgets or []:
-            if not isinstance(w, dict):
-                continue
-            w_copy = dict(w)
-            w_copy["_parent_id"] = parent_id
-            out.append(w_copy)
-            collect(w.get("widgets") or [], w.get("id") or "")
-
-    for page in project.get("pages") or []:
-        if isinstance(page, dict):
-            collect(page.get("widgets") or [], "")
-    top_layer = (project.get("lvgl_config") or {}).get("top_layer") or {}
-    collect(top_layer.get("widgets") or [], "")
-
-    return out
-
-
-def _compile_wifi_prebuilt_intervals(project: dict) -> str:
+def _compile_wifi_prebuilt_intervals(project: dict, index: ProjectIndex | None = None) -> str:
     """Generate interval YAML for WiFi bar and WiFi fan from current project widget IDs.
     Avoids stale IDs when stored esphome_components had intervals from an older widget set.
     """
-    widgets = _all_widgets_flat(project)
+    index = index or ProjectIndex.build(project)
     by_parent: dict[str, list[dict]] = {}
-    for w in widgets:
-        pid = str(w.get("_parent_id") or "")
+    for w in index.widgets:
+        pid = index.parent_by_id.get(str(w.get("id") or ""), "")
         by_parent.setdefault(pid, []).append(w)
 
     lines: list[str] = []
@@ -1180,7 +1645,10 @@ def _is_wifi_bar_fan_interval_block(yaml_str: str) -> bool:
     return False
 
 
-def _compile_prebuilt_components(project: dict, include_user_components: bool = True) -> str:
+@_profiled("prebuilt")
+def _compile_prebuilt_components(
+    project: dict, include_user_components: bool = True, index: ProjectIndex | None = None
+) -> str:
     """Compile ESPHome components from prebuilt widgets (sensors, intervals, etc.).
 
     project.esphome_components is an array of raw YAML strings (or dicts with 'yaml' key).
@@ -1225,7 +1693,7 @@ def _compile_prebuilt_components(project: dict, include_user_components: bool =
         out_blocks.append(yaml_str)
 
     # Generate WiFi bar/fan intervals from current project widgets so IDs always match
-    wifi_interval_yaml = _compile_wifi_prebuilt_intervals(project)
+    wifi_interval_yaml = _compile_wifi_prebuilt_intervals(project, index)
     if wifi_interval_yaml.strip():
         out_blocks.append(wifi_interval_yaml.strip())
 
@@ -1266,41 +1734,206 @@ def _compile_prebuilt_components(project: dict, include_user_components: bool =
     return auto_header + user_header
 
 
+# Incremental section compile: each producer below declares the project inputs it reads; its
+# output is memoized by a fingerprint of exactly those inputs, so a geometry-only edit (move or
+# resize a widget) only regenerates lvgl while sensors/globals/scripts/intervals/fonts/images
+# are served from the memo.
+_GEOMETRY_KEYS = ("x", "y", "w", "h")
+_WIFI_PREBUILT_PREFIXES = ("wifi_bar_", "wifi_fan_arc_")
+
+
+def _strip_widget_geometry(widgets: list) -> list:
+    """Copy of a widget tree without x/y/w/h (what non-lvgl producers are allowed to depend on)."""
+    out: list = []
+    for w in widgets or []:
+        if not isinstance(w, dict):
+            out.append(w)
+            continue
+        c = {k: v for k, v in w.items() if k not in _GEOMETRY_KEYS}
+        if isinstance(w.get("widgets"), list):
+            c["widgets"] = _strip_widget_geometry(w["widgets"])
+        out.append(c)
+    return out
+
+
+def _widget_structure_input(inputs: "_SectionInputs") -> list:
+    project = inputs.project
+    pages = [
+        {**page, "widgets": _strip_widget_geometry(page.get("widgets") or [])} if isinstance(page, dict) else page
+        for page in (project.get("pages") or [])
+    ]
+    top_layer = (project.get("lvgl_config") or {}).get("top_layer") or {}
+    return [pages, _strip_widget_geometry(top_layer.get("widgets") or [])]
+
+
+def _wifi_geometry_input(inputs: "_SectionInputs") -> list:
+    return [
+        [w.get("id")] + [w.get(k) for k in _GEOMETRY_KEYS]
+        for w in inputs.index.widgets
+        if str(w.get("id") or "").startswith(_WIFI_PREBUILT_PREFIXES)
+    ]
+
+
+def _project_key_input(key: str):
+    return lambda inputs: inputs.project.get(key)
+
+
+_SECTION_INPUTS = {
+    "widget_structure": _widget_structure_input,
+    "wifi_geometry": _wifi_geometry_input,
+    # Bumped whenever a widget schema file is reloaded, so emitted widgets follow schema edits
+    "widget_schemas": lambda inputs: _WIDGET_SCHEMAS.current_generation(),
+    **{
+        key: _project_key_input(key)
+        for key in (
+            "pages", "links", "bindings", "action_bindings", "esphome_components", "lvgl_config",
+            "scripts", "disp_bg_color", "hardware", "device",
+        )
+    },
+}
+
+
+class _SectionMemo:
+    """Per-producer memo of section outputs keyed by the fingerprint of the producer's inputs."""
+
+    def __init__(self, max_entries_per_producer: int = 16) -> None:
+        self.max_entries = max_entries_per_producer
+        self._entries: dict[str, OrderedDict[str, object]] = {}
+        self._lock = threading.Lock()
+        self.hits: dict[str, int] = {}
+        self.misses: dict[str, int] = {}
+
+    def get_or_build(self, name: str, fingerprint: str, build):
+        with self._lock:
+            bucket = self._entries.setdefault(name, OrderedDict())
+            if fingerprint in bucket:
+                bucket.move_to_end(fingerprint)
+                self.hits[name] = self.hits.get(name, 0) + 1
+                _profile_count(f"memo_hit:{name}")
+                return bucket[fingerprint]
+            self.misses[name] = self.misses.get(name, 0) + 1
+        _profile_count(f"memo_miss:{name}")
+        value = build()
+        with self._lock:
+            bucket = self._entries.setdefault(name, OrderedDict())
+            bucket[fingerprint] = value
+            while len(bucket) > self.max_entries:
+                bucket.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            names = sorted(set(self.hits) | set(self.misses))
+            return {n: {"hits": self.hits.get(n, 0), "misses": self.misses.get(n, 0)} for n in names}
+
+
+_SECTION_MEMO = _SectionMemo()
+
+
+class _SectionInputs:
+    """Lazily computed, per-build fingerprints of the project inputs named in _SECTION_INPUTS."""
+
+    def __init__(self, project: dict) -> None:
+        self.project = project
+        self._fps: dict[str, str] = {}
+        self._index: ProjectIndex | None = None
+
+    @property
+    def index(self) -> ProjectIndex:
+        """Shared ProjectIndex, built on first use (i.e. only when some producer misses)."""
+        if self._index is None:
+            self._index = ProjectIndex.build(self.project)
+        return self._index
+
+    @_profiled("section_fingerprint")
+    def fingerprint(self, deps: tuple[str, ...]) -> str:
+        parts = []
+        for dep in deps:
+            if dep not in self._fps:
+                value = _SECTION_INPUTS[dep](self)
+                self._fps[dep] = sha256(json.dumps(value, sort_keys=True, separators=(",", ":"), default=str))
+            parts.append(self._fps[dep])
+        return "|".join(parts)
+
+
+def _memo_section(inputs: _SectionInputs, name: str, deps: tuple[str, ...], build):
+    return _SECTION_MEMO.get_or_build(name, inputs.fingerprint(deps), build)
+
+
+@_profiled("sections")
 def _build_compiler_sections(project: dict, device: object | None = None) -> dict[str, str]:
     """Build the section map that the compiler produces (sensor, text_sensor, lvgl, script, etc.).
     Used by section-based compile and by GET sections/defaults. device is optional (for api key).
+
+    The whole map is memoized per project fingerprint, so opening the Components panel and the
+    compile / preview / export preview that follow share one build; on a miss each producer is
+    still memoized on the project inputs it declares (see _SECTION_INPUTS). Returns a fresh dict
+    (callers add stubs to it).
     """
-    # Font rewrite (same as full compile) so lvgl/widget refs are correct
+    fingerprint = sha256(json.dumps(project, sort_keys=True, separators=(",", ":"), default=str))
+    fingerprint += f"|schemas:{_WIDGET_SCHEMAS.current_generation()}"
+    out = dict(_SECTION_MEMO.get_or_build("compiler_sections", fingerprint, lambda: _build_project_sections(project)))
+
+    # API encryption (when device has api_key)
+    if device is not None and getattr(device, "api_key", None) and str(getattr(device, "api_key", "") or "").strip():
+        key = (getattr(device, "api_key", "") or "").strip()
+        out["api"] = "  encryption:\n    key: " + json.dumps(key) + "\n"
+
+    return out
+
+
+def _build_project_sections(project: dict) -> dict[str, str]:
+    """Device-independent part of _build_compiler_sections, built from the per-producer memos."""
     project = dict(project)
-    fonts_yaml, font_id_map = _compile_fonts_from_project(project)
-    if font_id_map:
-        project = _rewrite_widget_font_references(project, font_id_map)
+    inputs = _SectionInputs(project)
+    structure = ("widget_structure",)
+    pickers = ("widget_structure", "action_bindings")
+
+    fonts_yaml, font_id_map = _memo_section(inputs, "font", structure, lambda: _compile_fonts_from_project(project, inputs.index))
+    cpicker_defaults, wpicker_defaults = _memo_section(
+        inputs, "picker_defaults", pickers,
+        lambda: (
+            _collect_color_picker_defaults(project, inputs.index),
+            _collect_white_picker_defaults(project, inputs.index),
+        ),
+    )
 
     out: dict[str, str] = {}
 
     # HA bindings -> sensor, text_sensor, binary_sensor (content only)
-    ha_yaml = _compile_ha_bindings(project)
-    if ha_yaml.strip():
-        for k, v in _yaml_str_to_section_map(ha_yaml).items():
-            out[k] = v
+    def build_ha() -> dict[str, str]:
+        ha_yaml = _compile_ha_bindings(project, inputs.index)
+        return _yaml_str_to_section_map(ha_yaml) if ha_yaml.strip() else {}
+
+    out.update(_memo_section(inputs, "ha_bindings", ("bindings", "links") + structure, build_ha))
 
     # Prebuilt components (no user_components; section_overrides handle user edits)
-    prebuilt_str = _compile_prebuilt_components(project, include_user_components=False)
-    if prebuilt_str.strip():
-        prebuilt_map = _yaml_str_to_section_map(prebuilt_str, merge_duplicate_keys=True)
-        for k, v in prebuilt_map.items():
-            if k in out:
-                out[k] = out[k].rstrip() + "\n\n" + v
-            else:
-                out[k] = v
+    def build_prebuilt() -> dict[str, str]:
+        prebuilt_str = _compile_prebuilt_components(project, include_user_components=False, index=inputs.index)
+        if not prebuilt_str.strip():
+            return {}
+        return _yaml_str_to_section_map(prebuilt_str, merge_duplicate_keys=True)
+
+    prebuilt_map = _memo_section(
+        inputs, "prebuilt", ("esphome_components", "widget_structure", "wifi_geometry"), build_prebuilt
+    )
+    for k, v in prebuilt_map.items():
+        if k in out:
+            out[k] = out[k].rstrip() + "\n\n" + v
+        else:
+            out[k] = v
 
     # Globals (lock vars + color picker + white picker)
-    locks_yaml = _compile_ui_lock_globals(project)
-    cpicker_defaults = _collect_color_picker_defaults(project)
-    wpicker_defaults = _collect_white_picker_defaults(project)
-    cpicker_globals_yaml = _compile_color_picker_globals(cpicker_defaults)
-    wpicker_globals_yaml = _compile_white_picker_globals(wpicker_defaults)
-    if locks_yaml.strip() or cpicker_globals_yaml.strip() or wpicker_globals_yaml.strip():
+    def build_globals() -> str | None:
+        locks_yaml = _compile_ui_lock_globals(project, inputs.index)
+        cpicker_globals_yaml = _compile_color_picker_globals(cpicker_defaults)
+        wpicker_globals_yaml = _compile_white_picker_globals(wpicker_defaults)
+        if not (locks_yaml.strip() or cpicker_globals_yaml.strip() or wpicker_globals_yaml.strip()):
+            return None
         combined = (_strip_section_key(locks_yaml, "globals") or "").rstrip()
         if cpicker_globals_yaml.strip():
             cpicker_part = _strip_section_key(cpicker_globals_yaml, "globals").rstrip()
@@ -1308,13 +1941,19 @@ def _build_compiler_sections(project: dict, device: object | None = None) -> dic
         if wpicker_globals_yaml.strip():
             wpicker_part = _strip_section_key(wpicker_globals_yaml, "globals").rstrip()
             combined = (combined + "\n" + wpicker_part).rstrip() if combined else wpicker_part
-        out["globals"] = combined
+        return combined
+
+    globals_body = _memo_section(inputs, "globals", ("bindings", "links") + pickers, build_globals)
+    if globals_body is not None:
+        out["globals"] = globals_body
 
     # Script (project scripts + color picker + white picker scripts)
-    scripts_yaml = _compile_scripts(project)
-    cpicker_scripts_yaml = _compile_color_picker_scripts(cpicker_defaults, project)
-    wpicker_scripts_yaml = _compile_white_picker_scripts(wpicker_defaults, project)
-    if scripts_yaml.strip() or cpicker_scripts_yaml.strip() or wpicker_scripts_yaml.strip():
+    def build_script() -> str | None:
+        scripts_yaml = _compile_scripts(project)
+        cpicker_scripts_yaml = _compile_color_picker_scripts(cpicker_defaults, project)
+        wpicker_scripts_yaml = _compile_white_picker_scripts(wpicker_defaults, project)
+        if not (scripts_yaml.strip() or cpicker_scripts_yaml.strip() or wpicker_scripts_yaml.strip()):
+            return None
         combined = (_strip_section_key(scripts_yaml, "script") or "").rstrip()
         if cpicker_scripts_yaml.strip():
             cpicker_part = _strip_section_key(cpicker_scripts_yaml, "script").rstrip()
@@ -1322,23 +1961,42 @@ def _build_compiler_sections(project: dict, device: object | None = None) -> dic
         if wpicker_scripts_yaml.strip():
             wpicker_part = _strip_section_key(wpicker_scripts_yaml, "script").rstrip()
             combined = (combined + "\n" + wpicker_part).rstrip() if combined else wpicker_part
-        out["script"] = combined
+        return combined
+
+    script_body = _memo_section(inputs, "script", ("scripts", "links") + pickers, build_script)
+    if script_body is not None:
+        out["script"] = script_body
 
     # Interval: colour picker + white picker HA sync
-    cpicker_interval_yaml = _compile_color_picker_sync_interval(project, cpicker_defaults)
-    wpicker_interval_yaml = _compile_white_picker_sync_interval(project, wpicker_defaults)
-    for interval_yaml in (cpicker_interval_yaml, wpicker_interval_yaml):
-        if interval_yaml.strip():
-            interval_body = _strip_section_key(interval_yaml, "interval").rstrip()
-            if interval_body:
-                if "interval" in out:
-                    out["interval"] = out["interval"].rstrip() + "\n\n" + interval_body
-                else:
-                    out["interval"] = interval_body
+    def build_interval() -> str | None:
+        body = None
+        cpicker_interval_yaml = _compile_color_picker_sync_interval(project, cpicker_defaults)
+        wpicker_interval_yaml = _compile_white_picker_sync_interval(project, wpicker_defaults)
+        for interval_yaml in (cpicker_interval_yaml, wpicker_interval_yaml):
+            if interval_yaml.strip():
+                interval_body = _strip_section_key(interval_yaml, "interval").rstrip()
+                if interval_body:
+                    body = (body.rstrip() + "\n\n" + interval_body) if body is not None else interval_body
+        return body
+
+    interval_body = _memo_section(inputs, "interval", ("links",) + pickers, build_interval)
+    if interval_body is not None:
+        if "interval" in out:
+            out["interval"] = out["interval"].rstrip() + "\n\n" + interval_body
+        else:
+            out["interval"] = interval_body
 
     # LVGL (full body: config + pages); keep leading indent (rstrip only).
-    pages_yaml = _compile_lvgl_pages_schema_driven(
-        project, cpicker_defaults=cpicker_defaults, wpicker_defaults=wpicker_defaults
+    def build_lvgl() -> str:
+        return _compile_lvgl_pages_schema_driven(
+            project, cpicker_defaults=cpicker_defaults, wpicker_defaults=wpicker_defaults,
+            index=inputs.index, font_id_map=font_id_map,
+        )
+
+    pages_yaml = _memo_section(
+        inputs, "lvgl",
+        ("pages", "lvgl_config", "action_bindings", "disp_bg_color", "hardware", "device", "widget_schemas"),
+        build_lvgl,
     )
     if pages_yaml.strip():
         out["lvgl"] = pages_yaml.rstrip()
@@ -1346,15 +2004,9 @@ def _build_compiler_sections(project: dict, device: object | None = None) -> dic
     # Font, image
     if fonts_yaml.strip():
         out["font"] = _strip_section_key(fonts_yaml, "font")
-    assets_yaml = _compile_assets(project)
+    assets_yaml = _memo_section(inputs, "image", structure, lambda: _compile_assets(project, inputs.index))
     if assets_yaml.strip():
         out["image"] = _strip_section_key(assets_yaml, "image")
-
-    # API encryption (when device has api_key)
-    if device is not None and getattr(device, "api_key", None) and str(getattr(device, "api_key", "") or "").strip():
-        key = (getattr(device, "api_key", "") or "").strip()
-        out["api"] = "  encryption:\n    key: " + json.dumps(key) + "\n"
-
     return out
 
 
@@ -1394,7 +2046,8 @@ def _apply_user_injection(recipe_text: str, project: dict) -> str:
 
     return recipe_text
 
-def _compile_assets(project: dict) -> str:
+@_profiled("assets")
+def _compile_assets(project: dict, index: ProjectIndex | None = None) -> str:
     """Compile assets referenced by the project.
 
     v0.27 scope:
@@ -1402,21 +2055,7 @@ def _compile_assets(project: dict) -> str:
     - Emits an `image:` section with file references (expects files to exist under
       `/config/esphome_touch_designer_assets/<filename>` on the HA host).
     """
-    pages = project.get("pages") or []
-    assets: dict[str,str] = {}  # id -> filename
-    for pg in pages if isinstance(pages, list) else []:
-        for w in (pg.get("widgets") or []):
-            if not isinstance(w, dict): 
-                continue
-            if str(w.get("type") or "") != "image":
-                continue
-            props = w.get("props") or {}
-            src = str(props.get("src") or "").strip()
-            if src.startswith("asset:"):
-                fn = src.split(":",1)[1].strip()
-                if fn:
-                    aid = "asset_" + _safe_id(fn)
-                    assets[aid]=fn
+    assets = (index or ProjectIndex.build(project)).image_assets  # id -> filename
     if not assets:
         return ""
     out=["image:\n"]
@@ -1432,7 +2071,8 @@ def _slugify_entity_id(entity_id: str) -> str:
     s = re.sub(r"_+", "_", s).strip("_")
     return s or "entity"
 
-def _compile_ui_lock_globals(project: dict) -> str:
+@_profiled("lock_globals")
+def _compile_ui_lock_globals(project: dict, index: ProjectIndex | None = None) -> str:
     """Emit globals used for loop-avoidance (UI-originated actions vs HA→UI updates).
 
     v0.49:
@@ -1455,31 +2095,9 @@ def _compile_ui_lock_globals(project: dict) -> str:
     # service calls can suppress only the specific widget updates that would
     # otherwise “rubber-band”.
     # Container -> spinbox child (display link to "Spinbox with +/-" targets container; lock is for the spinbox)
-    def _container_spinbox_child_map() -> dict[str, str]:
-        out: dict[str, str] = {}
-        for page in project.get("pages") or []:
-            if not isinstance(page, dict):
-                continue
-            for w in page.get("widgets") or []:
-                if not isinstance(w, dict):
-                    continue
-                pid = w.get("parent_id")
-                if pid and str(w.get("type") or "") == "spinbox" and w.get("id"):
-                    out[str(pid)] = str(w["id"])
-        return out
-
-    def _widget_type_map_flat() -> dict[str, str]:
-        m: dict[str, str] = {}
-        for page in project.get("pages") or []:
-            if not isinstance(page, dict):
-                continue
-            for w in page.get("widgets") or []:
-                if isinstance(w, dict) and w.get("id"):
-                    m[str(w["id"])] = str(w.get("type") or "label")
-        return m
-
-    container_spinbox_child = _container_spinbox_child_map()
-    widget_type_by_id = _widget_type_map_flat()
+    index = index or ProjectIndex.build(project)
+    container_spinbox_child = index.container_spinbox_child
+    widget_type_by_id = index.type_by_id
 
     link_pairs: set[tuple[str, str]] = set()
     links = project.get("links") or []
@@ -1537,9 +2155,64 @@ SECTION_STATE_EDITED = "edited"
 COMPILER_OWNED_SECTIONS = frozenset({"lvgl"})
 
 
+def _canonical_section_body(body: str | None) -> str:
+    """Body as a "key:" block round trip (_section_full_block then _section_body_from_value) would leave it."""
+    body = (body or "").rstrip()
+    if _OTHER_LINE_BREAKS_RE.search(body):
+        body = "\n".join(body.splitlines()).rstrip()
+    return body
+
+
+@dataclass
+class SectionDocument:
+    """Top-level sections of one ESPHome document: key -> body (the text under "key:", no header line).
+
+    The section-based compile carries one document from the default pieces through the merge and
+    serializes it once in render(); bodies are stored canonical, so they are never wrapped in a
+    "key:" block and split again between stages.
+    """
+
+    bodies: dict[str, str] = field(default_factory=dict)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.bodies
+
+    def get(self, key: str) -> str:
+        return self.bodies.get(key, "")
+
+    def set(self, key: str, body: str | None) -> None:
+        self.bodies[key] = _canonical_section_body(body)
+
+    def substitute(self, old: str, new: str) -> None:
+        """Replace old with new in every body (e.g. the device name placeholder)."""
+        for key, body in self.bodies.items():
+            if old in body:
+                self.bodies[key] = body.replace(old, new)
+
+    def blocks(self) -> dict[str, str]:
+        """key -> full "key:" block (the dict form used by project.sections and the panel)."""
+        return {key: _section_full_block(key, body) for key, body in self.bodies.items()}
+
+    def render(self, header: str = "") -> str:
+        """The YAML document: header, then each section in SECTION_ORDER separated by a blank line."""
+        parts = [header]
+        for key in SECTION_ORDER:
+            if key in self.bodies:
+                parts.append(f"{key}:\n{self.bodies[key]}\n\n")
+        return "".join(parts).rstrip() + "\n"
+
+
 def _build_recipe_default_sections(recipe_text: str, device: object | None) -> dict[str, str]:
     """Build section key -> body from current recipe only (with substitutions). Used for Reset and for default_sections in panel v2."""
-    recipe_sections = _parse_recipe_into_sections(recipe_text)
+    pieces = _RECIPE_ANALYSIS.default_pieces(recipe_text)
+    if device is not None and getattr(device, "slug", None):
+        _substitute_device_name_in_sections(pieces, device.slug)
+    return {k: (_section_body_from_value(v, k) or "").rstrip() for k, v in pieces.items()}
+
+
+def _recipe_default_pieces(recipe_text: str) -> dict[str, str]:
+    """Device-independent part of _build_recipe_default_sections: full section blocks, device name still a placeholder."""
+    recipe_sections = _RECIPE_ANALYSIS.sections(recipe_text)
     pieces: dict[str, str] = {}
     for key in SECTION_ORDER:
         content = recipe_sections.get(key)
@@ -1557,24 +2230,23 @@ def _build_recipe_default_sections(recipe_text: str, device: object | None) -> d
                 content = _strip_section_key(_default_logger_yaml(), "logger")
         if content is not None and (key in ("wifi", "ota", "logger") or (content and str(content).strip())):
             pieces[key] = _section_full_block(key, (content or "").rstrip())
-    if device is not None and getattr(device, "slug", None):
-        _substitute_device_name_in_sections(pieces, device.slug)
-    return {k: (_section_body_from_value(v, k) or "").rstrip() for k, v in pieces.items()}
+    return pieces
 
 
-def _build_default_section_pieces(
+@_profiled("default_pieces")
+def _build_default_section_document(
     project: dict,
     device: object | None,
     recipe_text: str,
-) -> dict[str, str]:
+) -> SectionDocument:
     """Build section content from recipe + compiler only (no user edits). Used for Reset and initial populate."""
-    recipe_sections = _parse_recipe_into_sections(recipe_text)
+    recipe_sections = _RECIPE_ANALYSIS.sections(recipe_text)
     compiler_sections = _build_compiler_sections(project, device)
     if "manage_run_and_sleep" in recipe_text and "id: manage_run_and_sleep" not in (compiler_sections.get("script") or "") and "id: manage_run_and_sleep" not in recipe_text:
         stub = "  - id: manage_run_and_sleep\n    then:\n      - delay: 1ms\n"
         current = (compiler_sections.get("script") or "").rstrip()
         compiler_sections["script"] = (current + "\n" + stub.rstrip() + "\n") if current else (stub.rstrip() + "\n")
-    pieces: dict[str, str] = {}
+    doc = SectionDocument()
     for key in SECTION_ORDER:
         content = compiler_sections.get(key) or recipe_sections.get(key)
         if key == "lvgl" and content and "#__LVGL_PAGES__" in content and compiler_sections.get("lvgl"):
@@ -1592,10 +2264,19 @@ def _build_default_section_pieces(
             elif key == "logger":
                 content = _strip_section_key(_default_logger_yaml(), "logger")
         if content is not None and (key in ("wifi", "ota", "logger") or (content and str(content).strip())):
-            pieces[key] = _section_full_block(key, (content or "").rstrip())
+            doc.set(key, content)
     if device is not None and getattr(device, "slug", None):
-        _substitute_device_name_in_sections(pieces, device.slug)
-    return pieces
+        doc.substitute(ETD_DEVICE_NAME_PLACEHOLDER, json.dumps(device.slug))
+    return doc
+
+
+def _build_default_section_pieces(
+    project: dict,
+    device: object | None,
+    recipe_text: str,
+) -> dict[str, str]:
+    """_build_default_section_document as key -> full "key:" block."""
+    return _build_default_section_document(project, device, recipe_text).blocks()
 
 
 def _ensure_project_sections(project: dict, device: object | None, recipe_text: str) -> None:
@@ -1609,7 +2290,7 @@ def _ensure_project_sections(project: dict, device: object | None, recipe_text:
     project.sections keyed by top-level section name.
     """
     stored = (project.get("sections") or {}) if isinstance(project.get("sections"), dict) else {}
-    recipe_sections = _parse_recipe_into_sections(recipe_text)
+    recipe_sections = _RECIPE_ANALYSIS.sections(recipe_text)
     compiler_sections = _build_compiler_sections(project, device)
     if "manage_run_and_sleep" in recipe_text and "id: manage_run_and_sleep" not in (compiler_sections.get("script") or "") and "id: manage_run_and_sleep" not in recipe_text:
         stub = "  - id: manage_run_and_sleep\n    then:\n      - delay: 1ms\n"
@@ -1654,7 +2335,7 @@ def _build_section_engine_pieces(
     """
     stored = (project.get("sections") or {}) if isinstance(project.get("sections"), dict) else {}
     user_edited: set[str] = set(stored.keys())
-    recipe_sections = _parse_recipe_into_sections(recipe_text)
+    recipe_sections = _RECIPE_ANALYSIS.sections(recipe_text)
     compiler_sections = _build_compiler_sections(project, device)
 
     if "manage_run_and_sleep" in recipe_text and "id: manage_run_and_sleep" not in (compiler_sections.get("script") or "") and "id: manage_run_and_sleep" not in recipe_text:
@@ -1687,41 +2368,24 @@ def _build_section_engine_pieces(
     return pieces, user_edited
 
 
-def _compile_to_esphome_yaml_section_based(device: DeviceProject, recipe_text: str) -> str:
-    """Compiler: Design v2 when project.esphome_yaml is set (stored YAML + compiler lvgl/list merge).
-    Legacy: recipe + compiler + project.sections."""
-    project = dict(device.project or {})
-    use_stored_yaml = bool((project.get("esphome_yaml") or "").strip())
-    stored_sections: dict[str, str] | None = _stored_sections_from_project(project) if use_stored_yaml else None
-    stored_additions = (project.get("sections") or {}) if isinstance(project.get("sections"), dict) else {}
-    auto_pieces = _build_default_section_pieces(project, device, recipe_text)
-    # Script stub if recipe or user esphome references manage_run_and_sleep but script doesn't define it
-    script_block = auto_pieces.get("script") or ""
-    script_body = _section_body_from_value(script_block, "script") if script_block else ""
-    esphome_body = _section_body_from_value(auto_pieces.get("esphome"), "esphome") or ""
-    user_esphome_raw = (stored_sections.get("esphome") if stored_sections else stored_additions.get("esphome") or "").strip()
-    if not user_esphome_raw and stored_additions:
-        user_esphome_raw = (stored_additions.get("esphome") or "").strip()
-    needs_stub = (
-        "manage_run_and_sleep" in (esphome_body + user_esphome_raw + recipe_text)
-        and "id: manage_run_and_sleep" not in (script_body or "")
-    )
-    if needs_stub:
-        stub = "  - id: manage_run_and_sleep\n    then:\n      - delay: 1ms\n"
-        script_body = (script_body.rstrip() + "\n" + stub.rstrip()) if script_body else stub.rstrip()
-        auto_pieces["script"] = _section_full_block("script", script_body)
-
+@_profiled("section_merge")
+def _merge_section_document(
+    auto: SectionDocument,
+    stored_sections: dict[str, str] | None,
+    stored_additions: dict,
+) -> SectionDocument:
+    """Merge compiler/recipe sections with the user's stored YAML (Design v2) or project.sections (legacy), per SECTION_ORDER key."""
     LIST_SECTIONS: set[str] = {
         "sensor", "text_sensor", "binary_sensor", "switch", "number", "select", "light",
     }
-    pieces: dict[str, str] = {}
+    merged = SectionDocument()
     for key in SECTION_ORDER:
-        auto_block = auto_pieces.get(key) or ""
-        auto_body = (_section_body_from_value(auto_block, key) or "").rstrip() if auto_block else ""
+        auto_body = auto.get(key)
         if stored_sections is not None:
             user_body = (stored_sections.get(key) or "").rstrip()
             if key == "lvgl":
                 merged_body = auto_body
+                user_body = ""
             elif key in LIST_SECTIONS:
                 if user_body:
                     user_body = _normalize_section_body_indent(user_body).rstrip()
@@ -1744,8 +2408,35 @@ def _compile_to_esphome_yaml_section_based(device: DeviceProject, recipe_text: s
             else:
                 merged_body = user_body if user_body else auto_body
         if merged_body or key in ("wifi", "ota", "logger"):
-            merged_body = (merged_body or "").lstrip("\n\r").rstrip()
-            pieces[key] = _section_full_block(key, merged_body)
+            merged.set(key, (merged_body or "").lstrip("\n\r"))
+    return merged
+
+
+def _compile_to_esphome_yaml_section_based(device: DeviceProject, recipe_text: str) -> str:
+    """Compiler: Design v2 when project.esphome_yaml is set (stored YAML + compiler lvgl/list merge).
+    Legacy: recipe + compiler + project.sections. The sections travel as one SectionDocument and are
+    serialized once at the end."""
+    project = dict(device.project or {})
+    use_stored_yaml = bool((project.get("esphome_yaml") or "").strip())
+    stored_sections: dict[str, str] | None = _stored_sections_from_project(project) if use_stored_yaml else None
+    stored_additions = (project.get("sections") or {}) if isinstance(project.get("sections"), dict) else {}
+    auto = _build_default_section_document(project, device, recipe_text)
+    # Script stub if recipe or user esphome references manage_run_and_sleep but script doesn't define it
+    script_body = auto.get("script")
+    esphome_body = auto.get("esphome")
+    user_esphome_raw = (stored_sections.get("esphome") if stored_sections else stored_additions.get("esphome") or "").strip()
+    if not user_esphome_raw and stored_additions:
+        user_esphome_raw = (stored_additions.get("esphome") or "").strip()
+    needs_stub = (
+        "manage_run_and_sleep" in (esphome_body + user_esphome_raw + recipe_text)
+        and "id: manage_run_and_sleep" not in (script_body or "")
+    )
+    if needs_stub:
+        stub = "  - id: manage_run_and_sleep\n    then:\n      - delay: 1ms\n"
+        script_body = (script_body.rstrip() + "\n" + stub.rstrip()) if script_body else stub.rstrip()
+        auto.set("script", script_body)
+
+    doc = _merge_section_document(auto, stored_sections, stored_additions)
     header = (
         "---\n"
         f"# Generated by {DOMAIN} v{_integration_version()}\n"
@@ -1753,13 +2444,11 @@ def _compile_to_esphome_yaml_section_based(device: DeviceProject, recipe_text: s
         f"# slug: {device.slug}\n"
         "\n"
     )
-    display_id = _display_id_from_recipe(recipe_text)
-    out_parts = [header]
+    display_id = _RECIPE_ANALYSIS.display_id(recipe_text)
     for key in SECTION_ORDER:
-        if key not in pieces:
+        if key not in doc:
             continue
-        block = pieces[key]
-        content = _section_body_from_value(block, key)
+        content = original = doc.get(key)
         # Minimal stub recipe uses id stub_display; lvgl body has no displays key, so prepend for "esphome config" to pass
         if key == "lvgl" and content and display_id == "stub_display" and "  displays:" not in content:
             content = "  displays:\n  - " + display_id + "\n" + content
@@ -1770,7 +2459,7 @@ def _compile_to_esphome_yaml_section_based(device: DeviceProject, recipe_text: s
                 content = "  name: " + ETD_DEVICE_NAME_PLACEHOLDER + "\n" + content.lstrip()
         # Normalize globals/script indent: if body is over-indented (first list item at 4 spaces), strip 2 spaces from every line so ESPHome sees list at 2, keys at 4 (avoids "mapping values are not allowed")
         if key in ("globals", "script") and content and "\n" in content:
-            first_line = content.splitlines()[0] if content.splitlines() else ""
+            first_line = content[:content.find("\n")]
             if first_line.startswith("    ") and not first_line.startswith("      "):
                 content = "\n".join(ln[2:] if len(ln) >= 2 and ln.startswith("  ") else ln for ln in content.splitlines())
         # Ensure section body has at least 2-space base indent. Only add indent to lines with < 2
@@ -1785,12 +2474,14 @@ def _compile_to_esphome_yaml_section_based(device: DeviceProject, recipe_text: s
             content = "\n".join(_ensure_base_indent(ln) for ln in content.splitlines())
         elif content and not content.startswith("  "):
             content = "  " + content
-        out_parts.append(f"{key}:\n{content.rstrip()}\n\n")
-    out = "".join(out_parts).rstrip() + "\n"
+        if content is not original:
+            doc.set(key, content)
+    out = doc.render(header)
     out = out.replace(ETD_DEVICE_NAME_PLACEHOLDER, json.dumps(device.slug or "device"))
     return out
 
 
+@_profiled("compile")
 def compile_to_esphome_yaml(device: DeviceProject, recipe_text: str | None = None) -> str:
     """Compile a device project into a full ESPHome YAML document.
 
@@ -1803,6 +2494,8 @@ def compile_to_esphome_yaml(device: DeviceProject, recipe_text: str | None = Non
         or device.hardware_recipe_id
         or "sunton_2432s028r_320x240"
     )
+    if recipe_text is None:
+        recipe_text = _BUILTIN_BUNDLE.text(recipe_id)
     if recipe_text is None:
         recipe_path = RECIPES_BUILTIN_DIR / f"{recipe_id}.yaml"
         recipe_text = recipe_path.read_text("utf-8") if recipe_path.exists() else ""
@@ -1813,15 +2506,14 @@ def compile_to_esphome_yaml(device: DeviceProject, recipe_text: str | None = Non
         return _compile_to_esphome_yaml_section_based(device, recipe_text)
 
     # Fallback when esphome_sections not available (legacy path)
-    assets_yaml = _compile_assets(project)
-    ha_bindings_yaml = _compile_ha_bindings(project)
+    index = ProjectIndex.build(project)
+    assets_yaml = _compile_assets(project, index)
+    ha_bindings_yaml = _compile_ha_bindings(project, index)
     scripts_yaml = _compile_scripts(project)
-    prebuilt_components_yaml = _compile_prebuilt_components(project)
-    fonts_yaml, font_id_map = _compile_fonts_from_project(project)
-    if font_id_map:
-        project = _rewrite_widget_font_references(project, font_id_map)
-    pages_yaml = _compile_lvgl_pages_schema_driven(project)
-    locks_yaml = _compile_ui_lock_globals(project)
+    prebuilt_components_yaml = _compile_prebuilt_components(project, index=index)
+    fonts_yaml, font_id_map = _compile_fonts_from_project(project, index)
+    locks_yaml = _compile_ui_lock_globals(project, index)
+    pages_yaml = _compile_lvgl_pages_schema_driven(project, index=index, font_id_map=font_id_map)
     if "#__HA_BINDINGS__" in recipe_text:
         recipe_text = recipe_text.replace("#__HA_BINDINGS__", ha_bindings_yaml.rstrip())
     elif ha_bindings_yaml.strip():
@@ -1882,7 +2574,332 @@ def compile_to_esphome_yaml(device: DeviceProject, recipe_text: str | None = Non
     return out
 
 
-def _compile_fonts_from_project(project: dict) -> tuple[str, dict[str, str]]:
+class _CompileCache:
+    """Bounded LRU of compiled YAML keyed by a content hash of everything the compiler reads.
+
+    The key covers the canonical project JSON, the resolved recipe text, the device fields that
+    reach the output (device_id/slug in the header, api_key in the api section) and the
+    integration version, so identical inputs always map to the same entry and any edit misses.
+    """
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, list[dict]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key_for(device: DeviceProject, recipe_text: str) -> str:
+        payload = json.dumps(
+            {
+                "project": device.project or {},
+                "recipe": recipe_text or "",
+                "device_id": device.device_id,
+                "slug": device.slug,
+                "api_key": device.api_key,
+                "version": _integration_version(),
+                "widget_schemas": _WIDGET_SCHEMAS.current_generation(),
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return sha256(payload)
+
+    def get(self, key: str) -> tuple[str, list[dict]] | None:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return hit
+
+    def put(self, key: str, value: tuple[str, list[dict]]) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_COMPILE_CACHE = _CompileCache()
+
+
+def compile_to_esphome_yaml_cached(device: DeviceProject, recipe_text: str) -> tuple[str, list[dict]]:
+    """Return (yaml, warnings) for device + resolved recipe text, reusing a cached result when inputs are unchanged."""
+    key = _CompileCache.key_for(device, recipe_text)
+    hit = _COMPILE_CACHE.get(key)
+    if hit is not None:
+        yaml_text, warnings = hit
+        return yaml_text, [dict(w) for w in warnings]
+    yaml_text = compile_to_esphome_yaml(device, recipe_text=recipe_text)
+    yaml_text = yaml_text.replace(ETD_DEVICE_NAME_PLACEHOLDER, json.dumps(device.slug or "device"))
+    warnings = _compile_warnings(device.project or {})
+    _COMPILE_CACHE.put(key, (yaml_text, [dict(w) for w in warnings]))
+    return yaml_text, warnings
+
+
+def compile_to_esphome_yaml_profiled(
+    device: DeviceProject, recipe_text: str, trace_memory: bool = False
+) -> tuple[str, list[dict], dict]:
+    """Compile bypassing the cache lookup with per-stage profiling; returns (yaml, warnings, profile).
+
+    trace_memory adds per-stage alloc_bytes via tracemalloc (slow, and process-wide, so traced
+    compiles run one at a time). The profile is also added to the rolling history reported by
+    DiagnosticsView, and the result still populates the compile cache.
+    """
+    key = _CompileCache.key_for(device, recipe_text)
+    profile = _CompileProfile(trace_memory=trace_memory)
+    token = _ACTIVE_PROFILE.set(profile)
+    try:
+        with _TRACE_MEMORY_LOCK if trace_memory else contextlib.nullcontext(), profile:
+            yaml_text = compile_to_esphome_yaml(device, recipe_text=recipe_text)
+            yaml_text = yaml_text.replace(ETD_DEVICE_NAME_PLACEHOLDER, json.dumps(device.slug or "device"))
+            warnings = _compile_warnings(device.project or {})
+    finally:
+        _ACTIVE_PROFILE.reset(token)
+    _PROFILE_HISTORY.record(profile)
+    _COMPILE_CACHE.put(key, (yaml_text, [dict(w) for w in warnings]))
+    return yaml_text, warnings, profile.as_dict()
+
+
+# --- Compile worker pool: keeps CPU-bound compiles off the event loop ---
+
+COMPILE_WORKERS = 2
+COMPILES_PER_DEVICE = 1
+
+
+@dataclass
+class _PreviewSlot:
+    """Latest preview compile for a device; older previews resolve with its result."""
+
+    cancel: threading.Event
+    done: asyncio.Future
+    newer: "_PreviewSlot | None" = None
+
+
+class _CompilePool:
+    """Bounded worker threads for compiles with a per-device concurrency limit.
+
+    Threads (not processes) so compiles share the section memo, compile cache and widget
+    schemas. Preview compiles for the same device supersede each other: when a newer preview
+    arrives, an older one still waiting for its device slot never starts, and one already
+    running stops at its next compiler stage. Superseded requests answer with the newest result,
+    so a client that fires a compile per drag step never sees stale YAML.
+    """
+
+    def __init__(self, max_workers: int = COMPILE_WORKERS, per_device: int = COMPILES_PER_DEVICE) -> None:
+        self.max_workers = max_workers
+        self.per_device = per_device
+        self._executor: ThreadPoolExecutor | None = None
+        self._device_slots: dict[str, list] = {}  # key -> [asyncio.Semaphore, users]
+        self._previews: dict[str, _PreviewSlot] = {}
+        self._lock = threading.Lock()
+        self._waiting_device = 0
+        self._waiting_worker = 0
+        self._running = 0
+        self.max_depth = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.superseded = 0
+        self._wait_ms: deque[float] = deque(maxlen=200)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="etd_compile")
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stop accepting work; running compiles finish in the background. Recreated on next use."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _acquire_slot(self, key: str) -> asyncio.Semaphore:
+        entry = self._device_slots.get(key)
+        if entry is None:
+            entry = self._device_slots[key] = [asyncio.Semaphore(self.per_device), 0]
+        entry[1] += 1
+        return entry[0]
+
+    def _release_slot(self, key: str) -> None:
+        entry = self._device_slots.get(key)
+        if entry is not None:
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._device_slots[key]
+
+    def _depth(self) -> int:
+        return self._waiting_device + self._waiting_worker + self._running
+
+    def _run_in_worker(self, cancel: threading.Event, fn, args: tuple):
+        with self._lock:
+            self._waiting_worker -= 1
+            self._running += 1
+        token = _COMPILE_CANCEL.set(cancel)
+        try:
+            if cancel.is_set():
+                raise CompileSuperseded("queued")
+            return fn(*args)
+        finally:
+            _COMPILE_CANCEL.reset(token)
+            with self._lock:
+                self._running -= 1
+
+    async def _run(self, key: str, cancel: threading.Event, fn, args: tuple):
+        loop = asyncio.get_running_loop()
+        slot = self._acquire_slot(key)
+        t0 = time.perf_counter()
+        self.submitted += 1
+        self._waiting_device += 1
+        self.max_depth = max(self.max_depth, self._depth())
+        try:
+            await slot.acquire()
+        except BaseException:
+            self._waiting_device -= 1
+            self._release_slot(key)
+            raise
+        self._waiting_device -= 1
+        try:
+            if cancel.is_set():
+                raise CompileSuperseded("queued")
+            with self._lock:
+                self._waiting_worker += 1
+            self._wait_ms.append((time.perf_counter() - t0) * 1000)
+            # Copy the caller's context so profiling and other context vars reach the worker.
+            ctx = contextvars.copy_context()
+            future = loop.run_in_executor(self._get_executor(), ctx.run, self._run_in_worker, cancel, fn, args)
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Client went away: let the worker stop at its next stage, but keep the device
+                # slot until it has actually finished.
+                cancel.set()
+                await asyncio.wait([future])
+                raise
+        except CompileSuperseded:
+            self.superseded += 1
+            raise
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            slot.release()
+            self._release_slot(key)
+        self.completed += 1
+        return result
+
+    async def run(self, key: str, fn, *args):
+        """Run fn(*args) in a worker, at most per_device at a time for key."""
+        return await self._run(key, threading.Event(), fn, args)
+
+    async def run_preview(self, key: str, fn, *args) -> tuple[object, bool]:
+        """Like run(), but a newer run_preview for key supersedes this one.
+
+        Returns (result, superseded); a superseded call returns the newest preview's result.
+        """
+        loop = asyncio.get_running_loop()
+        mine = _PreviewSlot(cancel=threading.Event(), done=loop.create_future())
+        prev = self._previews.get(key)
+        if prev is not None:
+            prev.newer = mine
+            prev.cancel.set()
+        self._previews[key] = mine
+        try:
+            try:
+                outcome = (await self._run(key, mine.cancel, fn, args), None)
+                superseded = False
+            except CompileSuperseded:
+                if mine.newer is None:
+                    raise
+                outcome = await asyncio.shield(mine.newer.done)
+                superseded = True
+            except Exception as err:
+                outcome = (None, err)
+                superseded = False
+            if not mine.done.done():
+                mine.done.set_result(outcome)
+        except BaseException:
+            if not mine.done.done():
+                mine.done.set_result((None, CompileSuperseded("cancelled")))
+            raise
+        finally:
+            if self._previews.get(key) is mine:
+                del self._previews[key]
+        result, err = outcome
+        if err is not None:
+            raise err
+        return result, superseded
+
+    def stats(self) -> dict:
+        waits = sorted(self._wait_ms)
+        return {
+            "workers": self.max_workers,
+            "per_device": self.per_device,
+            "queue_depth": self._depth(),
+            "waiting_device": self._waiting_device,
+            "waiting_worker": self._waiting_worker,
+            "running": self._running,
+            "max_depth": self.max_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "superseded": self.superseded,
+            "wait_p50_ms": round(waits[len(waits) // 2], 3) if waits else 0.0,
+            "wait_max_ms": round(waits[-1], 3) if waits else 0.0,
+        }
+
+
+_COMPILE_POOL = _CompilePool()
+
+
+def _compile_for_view(device: DeviceProject, recipe_text: str) -> tuple[str, list[dict], None]:
+    yaml_text, warnings = compile_to_esphome_yaml_cached(device, recipe_text)
+    return yaml_text, warnings, None
+
+
+def _compile_for_view_profiled(device: DeviceProject, recipe_text: str) -> tuple[str, list[dict], dict]:
+    return compile_to_esphome_yaml_profiled(device, recipe_text)
+
+
+def _compile_for_view_memory_profiled(device: DeviceProject, recipe_text: str) -> tuple[str, list[dict], dict]:
+    return compile_to_esphome_yaml_profiled(device, recipe_text, trace_memory=True)
+
+
+def shutdown_compile_pool() -> None:
+    """Release the compile worker threads (called from async_unload_entry)."""
+    _COMPILE_POOL.shutdown()
+
+
+def shutdown_entity_index(hass: HomeAssistant) -> None:
+    """Drop the entity search index and its event listeners (called from async_unload_entry)."""
+    index = hass.data.get(DOMAIN, {}).pop("entity_index", None)
+    if index is not None:
+        index.detach()
+
+
+@_profiled("fonts")
+def _compile_fonts_from_project(project: dict, index: ProjectIndex | None = None) -> tuple[str, dict[str, str]]:
     """Return (fonts_yaml, font_id_map).
 
     We support a lightweight descriptor format used in widget props:
@@ -1892,31 +2909,7 @@ def _compile_fonts_from_project(project: dict) -> tuple[str, dict[str, str]]:
       /config/esphome_touch_designer_assets
     """
 
-    used: dict[tuple[str, int], str] = {}
-
-    def scan_widget(w: dict):
-        props = w.get("props") or {}
-        f = props.get("font")
-        if not isinstance(f, str):
-            return
-        f = f.strip()
-        if not f.startswith("asset:"):
-            return
-        # asset:<filename>:<size>
-        try:
-            _, rest = f.split("asset:", 1)
-            filename, size_s = rest.rsplit(":", 1)
-            filename = filename.strip()
-            size = int(size_s.strip())
-            if not filename or size <= 0:
-                return
-            used.setdefault((filename, size), "")
-        except Exception:
-            return
-
-    for page in (project.get("pages") or []):
-        for w in (page.get("widgets") or []):
-            scan_widget(w)
+    used: dict[tuple[str, int], str] = dict.fromkeys((index or ProjectIndex.build(project)).font_refs, "")
 
     if not used:
         return "", {}
@@ -1938,28 +2931,19 @@ def _compile_fonts_from_project(project: dict) -> tuple[str, dict[str, str]]:
     return "".join(lines), font_id_map
 
 
-def _rewrite_widget_font_references(project: dict, font_id_map: dict[str, str]) -> dict:
-    # Deep copy with minimal overhead.
-    p = json.loads(json.dumps(project))
-    for page in (p.get("pages") or []):
-        for w in (page.get("widgets") or []):
-            props = w.get("props") or {}
-            f = props.get("font")
-            if isinstance(f, str):
-                key = f.strip()
-                if key in font_id_map:
-                    props["font"] = font_id_map[key]
-                    w["props"] = props
-    return p
-
-from aiohttp import web
-from homeassistant.core import HomeAssistant
+from aiohttp import WSCloseCode, web
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.helpers import area_registry as ar, device_registry as dr, entity_registry as er
+from homeassistant.helpers.event import async_track_state_change_event
 
 from ..const import (
+    CONF_COMPILE_PROFILING,
     CONF_ESPHOME_ADDON_TOKEN,
     CONF_ESPHOME_ADDON_URL,
+    CONF_STATE_WS_MAX_RATE,
+    DEFAULT_STATE_WS_MAX_RATE,
     DOMAIN,
     ESPHOME_ADDON_API_URL,
 )
@@ -1978,10 +2962,63 @@ def _active_entry_id(hass: HomeAssistant) -> str | None:
     return None
 
 
+def _compile_profiling_requested(request, hass: HomeAssistant, entry_id: str | None) -> str | None:
+    """"request" for ?profile=1 (timings and allocations), "option" when the integration option
+    profiles every compile (timings only; no tracemalloc on every compile), else None."""
+    if (request.query.get("profile") or "").strip().lower() in ("1", "true", "yes"):
+        return "request"
+    entry = hass.config_entries.async_get_entry(entry_id) if entry_id else None
+    opts = (entry.options or {}) if entry else {}
+    return "option" if opts.get(CONF_COMPILE_PROFILING) else None
+
+
 def _get_storage(hass: HomeAssistant, entry_id: str):
     return hass.data[DOMAIN][entry_id]["storage"]
 
 
+# --- Async file I/O: view handlers never touch the disk on the event loop ---
+# Blocking helpers (plain functions) run via hass.async_add_executor_job; views await the
+# _async_* wrappers or push a whole read/modify/write sequence into one executor job.
+
+
+def _read_text_if_exists(path: Path | None, default: str | None = "", errors: str | None = None) -> str | None:
+    if path is None or not path.exists():
+        return default
+    return path.read_text("utf-8", errors=errors) if errors else path.read_text("utf-8")
+
+
+def _resolve_recipe_text(hass: HomeAssistant, recipe_id: str, fallback_builtin: bool = True) -> str:
+    """Recipe YAML for recipe_id (user, v2 or builtin); "" when not found."""
+    entry = _RECIPES.get(hass, recipe_id)
+    if entry is not None:
+        return entry.text()
+    if fallback_builtin:
+        return _read_text_if_exists(RECIPES_BUILTIN_DIR / f"{recipe_id}.yaml")
+    return ""
+
+
+def _resolve_recipe_metadata(hass: HomeAssistant, recipe_id: str) -> dict | None:
+    """Extracted recipe metadata (resolution, board, ...) for recipe_id; None when not found."""
+    entry = _RECIPES.get(hass, recipe_id)
+    if entry is None or not entry.text():
+        return None
+    return entry.metadata()
+
+
+async def _async_read_text(
+    hass: HomeAssistant, path: Path | None, default: str | None = "", errors: str | None = None
+) -> str | None:
+    return await hass.async_add_executor_job(_read_text_if_exists, path, default, errors)
+
+
+async def _async_recipe_text(hass: HomeAssistant, recipe_id: str, fallback_builtin: bool = True) -> str:
+    return await hass.async_add_executor_job(_resolve_recipe_text, hass, recipe_id, fallback_builtin)
+
+
+async def _async_list_all_recipes(hass: HomeAssistant) -> list[dict]:
+    return await hass.async_add_executor_job(list_all_recipes, hass)
+
+
 async def _esphome_addon_request(
     hass: HomeAssistant,
     base_url: str,
@@ -2126,13 +3163,130 @@ def _merge_common_extras(schema: dict, widget_type: str | None = None) -> dict:
     return schema
 
 
+class _FrozenSchemaDict(dict):
+    """Read-only dict for cached schemas (shared across compiles; copy with dict() to modify)."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("cached widget schemas are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = setdefault = update = pop = popitem = clear = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        import copy
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+
+def _freeze_schema(value):
+    if isinstance(value, dict):
+        return _FrozenSchemaDict((k, _freeze_schema(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return [_freeze_schema(v) for v in value]
+    return value
+
+
+class _WidgetSchemaRegistry:
+    """Process-wide registry of widget schemas with common_extras already merged.
+
+    Loaded once (preload() runs in the executor at integration setup) and served from memory.
+    Files are re-stat'ed at most every RECHECK_SECONDS; a schema is reloaded only when its mtime
+    changes, and every schema is re-merged when common_extras.json changes. generation counts
+    those changes; the compile cache and section memo keys include it.
+    """
+
+    RECHECK_SECONDS = 2.0
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._schemas: dict[str, dict] = {}
+        self._mtimes: dict[str, float] = {}
+        self._extras_mtime: float | None = None
+        self._last_check = 0.0
+        self._loaded = False
+        self.loads = 0
+        self.generation = 0
+
+    @staticmethod
+    def _scan() -> tuple[dict[str, float], float | None]:
+        mtimes: dict[str, float] = {}
+        try:
+            with os.scandir(_schemas_dir()) as it:
+                for entry in it:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        mtimes[entry.name[:-5]] = entry.stat().st_mtime
+        except OSError:
+            pass
+        try:
+            extras_mtime = (_common_extras_dir() / "common_extras.json").stat().st_mtime
+        except OSError:
+            extras_mtime = None
+        return mtimes, extras_mtime
+
+    def _load_one(self, widget_type: str) -> dict | None:
+        try:
+            schema = json.loads((_schemas_dir() / f"{widget_type}.json").read_text("utf-8"))
+        except (OSError, ValueError):
+            return None
+        self.loads += 1
+        return _freeze_schema(_merge_common_extras(schema, widget_type))
+
+    def _refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and self._loaded and now - self._last_check < self.RECHECK_SECONDS:
+            return
+        mtimes, extras_mtime = self._scan()
+        reload_all = force or not self._loaded or extras_mtime != self._extras_mtime
+        changed = reload_all
+        for wtype in list(self._mtimes):
+            if wtype not in mtimes:
+                self._schemas.pop(wtype, None)
+                self._mtimes.pop(wtype, None)
+                changed = True
+        for wtype, mtime in mtimes.items():
+            if reload_all or self._mtimes.get(wtype) != mtime:
+                schema = self._load_one(wtype)
+                if schema is None:
+                    self._schemas.pop(wtype, None)
+                else:
+                    self._schemas[wtype] = schema
+                self._mtimes[wtype] = mtime
+                changed = True
+        if changed:
+            self.generation += 1
+        self._extras_mtime = extras_mtime
+        self._last_check = now
+        self._loaded = True
+
+    def preload(self) -> None:
+        """Load and merge every schema (blocking; run in the executor)."""
+        with self._lock:
+            self._refresh(force=True)
+
+    def get(self, widget_type: str) -> dict | None:
+        with self._lock:
+            self._refresh()
+            return self._schemas.get(widget_type)
+
+    def current_generation(self) -> int:
+        """generation after the usual (rate-limited) file check; blocking, like get()."""
+        with self._lock:
+            self._refresh()
+            return self.generation
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"schemas": len(self._schemas), "loads": self.loads, "generation": self.generation}
+
+
+_WIDGET_SCHEMAS = _WidgetSchemaRegistry()
+
+
 # --- v0.6: schema-driven widget emission ---
 def _load_widget_schema(widget_type: str) -> dict | None:
-    p = _schemas_dir() / f"{widget_type}.json"
-    if not p.exists():
-        return None
-    schema = json.loads(p.read_text("utf-8"))
-    return _merge_common_extras(schema, widget_type)
+    """Merged schema for widget_type from the registry (read-only), or None if there is no schema file."""
+    return _WIDGET_SCHEMAS.get(widget_type)
 
 
 def _yaml_quote(v) -> str:
@@ -2305,6 +3459,16 @@ def _action_binding_call_to_yaml(
     return "\n".join(lines)
 
 
+# Widget keys whose value is a font id; "asset:<file>:<size>" descriptors are resolved at emission time.
+_FONT_KEYS = frozenset({"font", "text_font", "label_text_font"})
+
+
+def _resolve_font_ref(key: str, value, font_id_map: dict[str, str] | None):
+    if font_id_map and key in _FONT_KEYS and isinstance(value, str):
+        return font_id_map.get(value.strip(), value)
+    return value
+
+
 def _emit_widget_from_schema(
     widget: dict,
     schema: dict,
@@ -2313,15 +3477,24 @@ def _emit_widget_from_schema(
     parent_h: int | None = None,
     option_maps: dict[str, list[str]] | None = None,
     event_snippets_out: dict | None = None,
+    font_id_map: dict[str, str] | None = None,
+    indent: str = "        ",
+    body_indent: str | None = None,
+    out: list[str] | None = None,
 ) -> str:
+    """Emit one widget as a YAML list item ("- <root_key>:") at indent, its keys at body_indent
+    (default indent + 4). With out, lines are appended to that buffer and "" is returned, so the
+    pages compiler writes every widget straight into one list without re-indenting."""
     wtype = widget.get("type") or schema.get("type")
     esphome = schema.get("esphome", {})
     root_key = esphome.get("root_key") or wtype  # e.g. "label", "button"
 
     # Widget list item: "- type:" then properties indented 2 more (YAML: value of single key for ESPHome)
-    body_indent = "            "  # 12 spaces: value under "- container:" so parser sees one key per list item
-    out: list[str] = []
-    out.append(f"        - {root_key}:\n")
+    if body_indent is None:
+        body_indent = indent + "    "  # value under "- container:" so parser sees one key per list item
+    buf = out
+    out = [] if buf is None else buf
+    out.append(f"{indent}- {root_key}:\n")
 
     # geometry: x, y may need conversion when align is not TOP_LEFT
     # LVGL: "If specifying align, x and y can be used as an offset to the calculated position"
@@ -2447,7 +3620,7 @@ def _emit_widget_from_schema(
                 continue
             yaml_key = mapping.get(k, k)
             if k in values and values[k] not in (None, ""):
-                v = values[k]
+                v = _resolve_font_ref(k, values[k], font_id_map)
                 if section == "props" and isinstance(field_def, dict) and field_def.get("type") == "yaml_block" and isinstance(v, str) and "\n" in v:
                     out.append(f"{body_indent}{yaml_key}:\n")
                     for line in v.strip().split("\n"):
@@ -2551,9 +3724,9 @@ def _emit_widget_from_schema(
             v = values.get(k)
             if v is None or v == "":
                 continue
-            out.append(_emit_kv(body_indent + "  ", k, v))
+            out.append(_emit_kv(body_indent + "  ", k, _resolve_font_ref(k, v, font_id_map)))
 
-    return "".join(out)
+    return "".join(out) if buf is None else ""
 
 
 def _esphome_safe_page_id(pid: str) -> str:
@@ -2622,55 +3795,31 @@ def _emit_style_dict(indent: str, d: dict, key_filter: set | None = None) -> str
     return "".join(out)
 
 
-def _collect_color_picker_defaults(project: dict) -> list[tuple[str, str, int]]:
+def _collect_color_picker_defaults(project: dict, index: ProjectIndex | None = None) -> list[tuple[str, str, int]]:
     """Collect (wid, wid_safe, initial_color) for color_picker widgets that have no action binding for on_click.
     These get the overlay (open script) on tap; we ignore legacy custom_events.on_click so overlay always wins."""
-    pages = project.get("pages") or []
-    action_bindings_by_widget: dict[str, list[dict]] = {}
-    for ab in project.get("action_bindings") or []:
-        if not isinstance(ab, dict):
-            continue
-        wid = str(ab.get("widget_id") or "").strip()
-        if wid:
-            action_bindings_by_widget.setdefault(wid, []).append(ab)
-    has_on_click_binding: set[str] = set()
-    for wid, ab_list in action_bindings_by_widget.items():
-        for ab in ab_list:
-            if str(ab.get("event") or "").strip().lower() == "on_click":
-                has_on_click_binding.add(wid)
-                break
+    index = index or ProjectIndex.build(project)
     out: list[tuple[str, str, int]] = []
-
-    def walk_widgets(widgets: list) -> None:
-        for w in widgets or []:
-            if not isinstance(w, dict):
-                continue
-            if str(w.get("type") or "") == "color_picker":
-                wid = str(w.get("id") or "").strip()
-                if not wid or wid in has_on_click_binding:
-                    continue
-                wid_safe = _safe_id(wid)
-                props = w.get("props") or {}
-                style = w.get("style") or {}
-                raw = props.get("value") or style.get("bg_color") or 0x4080FF
-                if isinstance(raw, str) and raw.strip().startswith("#"):
-                    s = raw.strip()
-                    if re.match(r"^#[0-9A-Fa-f]{6}$", s):
-                        initial = int(s[1:7], 16)
-                    elif re.match(r"^#[0-9A-Fa-f]{3}$", s):
-                        r, g, b = int(s[1], 16) * 17, int(s[2], 16) * 17, int(s[3], 16) * 17
-                        initial = r << 16 | g << 8 | b
-                    else:
-                        initial = 0x4080FF
-                else:
-                    initial = int(raw) if isinstance(raw, (int, float)) and not isinstance(raw, bool) else 0x4080FF
-                out.append((wid, wid_safe, initial))
-            walk_widgets(w.get("widgets") or [])
-
-    for page in pages:
-        if not isinstance(page, dict):
+    for w in index.widgets_of_type("color_picker"):
+        wid = str(w.get("id") or "").strip()
+        if not wid or wid in index.on_click_bound:
             continue
-        walk_widgets(page.get("widgets") or [])
+        wid_safe = _safe_id(wid)
+        props = w.get("props") or {}
+        style = w.get("style") or {}
+        raw = props.get("value") or style.get("bg_color") or 0x4080FF
+        if isinstance(raw, str) and raw.strip().startswith("#"):
+            s = raw.strip()
+            if re.match(r"^#[0-9A-Fa-f]{6}$", s):
+                initial = int(s[1:7], 16)
+            elif re.match(r"^#[0-9A-Fa-f]{3}$", s):
+                r, g, b = int(s[1], 16) * 17, int(s[2], 16) * 17, int(s[3], 16) * 17
+                initial = r << 16 | g << 8 | b
+            else:
+                initial = 0x4080FF
+        else:
+            initial = int(raw) if isinstance(raw, (int, float)) and not isinstance(raw, bool) else 0x4080FF
+        out.append((wid, wid_safe, initial))
     return out
 
 
@@ -2868,45 +4017,20 @@ def _mireds_to_rgb_hex(mireds: int) -> int:
     return (r << 16) | (g << 8) | b
 
 
-def _collect_white_picker_defaults(project: dict) -> list[tuple[str, str, int]]:
+def _collect_white_picker_defaults(project: dict, index: ProjectIndex | None = None) -> list[tuple[str, str, int]]:
     """Collect (wid, wid_safe, initial_mireds) for white_picker widgets that have no on_click action binding."""
-    pages = project.get("pages") or []
-    action_bindings_by_widget = {}
-    for ab in project.get("action_bindings") or []:
-        if not isinstance(ab, dict):
-            continue
-        wid = str(ab.get("widget_id") or "").strip()
-        if wid:
-            action_bindings_by_widget.setdefault(wid, []).append(ab)
-    has_on_click = set()
-    for wid, ab_list in action_bindings_by_widget.items():
-        for ab in ab_list:
-            if str(ab.get("event") or "").strip().lower() == "on_click":
-                has_on_click.add(wid)
-                break
+    index = index or ProjectIndex.build(project)
     out: list[tuple[str, str, int]] = []
-
-    def walk(widgets: list) -> None:
-        for w in widgets or []:
-            if not isinstance(w, dict):
-                continue
-            if str(w.get("type") or "") == "white_picker":
-                wid = str(w.get("id") or "").strip()
-                if not wid or wid in has_on_click:
-                    continue
-                wid_safe = _safe_id(wid)
-                props = w.get("props") or {}
-                raw = props.get("value")
-                if isinstance(raw, (int, float)) and not isinstance(raw, bool):
-                    initial = int(max(MIREDS_MIN, min(MIREDS_MAX, raw)))
-                else:
-                    initial = 326
-                out.append((wid, wid_safe, initial))
-            walk(w.get("widgets") or [])
-
-    for page in pages:
-        if isinstance(page, dict):
-            walk(page.get("widgets") or [])
+    for w in index.widgets_of_type("white_picker"):
+        wid = str(w.get("id") or "").strip()
+        if not wid or wid in index.on_click_bound:
+            continue
+        raw = (w.get("props") or {}).get("value")
+        if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+            initial = int(max(MIREDS_MIN, min(MIREDS_MAX, raw)))
+        else:
+            initial = 326
+        out.append((wid, _safe_id(wid), initial))
     return out
 
 
@@ -3157,31 +4281,15 @@ def _emit_white_picker_overlay_yaml(
     return "".join(out_lines)
 
 
-def _widget_bounds_by_id(project: dict, widget_id: str) -> tuple[int, int, int, int]:
-    """Return (x, y, width, height) for the first widget with id == widget_id in project pages. Default (0, 0, 80, 36) if not found."""
-    for page in project.get("pages") or []:
-        if not isinstance(page, dict):
-            continue
-        for w in page.get("widgets") or []:
-            if not isinstance(w, dict):
-                continue
-            if str(w.get("id") or "").strip() == str(widget_id).strip():
-                return (
-                    int(w.get("x", 0)),
-                    int(w.get("y", 0)),
-                    int(w.get("w", 80)),
-                    int(w.get("h", 36)),
-                )
-            # recurse into children (e.g. container widgets)
-            for c in w.get("widgets") or []:
-                if isinstance(c, dict) and str(c.get("id") or "").strip() == str(widget_id).strip():
-                    return (
-                        int(c.get("x", 0)),
-                        int(c.get("y", 0)),
-                        int(c.get("w", 80)),
-                        int(c.get("h", 36)),
-                    )
-    return (0, 0, 80, 36)
+def _widget_bounds_by_id(
+    project: dict, widget_id: str, index: ProjectIndex | None = None
+) -> tuple[int, int, int, int]:
+    """Return (x, y, width, height) for the first widget with id == widget_id in the project. Default (0, 0, 80, 36) if not found."""
+    index = index or ProjectIndex.build(project)
+    w = index.widget_by_id.get(str(widget_id).strip())
+    if w is None:
+        return (0, 0, 80, 36)
+    return (int(w.get("x", 0)), int(w.get("y", 0)), int(w.get("w", 80)), int(w.get("h", 36)))
 
 
 def _emit_color_picker_overlay_yaml(
@@ -3463,36 +4571,9 @@ def _preview_widget_yaml(project: dict, widget_id: str, page_index: int = 0) ->
     if not widget or widget.get("type") not in COMPILABLE_WIDGET_TYPES:
         return None
 
-    action_bindings_raw = project.get("action_bindings") or []
-    action_bindings_by_widget: dict[str, list[dict]] = {}
-    for ab in action_bindings_raw:
-        if not isinstance(ab, dict):
-            continue
-        wid = str(ab.get("widget_id") or "").strip()
-        if not wid:
-            continue
-        action_bindings_by_widget.setdefault(wid, []).append(ab)
-    ab_list = action_bindings_by_widget.get(str(widget_id)) or []
-
-    def _collect_options(widgets: list, m: dict[str, list[str]]) -> None:
-        for w in widgets or []:
-            if not isinstance(w, dict):
-                continue
-            t = w.get("type")
-            if t in ("dropdown", "roller") and w.get("id"):
-                props = w.get("props") or {}
-                opts = props.get("options") or ["Option A", "Option B"]
-                if isinstance(opts, str):
-                    opts = [s.strip() for s in opts.replace("\\n", "\n").split("\n") if s.strip()]
-                else:
-                    opts = [str(o).strip() for o in opts if str(o).strip()]
-                m[str(w["id"])] = opts if opts else ["(none)"]
-            _collect_options(w.get("widgets") or [], m)
-
-    option_maps: dict[str, list[str]] = {}
-    for p in pages:
-        if isinstance(p, dict):
-            _collect_options(p.get("widgets") or [], option_maps)
+    index = ProjectIndex.build(project)
+    ab_list = index.action_bindings_by_widget.get(str(widget_id)) or []
+    option_maps = index.options_by_id
 
     parent_w, parent_h = 100, 50
     parent_id = widget.get("parent_id")
@@ -3508,31 +4589,31 @@ def _preview_widget_yaml(project: dict, widget_id: str, page_index: int = 0) ->
     if not schema:
         return None
     event_snippets: dict = {}
-    raw = _emit_widget_from_schema(widget, schema, ab_list, parent_w, parent_h, option_maps, event_snippets_out=event_snippets)
-    # Normalize indent for standalone preview: 8 spaces -> 2, 12 spaces -> 4
-    lines = raw.splitlines()
-    out_lines = []
-    for ln in lines:
-        if ln.startswith("            "):
-            out_lines.append("    " + ln[12:])
-        elif ln.startswith("        "):
-            out_lines.append("  " + ln[8:])
-        else:
-            out_lines.append(ln)
-    return "\n".join(out_lines), event_snippets
+    _fonts_yaml, font_id_map = _compile_fonts_from_project(project, index)
+    # Standalone preview: list item at 2 spaces, keys at 4
+    raw = _emit_widget_from_schema(
+        widget, schema, ab_list, parent_w, parent_h, option_maps,
+        event_snippets_out=event_snippets, font_id_map=font_id_map, indent="  ", body_indent="    ",
+    )
+    return raw.removesuffix("\n"), event_snippets
 
 
+@_profiled("lvgl_pages")
 def _compile_lvgl_pages_schema_driven(
     project: dict,
     cpicker_defaults: list[tuple[str, str, int]] | None = None,
     wpicker_defaults: list[tuple[str, str, int]] | None = None,
+    index: ProjectIndex | None = None,
+    font_id_map: dict[str, str] | None = None,
 ) -> str:
     """Compile LVGL pages from the project model.
 
     v0.18: supports container-style parenting via `parent_id` and emits nested
     `widgets:` blocks where applicable.
     v0.71: emits lvgl_config (main, style_definitions, theme, gradients) then pages, then top_layer.
+    font_id_map ("asset:<file>:<size>" -> generated font id) is applied while emitting; the project is not copied.
     """
+    font_id_map = font_id_map or {}
     cpicker_defaults = cpicker_defaults or []
     wpicker_defaults = wpicker_defaults or []
     cpicker_by_wid = {wid: (wid_safe, initial) for (wid, wid_safe, initial) in cpicker_defaults}
@@ -3547,49 +4628,18 @@ def _compile_lvgl_pages_schema_driven(
     if not isinstance(pages, list) or not pages:
         pages = [{"page_id": "main", "name": "Main", "widgets": []}]
 
-    action_bindings_raw = project.get("action_bindings") or []
-    action_bindings_by_widget: dict[str, list[dict]] = {}
-    for ab in action_bindings_raw:
-        if not isinstance(ab, dict):
-            continue
-        wid = str(ab.get("widget_id") or "").strip()
-        if not wid:
-            continue
-        action_bindings_by_widget.setdefault(wid, []).append(ab)
+    index = index or ProjectIndex.build(project)
+    action_bindings_by_widget = index.action_bindings_by_widget
+    option_maps = index.options_by_id
 
-    def _collect_options(widgets: list, m: dict[str, list[str]]) -> None:
-        for w in widgets or []:
-            if not isinstance(w, dict):
-                continue
-            t = w.get("type")
-            if t in ("dropdown", "roller") and w.get("id"):
-                props = w.get("props") or {}
-                opts = props.get("options") or ["Option A", "Option B"]
-                if isinstance(opts, str):
-                    opts = [s.strip() for s in opts.replace("\\n", "\n").split("\n") if s.strip()]
-                else:
-                    opts = [str(o).strip() for o in opts if str(o).strip()]
-                m[str(w["id"])] = opts if opts else ["(none)"]
-            _collect_options(w.get("widgets") or [], m)
-
-    option_maps: dict[str, list[str]] = {}
-    for page in pages:
-        if isinstance(page, dict):
-            _collect_options(page.get("widgets") or [], option_maps)
-
-    def children_map(all_widgets: list[dict]) -> dict[str, list[dict]]:
-        m: dict[str, list[dict]] = {}
-        for w in all_widgets:
-            pid = str(w.get("parent_id") or "")
-            if not pid:
-                continue
-            m.setdefault(pid, []).append(w)
-        return m
+    # Every widget is written straight into this buffer at its final indent (list item at indent,
+    # keys at indent + 4, children at indent + 6); nothing is joined or re-indented per widget.
+    out: list[str] = []
 
-    def emit_widget(w: dict, indent: str, kids: dict[str, list[dict]], parent_w: int, parent_h: int) -> str:
+    def emit_widget(w: dict, indent: str, kids: dict[str, list[dict]], parent_w: int, parent_h: int) -> None:
         wtype = w.get("type")
         if wtype not in COMPILABLE_WIDGET_TYPES:
-            return ""  # Non-ESPHome widget types are not emitted
+            return  # Non-ESPHome widget types are not emitted
         wid = str(w.get("id") or "")
         ab_list = action_bindings_by_widget.get(wid) or []
         schema = _load_widget_schema(str(wtype)) if wtype else None
@@ -3625,19 +4675,18 @@ def _compile_lvgl_pages_schema_driven(
                     elif align == "BOTTOM_RIGHT":
                         x_val = x_val + w_val - parent_w
                         y_val = y_val + h_val - parent_h
-                # Use fixed format (8/12 spaces) so post-processor applies indent correctly
-                raw = (
-                    "        - button:\n"
-                    "            id: {wid}\n"
-                    "            x: {x_val}\n"
-                    "            y: {y_val}\n"
-                    "            width: {w_val}\n"
-                    "            height: {h_val}\n"
-                    "            styles: etd_cp_{wid_safe}\n"
-                    "            on_click:\n"
-                    "              then:\n"
-                    "                - script.execute: etd_cp_{wid_safe}_open\n"
-                ).format(wid=wid, x_val=x_val, y_val=y_val, w_val=w_val, h_val=h_val, wid_safe=wid_safe)
+                out.append(
+                    f"{indent}- button:\n"
+                    f"{indent}    id: {wid}\n"
+                    f"{indent}    x: {x_val}\n"
+                    f"{indent}    y: {y_val}\n"
+                    f"{indent}    width: {w_val}\n"
+                    f"{indent}    height: {h_val}\n"
+                    f"{indent}    styles: etd_cp_{wid_safe}\n"
+                    f"{indent}    on_click:\n"
+                    f"{indent}      then:\n"
+                    f"{indent}        - script.execute: etd_cp_{wid_safe}_open\n"
+                )
             elif wtype == "color_picker":
                 # Emit as button with bg_color from props.value (current colour). Do not emit props.value — button has no value key.
                 props = w_emit.get("props") or {}
@@ -3645,7 +4694,7 @@ def _compile_lvgl_pages_schema_driven(
                 w_emit["style"] = dict(style)
                 w_emit["style"]["bg_color"] = props.get("value") or style.get("bg_color") or 0x4080FF
                 w_emit["props"] = {k: v for k, v in props.items() if k != "value"}
-                raw = _emit_widget_from_schema(w_emit, schema, ab_list, parent_w, parent_h, option_maps)
+                _emit_widget_from_schema(w_emit, schema, ab_list, parent_w, parent_h, option_maps, font_id_map=font_id_map, indent=indent, out=out)
             elif wtype == "white_picker" and wid in wpicker_by_wid:
                 wid_safe, _initial_m = wpicker_by_wid[wid]
                 x_val = int(w.get("x", 0))
@@ -3675,19 +4724,18 @@ def _compile_lvgl_pages_schema_driven(
                     elif align == "BOTTOM_RIGHT":
                         x_val = x_val + w_val - parent_w
                         y_val = y_val + h_val - parent_h
-                # Use fixed format (8/12 spaces) so post-processor applies indent correctly
-                raw = (
-                    "        - button:\n"
-                    "            id: {wid}\n"
-                    "            x: {x_val}\n"
-                    "            y: {y_val}\n"
-                    "            width: {w_val}\n"
-                    "            height: {h_val}\n"
-                    "            styles: etd_wp_{wid_safe}\n"
-                    "            on_click:\n"
-                    "              then:\n"
-                    "                - script.execute: etd_wp_{wid_safe}_open\n"
-                ).format(wid=wid, x_val=x_val, y_val=y_val, w_val=w_val, h_val=h_val, wid_safe=wid_safe)
+                out.append(
+                    f"{indent}- button:\n"
+                    f"{indent}    id: {wid}\n"
+                    f"{indent}    x: {x_val}\n"
+                    f"{indent}    y: {y_val}\n"
+                    f"{indent}    width: {w_val}\n"
+                    f"{indent}    height: {h_val}\n"
+                    f"{indent}    styles: etd_wp_{wid_safe}\n"
+                    f"{indent}    on_click:\n"
+                    f"{indent}      then:\n"
+                    f"{indent}        - script.execute: etd_wp_{wid_safe}_open\n"
+                )
             elif wtype == "white_picker":
                 props = w_emit.get("props") or {}
                 style = w_emit.get("style") or {}
@@ -3696,7 +4744,7 @@ def _compile_lvgl_pages_schema_driven(
                 w_emit["style"] = dict(style)
                 w_emit["style"]["bg_color"] = _mireds_to_rgb_hex(initial_m)
                 w_emit["props"] = {k: v for k, v in props.items() if k != "value"}
-                raw = _emit_widget_from_schema(w_emit, schema, ab_list, parent_w, parent_h, option_maps)
+                _emit_widget_from_schema(w_emit, schema, ab_list, parent_w, parent_h, option_maps, font_id_map=font_id_map, indent=indent, out=out)
             elif wtype == "arc_labeled":
                 # Emit container with arc + line widgets (ticks) + label widgets (scale numbers) so they appear on device.
                 x_val = int(w.get("x", 0))
@@ -3718,11 +4766,12 @@ def _compile_lvgl_pages_schema_driven(
                     label_color = _hex_color_for_yaml(label_color) or 0xFFFFFF
                 label_color = int(label_color) & 0xFFFFFF
                 label_font = (style.get("label_text_font") or "").strip() or None
+                if label_font and label_font in font_id_map:
+                    label_font = font_id_map[label_font]
                 # Arc at (0,0) inside container
                 w_arc = dict(w)
                 w_arc["x"] = 0
                 w_arc["y"] = 0
-                raw_arc = _emit_widget_from_schema(w_arc, schema, ab_list, parent_w, parent_h, option_maps)
                 cx = w_val / 2.0
                 cy = h_val / 2.0
                 r = min(w_val, h_val) / 2.0
@@ -3736,7 +4785,7 @@ def _compile_lvgl_pages_schema_driven(
                 ci = indent + "    "
                 ce = indent + "      "
                 cb = indent + "        "
-                out_parts = [
+                out.extend([
                     f"{indent}- container:\n",
                     f"{ci}id: {wid}_ct\n",
                     f"{ci}x: {x_val}\n",
@@ -3744,12 +4793,12 @@ def _compile_lvgl_pages_schema_driven(
                     f"{ci}width: {w_val}\n",
                     f"{ci}height: {h_val}\n",
                     f"{ci}widgets:\n",
-                ]
-                for ln in raw_arc.splitlines(True):
-                    if ln.startswith("            "):
-                        out_parts.append(cb + ln[12:])
-                    elif ln.startswith("        "):
-                        out_parts.append(ce + ln[8:])
+                ])
+                # Arc keys sit 2 (not 4) in from its list item inside the container
+                _emit_widget_from_schema(
+                    w_arc, schema, ab_list, parent_w, parent_h, option_maps,
+                    font_id_map=font_id_map, indent=ce, body_indent=cb, out=out,
+                )
                 for i, value in enumerate(tick_values):
                     angle_deg = _value_to_angle_deg(rot, start_angle, end_angle, mode, min_val, max_val, float(value))
                     angle_rad = math.radians(angle_deg)
@@ -3761,17 +4810,17 @@ def _compile_lvgl_pages_schema_driven(
                     y2 = cy + r * s
                     pts = [f"{int(round(x1))},{int(round(y1))}", f"{int(round(x2))},{int(round(y2))}"]
                     line_id = f"{wid}_tick_{i}"
-                    out_parts.append(f"{ce}- line:\n")
-                    out_parts.append(f"{cb}id: {line_id}\n")
-                    out_parts.append(f"{cb}x: 0\n")
-                    out_parts.append(f"{cb}y: 0\n")
-                    out_parts.append(f"{cb}width: {w_val}\n")
-                    out_parts.append(f"{cb}height: {h_val}\n")
-                    out_parts.append(f"{cb}points:\n")
-                    out_parts.append(f"{cb}  - {pts[0]}\n")
-                    out_parts.append(f"{cb}  - {pts[1]}\n")
-                    out_parts.append(f"{cb}line_width: 1\n")
-                    out_parts.append(f"{cb}line_color: 0x{label_color:06X}\n")
+                    out.append(f"{ce}- line:\n")
+                    out.append(f"{cb}id: {line_id}\n")
+                    out.append(f"{cb}x: 0\n")
+                    out.append(f"{cb}y: 0\n")
+                    out.append(f"{cb}width: {w_val}\n")
+                    out.append(f"{cb}height: {h_val}\n")
+                    out.append(f"{cb}points:\n")
+                    out.append(f"{cb}  - {pts[0]}\n")
+                    out.append(f"{cb}  - {pts[1]}\n")
+                    out.append(f"{cb}line_width: 1\n")
+                    out.append(f"{cb}line_color: 0x{label_color:06X}\n")
                 label_font_size = max(8, min(24, int(style.get("label_font_size") or 0) or 14))
                 for i, value in enumerate(label_values):
                     angle_deg = _value_to_angle_deg(rot, start_angle, end_angle, mode, min_val, max_val, float(value))
@@ -3784,30 +4833,18 @@ def _compile_lvgl_pages_schema_driven(
                     lx_int = int(round(lx - half))
                     ly_int = int(round(ly - label_font_size / 2))
                     lbl_id = f"{wid}_lbl_{value}"
-                    out_parts.append(f"{ce}- label:\n")
-                    out_parts.append(f"{cb}id: {lbl_id}\n")
-                    out_parts.append(f"{cb}x: {lx_int}\n")
-                    out_parts.append(f"{cb}y: {ly_int}\n")
-                    out_parts.append(f"{cb}width: {box}\n")
-                    out_parts.append(f"{cb}height: {label_font_size + 2}\n")
-                    out_parts.append(f"{cb}text: {json.dumps(text)}\n")
-                    out_parts.append(f"{cb}text_color: 0x{label_color:06X}\n")
+                    out.append(f"{ce}- label:\n")
+                    out.append(f"{cb}id: {lbl_id}\n")
+                    out.append(f"{cb}x: {lx_int}\n")
+                    out.append(f"{cb}y: {ly_int}\n")
+                    out.append(f"{cb}width: {box}\n")
+                    out.append(f"{cb}height: {label_font_size + 2}\n")
+                    out.append(f"{cb}text: {json.dumps(text)}\n")
+                    out.append(f"{cb}text_color: 0x{label_color:06X}\n")
                     if label_font:
-                        out_parts.append(f"{cb}text_font: {json.dumps(label_font)}\n")
-                out = "".join(out_parts)
+                        out.append(f"{cb}text_font: {json.dumps(label_font)}\n")
             else:
-                raw = _emit_widget_from_schema(w_emit, schema, ab_list, parent_w, parent_h, option_maps)
-            if wtype != "arc_labeled":
-                lines = raw.splitlines(True)
-                out_lines = []
-                for ln in lines:
-                    if ln.startswith("            "):  # body: value of single-key dict (12 spaces)
-                        out_lines.append(indent + "    " + ln[12:])
-                    elif ln.startswith("        "):
-                        out_lines.append(indent + ln[8:])  # first line "- type:"
-                    else:
-                        out_lines.append(indent + ln)
-                out = "".join(out_lines)
+                _emit_widget_from_schema(w_emit, schema, ab_list, parent_w, parent_h, option_maps, font_id_map=font_id_map, indent=indent, out=out)
         else:
             # No schema: emit bar/arc from props (e.g. prebuilt WiFi bar/fan) or fallback to container
             wid = str(w.get("id") or "w")
@@ -3829,7 +4866,7 @@ def _compile_lvgl_pages_schema_driven(
                     bc = _hex_color_for_yaml(style["bg_color"])
                     if bc is not None:
                         lines.append(f"{indent}    bg_color: 0x{int(bc):06X}\n")
-                out = "".join(lines)
+                out.extend(lines)
             elif wtype == "arc" or wtype == "arc_labeled":
                 lines = [
                     f"{indent}- arc:\n",
@@ -3853,33 +4890,29 @@ def _compile_lvgl_pages_schema_driven(
                     bc = _hex_color_for_yaml(style["bg_color"])
                     if bc is not None:
                         lines.append(f"{indent}    bg_color: 0x{int(bc):06X}\n")
-                out = "".join(lines)
+                out.extend(lines)
             else:
-                out = "".join(
-                    [
-                        f"{indent}- container:\n",
-                        f"{indent}    id: {wid}\n",
-                        f"{indent}    x: {int(w.get('x', 0))}\n",
-                        f"{indent}    y: {int(w.get('y', 0))}\n",
-                        f"{indent}    width: {int(w.get('w', 100))}\n",
-                        f"{indent}    height: {int(w.get('h', 50))}\n",
-                    ]
-                )
+                out.extend([
+                    f"{indent}- container:\n",
+                    f"{indent}    id: {wid}\n",
+                    f"{indent}    x: {int(w.get('x', 0))}\n",
+                    f"{indent}    y: {int(w.get('y', 0))}\n",
+                    f"{indent}    width: {int(w.get('w', 100))}\n",
+                    f"{indent}    height: {int(w.get('h', 50))}\n",
+                ])
 
         # Children: nest under `widgets:`. ESPHome LVGL supports this for containers and many widgets.
         wid = str(w.get("id") or "")
         child_list = kids.get(wid) or []
         pw, ph = int(w.get("w", 100)), int(w.get("h", 50))
         if child_list:
-            out += f"{indent}    widgets:\n"
+            out.append(f"{indent}    widgets:\n")
             for c in child_list:
-                out += emit_widget(c, indent + "      ", kids, pw, ph)  # 6 spaces: list item 2 under "widgets:"
+                emit_widget(c, indent + "      ", kids, pw, ph)  # 6 spaces: list item 2 under "widgets:"
         elif wtype == "container":
             # Empty container: emit explicit list so structure is valid
-            out += f"{indent}    widgets: []\n"
-        return out
+            out.append(f"{indent}    widgets: []\n")
 
-    out: list[str] = []
     # Emit main config, style_definitions, theme, gradients (from lvgl_config + color picker styles)
     out.append(_compile_lvgl_config_body(project, cpicker_styles=cpicker_styles, wpicker_styles=wpicker_styles))
 
@@ -3894,7 +4927,7 @@ def _compile_lvgl_pages_schema_driven(
             disp_bg_hex = r << 16 | g << 8 | b
 
     out.append("  pages:\n")
-    for page in pages:
+    for page_idx, page in enumerate(pages):
         if not isinstance(page, dict):
             continue
         raw_pid = page.get("page_id") or page.get("id") or "main"
@@ -3914,7 +4947,7 @@ def _compile_lvgl_pages_schema_driven(
         all_widgets = page.get("widgets") or []
         if not isinstance(all_widgets, list):
             all_widgets = []
-        kids = children_map([w for w in all_widgets if isinstance(w, dict)])
+        kids = index.page_children[page_idx] if page_idx < len(index.page_children) else {}
         roots = [w for w in all_widgets if isinstance(w, dict) and not w.get("parent_id")]
         # Display dims for align conversion: extract from recipe_id (e.g. guition_s3_4848s040_480x480)
         recipe_id = str((project.get("hardware") or {}).get("recipe_id", "") or (project.get("device") or {}).get("hardware_recipe_id", "") or "")
@@ -3925,7 +4958,7 @@ def _compile_lvgl_pages_schema_driven(
         else:
             out.append("      widgets:\n")
             for w in roots:
-                out.append(emit_widget(w, "        ", kids, disp_w, disp_h))
+                emit_widget(w, "        ", kids, disp_w, disp_h)
 
     # top_layer: user widgets (from lvgl_config.top_layer.widgets) + colour picker overlays
     top_layer = (project.get("lvgl_config") or {}).get("top_layer") or {}
@@ -3939,15 +4972,15 @@ def _compile_lvgl_pages_schema_driven(
         out.append("    id: top_layer\n")
         out.append("    widgets:\n")
         if has_tl:
-            tl_kids = children_map([w for w in tl_widgets if isinstance(w, dict)])
+            tl_kids = index.top_layer_children
             tl_roots = [w for w in tl_widgets if isinstance(w, dict) and not w.get("parent_id")]
             for w in tl_roots:
-                out.append(emit_widget(w, "      ", tl_kids, disp_w, disp_h))  # 6 spaces: 2 in from "widgets"
+                emit_widget(w, "      ", tl_kids, disp_w, disp_h)  # 6 spaces: 2 in from "widgets"
         for wid, wid_safe, _initial in cpicker_defaults:
-            btn_x, btn_y, btn_w, btn_h = _widget_bounds_by_id(project, wid)
+            btn_x, btn_y, btn_w, btn_h = _widget_bounds_by_id(project, wid, index)
             out.append(_emit_color_picker_overlay_yaml(wid_safe, disp_w, disp_h, btn_x, btn_y, btn_w, btn_h))
         for wid, wid_safe, _initial_m in wpicker_defaults:
-            btn_x, btn_y, btn_w, btn_h = _widget_bounds_by_id(project, wid)
+            btn_x, btn_y, btn_w, btn_h = _widget_bounds_by_id(project, wid, index)
             out.append(_emit_white_picker_overlay_yaml(wid_safe, disp_w, disp_h, btn_x, btn_y, btn_w, btn_h))
 
     return "".join(out)
@@ -4039,14 +5072,28 @@ class DiagnosticsView(HomeAssistantView):
         hass: HomeAssistant = request.app["hass"]
         entry_id = _active_entry_id(hass)
         device_count = 0
+        save_stats = None
         if entry_id:
             storage = _get_storage(hass, entry_id)
-            device_count = len(storage.state.devices)
+            device_count = storage.device_count
+            save_stats = storage.save_stats()
+        entity_index = hass.data.get(DOMAIN, {}).get("entity_index")  # only once a search built it
         return self.json({
             "ok": True,
             "version": _integration_version(),
             "entry_id": entry_id,
             "device_count": device_count,
+            "storage": save_stats,
+            "compile_cache": _COMPILE_CACHE.stats(),
+            "section_memo": _SECTION_MEMO.stats(),
+            "widget_schemas": _WIDGET_SCHEMAS.stats(),
+            "recipes": _RECIPES.stats(),
+            "recipe_analysis": _RECIPE_ANALYSIS.stats(),
+            "recipe_bundle": _BUILTIN_BUNDLE.stats(),
+            "compile_profile": _PROFILE_HISTORY.stats(),
+            "compile_pool": _COMPILE_POOL.stats(),
+            "state_hub": _state_hub(hass).stats(),
+            "entity_index": entity_index.stats() if entity_index is not None else None,
         })
 
 
@@ -4074,7 +5121,7 @@ class SelfCheckView(HomeAssistantView):
 
         # 1) Recipe discovery
         try:
-            recipes = list_all_recipes(hass)
+            recipes = await _async_list_all_recipes(hass)
             results.append({
                 "name": "recipes_list",
                 "ok": True,
@@ -4134,8 +5181,8 @@ class SelfCheckView(HomeAssistantView):
                     device_settings={},
                     project=s["project"],
                 )
-                y1 = compile_to_esphome_yaml(dev)
-                y2 = compile_to_esphome_yaml(dev)
+                y1 = await _COMPILE_POOL.run(dev.device_id, compile_to_esphome_yaml, dev)
+                y2 = await _COMPILE_POOL.run(dev.device_id, compile_to_esphome_yaml, dev)
                 results.append({
                     "name": f"compile_determinism:{s['name']}",
                     "ok": y1 == y2 and bool(y1.strip()),
@@ -4219,9 +5266,14 @@ class SchemasView(HomeAssistantView):
     requires_auth = False  # Panel iframe: Safari may not send cookies; panel access is gated by sidebar
 
     async def get(self, request):
-        schemas_path = _schemas_dir()
+        hass: HomeAssistant = request.app["hass"]
+        items = await hass.async_add_executor_job(self._list_schemas)
+        return self.json({"ok": True, "schemas": items})
+
+    @staticmethod
+    def _list_schemas() -> list[dict]:
         items = []
-        for p in sorted(schemas_path.glob("*.json")):
+        for p in sorted(_schemas_dir().glob("*.json")):
             wtype = p.stem
             if wtype not in PALETTE_WIDGET_TYPES:
                 continue
@@ -4234,7 +5286,7 @@ class SchemasView(HomeAssistantView):
                 })
             except Exception:
                 continue
-        return self.json({"ok": True, "schemas": items})
+        return items
 
 
 class SchemaDetailView(HomeAssistantView):
@@ -4243,11 +5295,10 @@ class SchemaDetailView(HomeAssistantView):
     requires_auth = False
 
     async def get(self, request, widget_type: str):
-        schemas_path = _schemas_dir() / f"{widget_type}.json"
-        if not schemas_path.exists():
+        hass: HomeAssistant = request.app["hass"]
+        data = await hass.async_add_executor_job(_load_widget_schema, widget_type)
+        if data is None:
             return self.json({"ok": False, "error": "schema_not_found"}, status_code=404)
-        data = json.loads(schemas_path.read_text("utf-8"))
-        data = _merge_common_extras(data, widget_type)
         return self.json({"ok": True, "schema": data})
 
 
@@ -4272,7 +5323,7 @@ class DevicesView(HomeAssistantView):
                     "hardware_recipe_id": d.hardware_recipe_id,
                     "api_key": d.api_key,
                 }
-                for d in storage.state.devices.values()
+                for d in storage.list_devices()
             ]
         })
 
@@ -4285,7 +5336,7 @@ class DevicesView(HomeAssistantView):
         body = await request.json()
         storage = _get_storage(hass, entry_id)
 
-        existing = storage.get_device(body["device_id"])
+        existing = await storage.async_get_device(body["device_id"])
         api_key = body.get("api_key")
         if existing is not None:
             api_key = api_key if api_key is not None and str(api_key).strip() else existing.api_key
@@ -4314,14 +5365,13 @@ class DevicesView(HomeAssistantView):
         if existing is None and device.hardware_recipe_id:
             proj = dict(device.project or {})
             if not (proj.get("esphome_yaml") or "").strip():
-                recipe_path = _find_recipe_path_by_id(hass, device.hardware_recipe_id)
-                if recipe_path and recipe_path.exists():
-                    recipe_text = recipe_path.read_text("utf-8")
+                recipe_text = await _async_recipe_text(hass, device.hardware_recipe_id, fallback_builtin=False)
+                if recipe_text:
                     default_bodies = _build_recipe_default_sections(recipe_text, device)
                     proj["esphome_yaml"] = _sections_to_yaml(default_bodies)
                     device.project = proj
         storage.upsert_device(device)
-        await storage.async_save()
+        storage.async_schedule_save(device.device_id)
         return self.json({"ok": True})
 
     async def delete(self, request):
@@ -4351,7 +5401,7 @@ class DeviceProjectView(HomeAssistantView):
         if not entry_id:
             return self.json({"ok": False, "error": "no_active_entry"}, status_code=500)
         storage = _get_storage(hass, entry_id)
-        device = storage.get_device(device_id)
+        device = await storage.async_get_device(device_id)
         if not device:
             return self.json({"ok": False, "error": "device_not_found"}, status_code=404)
         project = dict(device.project) if device.project else {}
@@ -4361,10 +5411,12 @@ class DeviceProjectView(HomeAssistantView):
         if device.hardware_recipe_id:
             screen = (project.get("device") or {}).get("screen") or {}
             if not (screen.get("width") and screen.get("height")):
-                recipe_path = _find_recipe_path_by_id(hass, device.hardware_recipe_id)
-                if recipe_path and recipe_path.exists():
+                try:
+                    meta = await hass.async_add_executor_job(_resolve_recipe_metadata, hass, device.hardware_recipe_id)
+                except Exception:
+                    meta = None
+                if meta:
                     try:
-                        meta = _extract_recipe_metadata_from_text(recipe_path.read_text("utf-8"), recipe_id=device.hardware_recipe_id)
                         res = meta.get("resolution")
                         if isinstance(res, dict) and res.get("width") and res.get("height"):
                             project.setdefault("device", {})
@@ -4383,7 +5435,7 @@ class DeviceProjectView(HomeAssistantView):
         if not entry_id:
             return self.json({"ok": False, "error": "no_active_entry"}, status_code=500)
         storage = _get_storage(hass, entry_id)
-        device = storage.get_device(device_id)
+        device = await storage.async_get_device(device_id)
         if not device:
             return self.json({"ok": False, "error": "device_not_found"}, status_code=404)
         body = await request.json()
@@ -4396,7 +5448,7 @@ class DeviceProjectView(HomeAssistantView):
         removed = list(removed_sections) + list(removed_comps)
         device.project = project
         storage.upsert_device(device)
-        await storage.async_save()
+        storage.async_schedule_save(device_id)
         return self.json({"ok": True, "removed_orphans": [{"section": s, "widget_id": w} for s, w in removed]})
 
 
@@ -4445,7 +5497,12 @@ def _user_recipes_root(hass: HomeAssistant) -> Path:
 
 
 def list_all_recipes(hass) -> list[dict]:
-    """Return builtin + user-provided recipes."""
+    """Return builtin + user-provided recipes (served from the recipe registry)."""
+    return _RECIPES.list(hass)
+
+
+def _scan_recipes(hass) -> list[dict]:
+    """Walk the builtin and user recipe folders; the registry calls this when a folder changed."""
     recipes: list[dict] = []
 
     # Built-in (integration shipped)
@@ -4510,6 +5567,236 @@ def list_all_recipes(hass) -> list[dict]:
     return sorted(recipes, key=_sort_key)
 
 
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return -1
+
+
+@dataclass(eq=False)
+class RecipeEntry:
+    """One registered recipe: listing fields plus its text and derived data, loaded on first use.
+
+    The text is re-read when the file's mtime changes; sections, metadata and display id come
+    from _RECIPE_ANALYSIS for the current text.
+    """
+
+    id: str
+    path: Path
+    info: dict
+    _loaded_mtime: int = field(default=-1, repr=False)
+    _text: str | None = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def text(self) -> str:
+        mtime = _mtime_ns(self.path)
+        with self._lock:
+            if self._text is None and self.info.get("kind") == "builtin":
+                self._text = _BUILTIN_BUNDLE.text(self.id)
+                self._loaded_mtime = mtime
+            if self._text is None or mtime != self._loaded_mtime:
+                try:
+                    self._text = self.path.read_text("utf-8") if mtime >= 0 else ""
+                except OSError:
+                    self._text = ""
+                self._loaded_mtime = mtime
+            return self._text
+
+    def sections(self) -> dict[str, str]:
+        return _RECIPE_ANALYSIS.sections(self.text())
+
+    def metadata(self) -> dict:
+        return _RECIPE_ANALYSIS.metadata(self.text(), recipe_id=self.id)
+
+    def display_id(self) -> str | None:
+        return _RECIPE_ANALYSIS.display_id(self.text())
+
+
+class _RecipeRegistry:
+    """In-memory recipe index keyed by id, replacing folder scans on every recipe lookup.
+
+    The index is rebuilt when the builtin folder, the user recipes root or its user/ folder
+    changes mtime (recipes added, removed or renamed) and when a recipe view calls
+    invalidate() (label edits rewrite metadata.json in place). Lookups otherwise cost three
+    stat calls and a dict access. The first entry per id in listing order wins, as before.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stamp: tuple | None = None
+        self._listing: list[dict] = []
+        self._by_id: dict[str, RecipeEntry] = {}
+        self.lookups = 0
+        self.rebuilds = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _stamp_for(hass) -> tuple:
+        root = Path(hass.config.path("esphome_touch_designer")) / "recipes"
+        return (str(root), _mtime_ns(RECIPES_BUILTIN_DIR), _mtime_ns(root), _mtime_ns(root / "user"))
+
+    def _current(self, hass) -> dict[str, RecipeEntry]:
+        stamp = self._stamp_for(hass)
+        with self._lock:
+            if stamp == self._stamp:
+                return self._by_id
+        listing = _scan_recipes(hass)
+        with self._lock:
+            by_id: dict[str, RecipeEntry] = {}
+            for r in listing:
+                rid = r.get("id")
+                if rid in by_id or not r.get("path"):
+                    continue
+                old = self._by_id.get(rid)
+                path = Path(str(r["path"]))
+                # Keep loaded text/derived data when the recipe itself did not move.
+                by_id[rid] = old if old is not None and old.path == path else RecipeEntry(id=rid, path=path, info=r)
+                by_id[rid].info = r
+            self._listing = listing
+            self._by_id = by_id
+            # Stamp taken before the scan: a change during the scan triggers another rebuild.
+            self._stamp = stamp
+            self.rebuilds += 1
+            return by_id
+
+    def get(self, hass, recipe_id: str) -> RecipeEntry | None:
+        self.lookups += 1
+        return self._current(hass).get(recipe_id)
+
+    def list(self, hass) -> list[dict]:
+        self._current(hass)
+        with self._lock:
+            return [dict(r) for r in self._listing]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._stamp = None
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stamp = None
+            self._listing = []
+            self._by_id = {}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "recipes": len(self._by_id),
+                "lookups": self.lookups,
+                "rebuilds": self.rebuilds,
+                "invalidations": self.invalidations,
+            }
+
+
+_RECIPES = _RecipeRegistry()
+
+
+# --- Precompiled builtin recipe bundle (generated by scripts/build_recipe_bundle.py) ---
+
+RECIPE_BUNDLE_PATH = RECIPES_BUILTIN_DIR.parent / "builtin_bundle.json"
+RECIPE_BUNDLE_FORMAT = 1
+
+
+def build_recipe_bundle() -> dict:
+    """Analyse every builtin recipe: text, sections, default section pieces, display id, metadata, label."""
+    recipes: dict[str, dict] = {}
+    for r in _scan_builtin_recipes():
+        path = Path(r["path"])
+        text = path.read_text("utf-8")
+        recipes[r["id"]] = {
+            "name": r["name"],
+            "file": path.name,
+            "size": path.stat().st_size,
+            "sha256": sha256(text),
+            "text": text,
+            "sections": _parse_recipe_into_sections(text),
+            "default_pieces": _recipe_default_pieces(text),
+            "display_id": _display_id_from_recipe(text),
+            "metadata": _extract_recipe_metadata_from_text(text, recipe_id=r["id"]),
+        }
+    return {"format": RECIPE_BUNDLE_FORMAT, "recipes": recipes}
+
+
+class _BuiltinRecipeBundle:
+    """Builtin recipes precompiled into one JSON file, loaded with a single read at startup.
+
+    The bundle is only used when it matches the shipped recipes (same files, same sizes, same
+    sha256 of the text); otherwise every lookup falls back to reading and parsing the YAML
+    files as before. Hashing costs one read per recipe at startup but no YAML parsing.
+    Loading seeds _RECIPE_ANALYSIS so builtin recipes are never parsed at request time.
+    """
+
+    def __init__(self, path: Path = RECIPE_BUNDLE_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._recipes: dict[str, dict] | None = None
+        self.error: str | None = None
+
+    def load(self) -> bool:
+        """Read and validate the bundle (once). Returns whether it is in use."""
+        with self._lock:
+            if self._loaded:
+                return self._recipes is not None
+            self._loaded = True
+            try:
+                doc = json.loads(self.path.read_text("utf-8"))
+                recipes = doc.get("recipes") or {}
+                if doc.get("format") != RECIPE_BUNDLE_FORMAT:
+                    raise ValueError(f"format {doc.get('format')!r}")
+                on_disk = {p.name: p.stat().st_size for p in RECIPES_BUILTIN_DIR.glob("*.yaml")}
+                if on_disk != {r["file"]: r["size"] for r in recipes.values()}:
+                    raise ValueError("builtin recipes changed since the bundle was built")
+                for r in recipes.values():
+                    if sha256((RECIPES_BUILTIN_DIR / r["file"]).read_text("utf-8")) != r["sha256"]:
+                        raise ValueError(f"builtin recipe {r['file']} changed since the bundle was built")
+            except Exception as err:
+                self.error = str(err)
+                return False
+            self._recipes = recipes
+        for rid, r in recipes.items():
+            _RECIPE_ANALYSIS.seed(r["sha256"], {
+                "sections": r["sections"],
+                "default_pieces": r["default_pieces"],
+                "display_id": r["display_id"],
+                f"metadata:{rid}": r["metadata"],
+            })
+        return True
+
+    def _current(self) -> dict[str, dict] | None:
+        if not self._loaded:
+            self.load()
+        return self._recipes
+
+    def listing(self) -> list[dict] | None:
+        recipes = self._current()
+        if recipes is None:
+            return None
+        return [
+            {"id": rid, "name": r["name"], "kind": "builtin", "path": str(RECIPES_BUILTIN_DIR / r["file"])}
+            for rid, r in sorted(recipes.items(), key=lambda kv: kv[1]["file"])
+        ]
+
+    def text(self, recipe_id: str) -> str | None:
+        recipes = self._current()
+        r = (recipes or {}).get(recipe_id)
+        return r["text"] if r else None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._loaded = False
+            self._recipes = None
+            self.error = None
+
+    def stats(self) -> dict:
+        return {"loaded": self._recipes is not None, "recipes": len(self._recipes or {}), "error": self.error}
+
+
+_BUILTIN_BUNDLE = _BuiltinRecipeBundle()
+
+
 # --- Custom cards (v1: card = snapshot of current page, stored under config) ---
 
 def _cards_root(hass: HomeAssistant) -> Path:
@@ -4553,7 +5840,8 @@ class CardsListView(HomeAssistantView):
 
     async def get(self, request):
         hass = request.app["hass"]
-        return self.json({"ok": True, "cards": list_custom_cards(hass)})
+        cards = await hass.async_add_executor_job(list_custom_cards, hass)
+        return self.json({"ok": True, "cards": cards})
 
 
 class CardDetailView(HomeAssistantView):
@@ -4563,15 +5851,19 @@ class CardDetailView(HomeAssistantView):
 
     async def get(self, request, card_id: str):
         hass = request.app["hass"]
-        safe_id = _safe_card_id(card_id)
+        payload, status = await hass.async_add_executor_job(self._read_card, hass, _safe_card_id(card_id))
+        return self.json(payload, status_code=status)
+
+    @staticmethod
+    def _read_card(hass: HomeAssistant, safe_id: str) -> tuple[dict, int]:
         path = _cards_root(hass) / f"{safe_id}.json"
         if not path.exists() or not path.is_file():
-            return self.json({"ok": False, "error": "not_found"}, status_code=404)
+            return {"ok": False, "error": "not_found"}, 404
         try:
             data = json.loads(path.read_text("utf-8"))
-            return self.json({"ok": True, "card": data})
+            return {"ok": True, "card": data}, 200
         except Exception as e:
-            return self.json({"ok": False, "error": str(e)}, status_code=500)
+            return {"ok": False, "error": str(e)}, 500
 
 
 class CardSaveView(HomeAssistantView):
@@ -4607,13 +5899,16 @@ class CardSaveView(HomeAssistantView):
             "action_bindings": body.get("action_bindings") or [],
             "scripts": body.get("scripts") or [],
         }
-        path = _cards_root(hass) / f"{safe_id}.json"
         try:
-            path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            await hass.async_add_executor_job(self._write_card, hass, safe_id, json.dumps(payload, indent=2))
         except Exception as e:
             return self.json({"ok": False, "error": str(e)}, status_code=500)
         return self.json({"ok": True, "id": safe_id})
 
+    @staticmethod
+    def _write_card(hass: HomeAssistant, safe_id: str, text: str) -> None:
+        (_cards_root(hass) / f"{safe_id}.json").write_text(text, encoding="utf-8")
+
 
 class CardDeleteView(HomeAssistantView):
     url = f"/api/{DOMAIN}/cards/{{card_id}}"
@@ -4622,15 +5917,19 @@ class CardDeleteView(HomeAssistantView):
 
     async def delete(self, request, card_id: str):
         hass = request.app["hass"]
-        safe_id = _safe_card_id(card_id)
+        payload, status = await hass.async_add_executor_job(self._delete_card, hass, _safe_card_id(card_id))
+        return self.json(payload, status_code=status)
+
+    @staticmethod
+    def _delete_card(hass: HomeAssistant, safe_id: str) -> tuple[dict, int]:
         path = _cards_root(hass) / f"{safe_id}.json"
         if not path.exists():
-            return self.json({"ok": False, "error": "not_found"}, status_code=404)
+            return {"ok": False, "error": "not_found"}, 404
         try:
             path.unlink(missing_ok=True)
-            return self.json({"ok": True})
+            return {"ok": True}, 200
         except Exception as e:
-            return self.json({"ok": False, "error": str(e)}, status_code=500)
+            return {"ok": False, "error": str(e)}, 500
 
 
 class RecipesView(HomeAssistantView):
@@ -4640,7 +5939,7 @@ class RecipesView(HomeAssistantView):
 
     async def get(self, request):
         hass = request.app["hass"]
-        return self.json({"ok": True, "recipes": list_all_recipes(hass)})
+        return self.json({"ok": True, "recipes": await _async_list_all_recipes(hass)})
 
 
 class RecipeUserUpdateView(HomeAssistantView):
@@ -4656,7 +5955,12 @@ class RecipeUserUpdateView(HomeAssistantView):
         label = body.get("label")
         if not isinstance(label, str) or not label.strip():
             return self.json({"ok": False, "error": "invalid_label"}, status_code=400)
+        payload, status = await hass.async_add_executor_job(self._set_label, hass, recipe_id, label.strip())
+        _RECIPES.invalidate()
+        return self.json(payload, status_code=status)
 
+    @staticmethod
+    def _set_label(hass: HomeAssistant, recipe_id: str, label: str) -> tuple[dict, int]:
         root = _user_recipes_root(hass)
 
         # v2 recipe
@@ -4669,9 +5973,9 @@ class RecipeUserUpdateView(HomeAssistantView):
                     meta = json.loads(meta_path.read_text("utf-8"))
                 except Exception:
                     meta = {}
-            meta["label"] = label.strip()
+            meta["label"] = label
             meta_path.write_text(json.dumps(meta, indent=2, sort_keys=True), encoding="utf-8")
-            return self.json({"ok": True})
+            return {"ok": True}, 200
 
         # v1 legacy recipe
         legacy = root / f"{recipe_id}.yaml"
@@ -4683,11 +5987,11 @@ class RecipeUserUpdateView(HomeAssistantView):
                     meta = json.loads(meta_path.read_text("utf-8"))
                 except Exception:
                     meta = {}
-            meta["label"] = label.strip()
+            meta["label"] = label
             meta_path.write_text(json.dumps(meta, indent=2, sort_keys=True), encoding="utf-8")
-            return self.json({"ok": True})
+            return {"ok": True}, 200
 
-        return self.json({"ok": False, "error": "recipe_not_found"}, status_code=404)
+        return {"ok": False, "error": "recipe_not_found"}, 404
 
 
 class RecipeUserDeleteView(HomeAssistantView):
@@ -4699,6 +6003,12 @@ class RecipeUserDeleteView(HomeAssistantView):
 
     async def delete(self, request, recipe_id: str):
         hass = request.app["hass"]
+        payload, status = await hass.async_add_executor_job(self._delete_recipe, hass, recipe_id)
+        _RECIPES.invalidate()
+        return self.json(payload, status_code=status)
+
+    @staticmethod
+    def _delete_recipe(hass: HomeAssistant, recipe_id: str) -> tuple[dict, int]:
         root = _user_recipes_root(hass)
 
         # v2 recipe folder
@@ -4716,7 +6026,7 @@ class RecipeUserDeleteView(HomeAssistantView):
                 v2_dir.rmdir()
             except Exception:
                 pass
-            return self.json({"ok": True})
+            return {"ok": True}, 200
 
         # v1 legacy recipe file
         legacy = root / f"{recipe_id}.yaml"
@@ -4724,17 +6034,97 @@ class RecipeUserDeleteView(HomeAssistantView):
             try:
                 legacy.unlink(missing_ok=True)
             except Exception:
-                return self.json({"ok": False, "error": "delete_failed"}, status_code=500)
+                return {"ok": False, "error": "delete_failed"}, 500
             meta_path = root / f"{recipe_id}.metadata.json"
             try:
                 meta_path.unlink(missing_ok=True)
             except Exception:
                 pass
-            return self.json({"ok": True})
+            return {"ok": True}, 200
+
+        return {"ok": False, "error": "recipe_not_found"}, 404
+
+
+
+
+# --- Entity queries: EntitiesView with ?domain=&q=&fields=&limit=&cursor= ---
+# Without any of these parameters the view returns the legacy full list (every entity with its
+# attributes). With them it filters, projects and pages server-side: items are sorted by
+# entity_id, the cursor is the last entity_id of the previous page, and attributes are only
+# included when asked for in fields. The ETag covers the query and each listed entity's
+# last_updated, so an unchanged page is answered with 304 before anything is serialized.
+ENTITY_FIELDS = ("entity_id", "state", "attributes", "friendly_name", "icon", "device_class", "unit_of_measurement")
+ENTITY_DEFAULT_FIELDS = tuple(f for f in ENTITY_FIELDS if f != "attributes")
+ENTITY_QUERY_PARAMS = ("domain", "q", "fields", "limit", "cursor")
+ENTITY_PAGE_DEFAULT = 100
+ENTITY_PAGE_MAX = 1000
+
+
+def _entity_item(st, fields=ENTITY_FIELDS) -> dict:
+    attrs = st.attributes or {}
+    item = {}
+    for f in fields:
+        if f == "entity_id":
+            item[f] = st.entity_id
+        elif f == "state":
+            item[f] = st.state
+        elif f == "attributes":
+            item[f] = dict(attrs)
+        else:
+            item[f] = attrs.get(f)
+    return item
+
 
-        return self.json({"ok": False, "error": "recipe_not_found"}, status_code=404)
+def _entity_query_domains(query) -> set[str]:
+    return {d.strip().lower() for d in (query.get("domain") or "").split(",") if d.strip()}
 
 
+def _query_entities(states, query, if_none_match: str | None = None) -> tuple[dict | None, str]:
+    """One page of matching entities ({"items", "total", "next_cursor"}) and its ETag.
+
+    The ETag is computed from the page's entity ids and last_updated first; when it matches
+    if_none_match the page is not serialized and the result is None. Raises ValueError for a
+    non-integer limit.
+    """
+    domains = _entity_query_domains(query)
+    text = (query.get("q") or "").strip().lower()
+    wanted = {f.strip() for f in (query.get("fields") or "").split(",") if f.strip()}
+    fields = ("entity_id",) + tuple(f for f in ENTITY_FIELDS[1:] if f in wanted) if wanted else ENTITY_DEFAULT_FIELDS
+    raw_limit = (query.get("limit") or "").strip()
+    try:
+        limit = int(raw_limit) if raw_limit else ENTITY_PAGE_DEFAULT
+    except ValueError:
+        raise ValueError("limit must be an integer") from None
+    limit = max(1, min(limit, ENTITY_PAGE_MAX))
+    cursor = query.get("cursor") or ""
+
+    matches = []
+    for st in states:
+        eid = st.entity_id
+        if domains and eid.partition(".")[0] not in domains:
+            continue
+        if text and text not in eid.lower() and text not in str((st.attributes or {}).get("friendly_name") or "").lower():
+            continue
+        matches.append(st)
+    matches.sort(key=lambda st: st.entity_id)
+    start = bisect.bisect_right(matches, cursor, key=lambda st: st.entity_id) if cursor else 0
+    page = matches[start:start + limit]
+    next_cursor = page[-1].entity_id if start + limit < len(matches) else None
+
+    tag = [",".join(sorted(domains)), text, ",".join(fields), str(limit), cursor, str(len(matches))]
+    tag.extend(f"{st.entity_id}@{getattr(st, 'last_updated', '')}" for st in page)
+    etag = f'"{sha256(chr(10).join(tag))[:32]}"'
+    if _etag_matches(if_none_match, etag):
+        return None, etag
+    result = {"items": [_entity_item(st, fields) for st in page], "total": len(matches), "next_cursor": next_cursor}
+    return result, etag
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag in tags
 
 
 class EntitiesView(HomeAssistantView):
@@ -4746,20 +6136,260 @@ class EntitiesView(HomeAssistantView):
 
     async def get(self, request):
         hass = request.app["hass"]
-        # Return a compact list for pickers/search
-        items = []
+        if not any(p in request.query for p in ENTITY_QUERY_PARAMS):
+            # Legacy: the whole list with attributes (the canvas picker snapshot)
+            return self.json([_entity_item(st) for st in hass.states.async_all()])
+        domains = _entity_query_domains(request.query)
+        states = hass.states.async_all(sorted(domains)) if domains else hass.states.async_all()
+        try:
+            result, etag = _query_entities(states, request.query, request.headers.get("If-None-Match"))
+        except ValueError as e:
+            return self.json({"ok": False, "error": str(e)}, status_code=400)
+        if result is None:
+            return web.Response(status=304, headers={"ETag": etag})
+        return self.json(result, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+# --- Entity search index: ranked picker search without shipping the entity list ---
+# Entities are indexed by the words of entity_id, friendly_name, area and device_class. A query
+# word matches a token exactly (3), as a prefix (2), inside a token (1) or within one edit (0.5,
+# words of 4+ letters, via a delete-one-letter table); every query word must match. The index is
+# built on first search and then kept current from state_changed and registry update events.
+ENTITY_SEARCH_LIMIT = 20
+ENTITY_SEARCH_MAX_LIMIT = 100
+_SEARCH_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def _search_tokens(text: str | None) -> list[str]:
+    return _SEARCH_TOKEN_RE.findall(str(text or "").lower())
+
+
+def _deletes(token: str) -> set[str]:
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+class _EntitySearchIndex:
+    """Token index over entity_id, name, area and device_class with prefix/infix/fuzzy lookup."""
+
+    def __init__(self) -> None:
+        self._docs: dict[str, tuple] = {}  # entity_id -> (name, area, device_class)
+        self._doc_tokens: dict[str, frozenset[str]] = {}
+        self._phrases: dict[str, tuple[str, str]] = {}  # entity_id -> (object id words, name words)
+        self._postings: dict[str, set[str]] = {}  # token -> entity ids
+        self._fuzzy: dict[str, set[str]] = {}  # token and its delete-one variants -> tokens
+        self._vocab: list[str] | None = []
+        self._unsubs: list = []
+        self._areas: dict[str, str] = {}  # entity_id -> area name (from the registries)
+        self.updates = 0
+        self.searches = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def upsert(self, entity_id: str, name=None, area=None, device_class=None) -> None:
+        doc = (name, area, device_class)
+        if self._docs.get(entity_id) == doc:
+            return
+        self._docs[entity_id] = doc
+        object_words = _search_tokens(entity_id.partition(".")[2])
+        name_words = _search_tokens(name)
+        self._phrases[entity_id] = (" ".join(object_words), " ".join(name_words))
+        tokens = frozenset(
+            _search_tokens(entity_id.partition(".")[0]) + object_words + name_words
+            + _search_tokens(area) + _search_tokens(device_class)
+        )
+        old = self._doc_tokens.get(entity_id, frozenset())
+        self._doc_tokens[entity_id] = tokens
+        self._unlink(entity_id, old - tokens)
+        for t in tokens - old:
+            postings = self._postings.get(t)
+            if postings is None:
+                postings = self._postings[t] = set()
+                for key in _deletes(t) | {t}:
+                    self._fuzzy.setdefault(key, set()).add(t)
+                self._vocab = None
+            postings.add(entity_id)
+        self.updates += 1
+
+    def remove(self, entity_id: str) -> None:
+        if self._docs.pop(entity_id, None) is None:
+            return
+        del self._phrases[entity_id]
+        self._unlink(entity_id, self._doc_tokens.pop(entity_id))
+        self.updates += 1
+
+    def _unlink(self, entity_id: str, tokens) -> None:
+        for t in tokens:
+            postings = self._postings[t]
+            postings.discard(entity_id)
+            if not postings:
+                del self._postings[t]
+                for key in _deletes(t) | {t}:
+                    variants = self._fuzzy[key]
+                    variants.discard(t)
+                    if not variants:
+                        del self._fuzzy[key]
+                self._vocab = None
+
+    def _sorted_vocab(self) -> list[str]:
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        return self._vocab
+
+    def _word_scores(self, word: str, vocab: list[str]) -> dict[str, float]:
+        """Best match score per entity for one query word."""
+        matched: dict[str, float] = {}
+        i = bisect.bisect_left(vocab, word)
+        while i < len(vocab) and vocab[i].startswith(word):
+            matched[vocab[i]] = 3.0 if vocab[i] == word else 2.0
+            i += 1
+        if len(word) >= 2:
+            for t in vocab:
+                if word in t and t not in matched:
+                    matched[t] = 1.0
+        if len(word) >= 4:
+            for key in _deletes(word) | {word}:
+                for t in self._fuzzy.get(key, ()):
+                    matched.setdefault(t, 0.5)
+        best: dict[str, float] = {}
+        for t, score in matched.items():
+            for eid in self._postings[t]:
+                if best.get(eid, 0.0) < score:
+                    best[eid] = score
+        return best
+
+    def search(self, query: str, limit: int = ENTITY_SEARCH_LIMIT, domain: str | None = None) -> list[dict]:
+        """Top `limit` entities matching every word of query, best first."""
+        self.searches += 1
+        words = list(dict.fromkeys(_search_tokens(query)))
+        if not words:
+            return []
+        vocab = self._sorted_vocab()
+        scores: dict[str, float] | None = None
+        for word in words:
+            best = self._word_scores(word, vocab)
+            scores = best if scores is None else {eid: sc + best[eid] for eid, sc in scores.items() if eid in best}
+            if not scores:
+                return []
+        if domain:
+            prefix = domain.strip().lower() + "."
+            scores = {eid: sc for eid, sc in scores.items() if eid.startswith(prefix)}
+        phrase = " ".join(words)
+        for eid in scores:
+            object_words, name_words = self._phrases[eid]
+            if object_words.startswith(phrase) or name_words.startswith(phrase):
+                scores[eid] += 1.0
+        top = heapq.nsmallest(limit, scores.items(), key=lambda kv: (-kv[1], len(kv[0]), kv[0]))
+        return [
+            {"entity_id": eid, "name": self._docs[eid][0], "area": self._docs[eid][1],
+             "device_class": self._docs[eid][2], "score": score}
+            for eid, score in top
+        ]
+
+    # Home Assistant feed
+
+    def _index_state(self, st) -> None:
+        attrs = st.attributes or {}
+        self.upsert(st.entity_id, attrs.get("friendly_name"), self._areas.get(st.entity_id), attrs.get("device_class"))
+
+    def _refresh_area(self, hass: HomeAssistant, entity_id: str) -> None:
+        entry = er.async_get(hass).async_get(entity_id)
+        area_id = entry.area_id if entry else None
+        if entry and not area_id and entry.device_id:
+            device = dr.async_get(hass).async_get(entry.device_id)
+            area_id = device.area_id if device else None
+        area = ar.async_get(hass).async_get_area(area_id) if area_id else None
+        if area is not None:
+            self._areas[entity_id] = area.name
+        else:
+            self._areas.pop(entity_id, None)
+        st = hass.states.get(entity_id)
+        if st is not None:
+            self._index_state(st)
+
+    def attach(self, hass: HomeAssistant) -> None:
+        """Index every current state and follow state and registry changes."""
+        for entry in list(er.async_get(hass).entities.values()):
+            self._refresh_area(hass, entry.entity_id)
         for st in hass.states.async_all():
-            attrs = dict(st.attributes or {})
-            items.append({
-                "entity_id": st.entity_id,
-                "state": st.state,
-                "attributes": attrs,
-                "friendly_name": attrs.get("friendly_name"),
-                "icon": attrs.get("icon"),
-                "device_class": attrs.get("device_class"),
-                "unit_of_measurement": attrs.get("unit_of_measurement"),
-            })
-        return self.json(items)
+            self._index_state(st)
+
+        @callback
+        def on_state(event) -> None:
+            new_state = event.data.get("new_state")
+            if new_state is None:
+                self.remove(event.data.get("entity_id"))
+            else:
+                self._index_state(new_state)
+
+        @callback
+        def on_entity_registry(event) -> None:
+            if event.data.get("old_entity_id"):
+                self._areas.pop(event.data["old_entity_id"], None)
+            if event.data.get("action") == "remove":
+                self._areas.pop(event.data.get("entity_id"), None)
+            else:
+                self._refresh_area(hass, event.data.get("entity_id"))
+
+        @callback
+        def on_device_registry(event) -> None:
+            device_id = event.data.get("device_id")
+            for entry in er.async_entries_for_device(er.async_get(hass), device_id):
+                self._refresh_area(hass, entry.entity_id)
+
+        @callback
+        def on_area_registry(event) -> None:
+            for entity_id in list(self._areas):
+                self._refresh_area(hass, entity_id)
+
+        self._unsubs = [
+            hass.bus.async_listen("state_changed", on_state),
+            hass.bus.async_listen("entity_registry_updated", on_entity_registry),
+            hass.bus.async_listen("device_registry_updated", on_device_registry),
+            hass.bus.async_listen("area_registry_updated", on_area_registry),
+        ]
+
+    def detach(self) -> None:
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+
+    def stats(self) -> dict:
+        return {
+            "entities": len(self._docs),
+            "tokens": len(self._postings),
+            "updates": self.updates,
+            "searches": self.searches,
+        }
+
+
+def _entity_index(hass: HomeAssistant) -> _EntitySearchIndex:
+    """The hass-wide search index (built and attached on first use)."""
+    data = hass.data.setdefault(DOMAIN, {})
+    index = data.get("entity_index")
+    if index is None:
+        index = data["entity_index"] = _EntitySearchIndex()
+        index.attach(hass)
+    return index
+
+
+class EntitySearchView(HomeAssistantView):
+    """Ranked entity search for binding pickers: ?q=&limit=&domain=."""
+
+    url = "/api/esphome_touch_designer/entities/search"
+    name = "api:esphome_touch_designer:entities_search"
+    requires_auth = False
+
+    async def get(self, request):
+        hass = request.app["hass"]
+        try:
+            limit = int(request.query.get("limit") or ENTITY_SEARCH_LIMIT)
+        except ValueError:
+            return self.json({"ok": False, "error": "limit must be an integer"}, status_code=400)
+        limit = max(1, min(limit, ENTITY_SEARCH_MAX_LIMIT))
+        q = request.query.get("q") or ""
+        items = _entity_index(hass).search(q, limit=limit, domain=request.query.get("domain") or None)
+        return self.json({"query": q, "items": items})
 
 
 class EntityView(HomeAssistantView):
@@ -4835,6 +6465,272 @@ class CallServiceView(HomeAssistantView):
             return self.json({"ok": False, "error": str(e)}, status=500)
 
 
+# --- Live state fan-out: one HA state tracker shared by every StateWebSocketView connection ---
+# Each connection used to add its own bus listener for every state_changed event in HA and filter
+# it in Python. The hub keeps one async_track_state_change_event subscription for the union of
+# entity ids any connection watches, plus an entity -> connections index for the fan-out.
+
+
+class _StateHub:
+    """Entity -> subscriber index behind one shared state-change tracker."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._subscribers: dict[str, set] = {}
+        self._entities: dict = {}  # notify -> frozenset of entity ids
+        self._tracked: frozenset[str] = frozenset()
+        self._unsub = None
+        self.events = 0
+        self.deliveries = 0
+        self.retracks = 0
+
+    def subscribe(self, notify, entity_ids) -> None:
+        """Replace the entity set watched by notify (a sync callable taking an entity id)."""
+        new = frozenset(entity_ids)
+        old = self._entities.pop(notify, frozenset())
+        for eid in old - new:
+            subs = self._subscribers.get(eid)
+            if subs is not None:
+                subs.discard(notify)
+                if not subs:
+                    del self._subscribers[eid]
+        for eid in new - old:
+            self._subscribers.setdefault(eid, set()).add(notify)
+        if new:
+            self._entities[notify] = new
+        self._retrack()
+
+    def unsubscribe(self, notify) -> None:
+        self.subscribe(notify, ())
+
+    def watched(self, notify) -> frozenset[str]:
+        return self._entities.get(notify, frozenset())
+
+    def _retrack(self) -> None:
+        """Re-subscribe only when the union of watched entities changed; release it when empty."""
+        wanted = frozenset(self._subscribers)
+        if wanted == self._tracked:
+            return
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._tracked = wanted
+        if wanted:
+            self._unsub = async_track_state_change_event(self.hass, sorted(wanted), self._on_event)
+            self.retracks += 1
+
+    @callback
+    def _on_event(self, event) -> None:
+        self.events += 1
+        eid = event.data.get("entity_id")
+        for notify in tuple(self._subscribers.get(eid, ())):
+            self.deliveries += 1
+            notify(eid)
+
+    def stats(self) -> dict:
+        return {
+            "connections": len(self._entities),
+            "entities": len(self._tracked),
+            "events": self.events,
+            "deliveries": self.deliveries,
+            "retracks": self.retracks,
+        }
+
+
+def _state_hub(hass: HomeAssistant) -> _StateHub:
+    """The hass-wide hub (created on first use, kept in hass.data[DOMAIN])."""
+    data = hass.data.setdefault(DOMAIN, {})
+    hub = data.get("state_hub")
+    if hub is None:
+        hub = data["state_hub"] = _StateHub(hass)
+    return hub
+
+
+# Per-connection pushes: one flush per 1/max_rate seconds carries the latest state of every entity
+# that changed since the last flush. A client whose backlog stays at the high-water mark (or whose
+# socket stalls a send) for STATE_WS_BEHIND_S is disconnected instead of buffering in HA. The rate
+# comes from the integration options (DEFAULT_STATE_WS_MAX_RATE when unset).
+STATE_WS_MAX_BATCH = 200
+STATE_WS_HIGH_WATER = 500
+STATE_WS_BEHIND_S = 10.0
+
+
+def _state_ws_max_rate(hass: HomeAssistant) -> float:
+    """Flushes per second per connection from the integration options."""
+    entry_id = _active_entry_id(hass)
+    entry = hass.config_entries.async_get_entry(entry_id) if entry_id else None
+    try:
+        rate = float(((entry.options or {}) if entry else {}).get(CONF_STATE_WS_MAX_RATE) or DEFAULT_STATE_WS_MAX_RATE)
+    except (TypeError, ValueError):
+        rate = DEFAULT_STATE_WS_MAX_RATE
+    return rate if rate > 0 else DEFAULT_STATE_WS_MAX_RATE
+
+
+def _json_default(obj):
+    """Encode what HA's JSON encoder does for state attributes (datetimes, sets, ...); str() otherwise."""
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    return str(obj)
+
+
+def _state_payload(eid: str, st) -> dict:
+    return {
+        "type": "state",
+        "entity_id": eid,
+        "state": st.state,
+        "attributes": dict(st.attributes or {}),
+    }
+
+
+class _StateSender:
+    """Coalescing, rate-limited send queue for one StateWebSocketView connection.
+
+    notify() only records the entity id (a newer change replaces the unsent one); run() reads the
+    current state at flush time. With batch=True a flush is one {"type": "states"} frame, otherwise
+    one {"type": "state"} message per entity.
+
+    With delta=True the first message for an entity is the full state with "seq": 1; later ones
+    are {"type": "delta", "seq": n+1, "state", "attributes": changed, "removed": [...]}. A client
+    that sees a seq gap sends resync and gets the full state again.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        ws,
+        *,
+        batch: bool = False,
+        delta: bool = False,
+        max_rate: float = DEFAULT_STATE_WS_MAX_RATE,
+        max_batch: int = STATE_WS_MAX_BATCH,
+        high_water: int = STATE_WS_HIGH_WATER,
+        behind_s: float = STATE_WS_BEHIND_S,
+    ) -> None:
+        self.hass = hass
+        self.ws = ws
+        self.batch = batch
+        self.delta = delta
+        self.interval = 1.0 / max_rate
+        self.max_batch = max_batch
+        self.high_water = high_water
+        self.behind_s = behind_s
+        self._pending: dict[str, None] = {}
+        self._sent: dict[str, tuple] = {}  # delta mode: entity -> (seq, attributes sent)
+        self._wake = asyncio.Event()
+        self._behind_since: float | None = None
+        self.frames = 0
+        self.states = 0
+        self.coalesced = 0
+        self.encode_errors = 0
+        self.dropped_slow = False
+
+    def notify(self, eid: str) -> None:
+        if eid in self._pending:
+            self.coalesced += 1
+        else:
+            self._pending[eid] = None
+        self._wake.set()
+
+    def clear(self) -> None:
+        self._pending.clear()
+
+    def resync(self, entity_ids) -> None:
+        """Send the full state of these entities next (new subscription or client-detected gap)."""
+        for eid in entity_ids:
+            self._sent.pop(eid, None)
+
+    def _payload(self, eid: str, st) -> dict:
+        if not self.delta:
+            return _state_payload(eid, st)
+        attrs = st.attributes or {}
+        prev = self._sent.get(eid)
+        seq = prev[0] + 1 if prev else 1
+        # HA state attributes are read-only mappings, so keeping a reference is safe
+        self._sent[eid] = (seq, attrs)
+        if prev is None:
+            payload = _state_payload(eid, st)
+            payload["seq"] = seq
+            return payload
+        payload = {"type": "delta", "entity_id": eid, "seq": seq, "state": st.state}
+        old = prev[1]
+        if attrs is not old:
+            changed = {k: v for k, v in attrs.items() if k not in old or old[k] != v}
+            removed = [k for k in old if k not in attrs]
+            if changed:
+                payload["attributes"] = changed
+            if removed:
+                payload["removed"] = removed
+        return payload
+
+    def _take(self) -> list[str]:
+        if len(self._pending) <= self.max_batch:
+            eids, self._pending = list(self._pending), {}
+        else:
+            eids = list(itertools.islice(self._pending, self.max_batch))
+            for eid in eids:
+                del self._pending[eid]
+        return eids
+
+    async def _flush(self, eids: list[str]) -> None:
+        encoded = []
+        for eid in eids:
+            st = self.hass.states.get(eid)
+            if not st:
+                self._sent.pop(eid, None)
+                continue
+            # One entity that cannot be encoded is skipped; it must not stop updates for the others
+            try:
+                encoded.append(json.dumps(self._payload(eid, st), default=_json_default))
+            except (TypeError, ValueError):
+                self._sent.pop(eid, None)
+                self.encode_errors += 1
+        if not encoded:
+            return
+        if self.batch:
+            await self.ws.send_str('{"type": "states", "states": [' + ", ".join(encoded) + "]}")
+        else:
+            for text in encoded:
+                await self.ws.send_str(text)
+        self.frames += 1
+        self.states += len(encoded)
+
+    def _behind(self, now: float) -> bool:
+        """True once the backlog has stayed at the high-water mark for behind_s."""
+        if len(self._pending) < self.high_water:
+            self._behind_since = None
+            return False
+        if self._behind_since is None:
+            self._behind_since = now
+        return now - self._behind_since >= self.behind_s
+
+    async def run(self) -> None:
+        """Flush until the socket fails or the client falls too far behind (then close it)."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            if not self._pending:
+                continue
+            started = loop.time()
+            try:
+                await asyncio.wait_for(self._flush(self._take()), self.behind_s)
+            except asyncio.TimeoutError:
+                break
+            except (ConnectionError, RuntimeError):
+                return
+            if self._behind(loop.time()):
+                break
+            if self._pending:
+                self._wake.set()
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - started)))
+        self.dropped_slow = True
+        await self.ws.close(code=WSCloseCode.TRY_AGAIN_LATER, message=b"client too slow")
+
+
 class StateWebSocketView(HomeAssistantView):
     """WebSocket endpoint for live state updates (design-time preview)."""
 
@@ -4846,55 +6742,49 @@ class StateWebSocketView(HomeAssistantView):
         ws = web.WebSocketResponse()
         await ws.prepare(request)
         hass: HomeAssistant = request.app["hass"]
-        entity_ids: set = set()
-        unsub = None
-
-        async def send_state(eid: str) -> None:
-            st = hass.states.get(eid)
-            if st:
-                payload = json.dumps({
-                    "type": "state",
-                    "entity_id": eid,
-                    "state": st.state,
-                    "attributes": dict(st.attributes or {}),
-                })
-                try:
-                    await ws.send_str(payload)
-                except Exception:
-                    pass
-
-        async def state_changed_listener(event):
-            eid = event.data.get("entity_id") if isinstance(event.data, dict) else None
-            if eid and eid in entity_ids:
-                await send_state(eid)
-
+        hub = _state_hub(hass)
+        max_rate = _state_ws_max_rate(hass)
+        sender: _StateSender | None = None
+        sender_task = None
         try:
             async for msg in ws:
                 if msg.type == web.WSMsgType.TEXT:
                     try:
                         data = json.loads(msg.data)
                         if data.get("type") == "subscribe":
+                            if sender is None:
+                                # The first subscribe fixes the frame format for the connection
+                                sender = _StateSender(
+                                    hass, ws, batch=data.get("batch") is True, delta=data.get("delta") is True,
+                                    max_rate=max_rate,
+                                )
+                                sender_task = asyncio.ensure_future(sender.run())
                             ids = data.get("entity_ids")
+                            entity_ids = hub.watched(sender.notify)
                             if isinstance(ids, list):
-                                entity_ids.clear()
-                                entity_ids.update(str(e).strip() for e in ids if str(e).strip() and "." in str(e))
-                            if unsub is not None:
-                                unsub()
-                            unsub = hass.bus.async_listen("state_changed", state_changed_listener)
+                                entity_ids = {str(e).strip() for e in ids if str(e).strip() and "." in str(e)}
+                            hub.subscribe(sender.notify, entity_ids)
+                            sender.resync(entity_ids)
                             for eid in list(entity_ids)[:100]:
-                                await send_state(eid)
-                        elif data.get("type") == "unsubscribe":
-                            if unsub is not None:
-                                unsub()
-                                unsub = None
-                            entity_ids.clear()
-                    except (json.JSONDecodeError, TypeError):
+                                sender.notify(eid)
+                        elif data.get("type") == "resync" and sender is not None:
+                            ids = data.get("entity_ids")
+                            watched = hub.watched(sender.notify)
+                            stale = [e for e in ids if e in watched] if isinstance(ids, list) else list(watched)
+                            sender.resync(stale)
+                            for eid in stale:
+                                sender.notify(eid)
+                        elif data.get("type") == "unsubscribe" and sender is not None:
+                            hub.unsubscribe(sender.notify)
+                            sender.clear()
+                    except (json.JSONDecodeError, TypeError, AttributeError):
                         pass
                 elif msg.type in (web.WSMsgType.CLOSE, web.WSMsgType.ERROR):
                     break
         finally:
-            if unsub is not None:
-                unsub()
+            if sender is not None:
+                hub.unsubscribe(sender.notify)
+                sender_task.cancel()
         return ws
 
 
@@ -4917,7 +6807,17 @@ class PreviewWidgetYamlView(HomeAssistantView):
             return self.json({"ok": False, "error": "project required"}, status_code=400)
         if not widget_id or not str(widget_id).strip():
             return self.json({"ok": False, "error": "widget_id required"}, status_code=400)
-        result = _preview_widget_yaml(project, str(widget_id).strip(), page_index)
+        # Compiles the widget's page on the compile pool, one preview per device: a newer request
+        # cancels an older one (409 superseded; the newer one may be for another widget).
+        device_id = body.get("device_id") if isinstance(body.get("device_id"), str) else ""
+        try:
+            result, superseded = await _COMPILE_POOL.run_preview(
+                f"widget_preview:{device_id.strip()}", _preview_widget_yaml, project, str(widget_id).strip(), page_index
+            )
+        except CompileSuperseded:
+            superseded = True
+        if superseded:
+            return self.json({"ok": False, "error": "superseded"}, status_code=409)
         if result is None:
             return self.json({"ok": False, "error": "widget not found or unsupported type"}, status_code=404)
         yaml_str, event_snippets = result
@@ -5036,14 +6936,14 @@ class SectionsDefaultsView(HomeAssistantView):
             entry_id = request.query.get("entry_id") or body.get("entry_id") or _active_entry_id(hass)
             if entry_id:
                 storage = _get_storage(hass, entry_id)
-                device = storage.get_device(device_id)
+                device = await storage.async_get_device(device_id)
         recipe_id = (body.get("recipe_id") or "").strip() or (project.get("device") or {}).get("hardware_recipe_id") or (project.get("hardware") or {}).get("recipe_id") or ""
         if not recipe_id:
             recipe_id = "sunton_2432s028r_320x240"
-        recipe_path = _find_recipe_path_by_id(hass, recipe_id) if hass else None
-        recipe_text = recipe_path.read_text("utf-8") if recipe_path and recipe_path.exists() else ""
+        recipe_text = await _async_recipe_text(hass, recipe_id, fallback_builtin=False) if hass else ""
+        pool_key = device_id or "sections_defaults"
         if recipe_text:
-            data = _build_sections_panel_data_v2(project, device, recipe_text)
+            data = await _COMPILE_POOL.run(pool_key, _build_sections_panel_data_v2, project, device, recipe_text)
             return self.json({
                 "ok": True,
                 "sections": data["sections"],
@@ -5053,7 +6953,7 @@ class SectionsDefaultsView(HomeAssistantView):
                 "categories": dict(SECTION_CATEGORIES),
                 "keys_with_additions": data["keys_with_additions"],
             })
-        data = _build_sections_panel_data(project, device)
+        data = await _COMPILE_POOL.run(pool_key, _build_sections_panel_data, project, device)
         return self.json({
             "ok": True,
             "sections": data["sections"],
@@ -5124,7 +7024,7 @@ class CompileView(HomeAssistantView):
             return self.json({"ok": False, "error": "no_active_entry"}, status_code=500)
 
         storage = _get_storage(hass, entry_id)
-        device = storage.get_device(device_id)
+        device = await storage.async_get_device(device_id)
         if not device:
             return self.json({"ok": False, "error": "device_not_found"}, status_code=404)
 
@@ -5143,6 +7043,9 @@ class CompileView(HomeAssistantView):
             if isinstance(body.get("hardware_recipe_id"), str) and body.get("hardware_recipe_id").strip():
                 recipe_override = body.get("hardware_recipe_id").strip()
 
+        profiling = _compile_profiling_requested(request, hass, entry_id)
+        profile = None
+
         # Load recipe from same source as UI (builtin or user via _find_recipe_path_by_id)
         project = device.project or {}
         recipe_id = (
@@ -5150,34 +7053,41 @@ class CompileView(HomeAssistantView):
             or device.hardware_recipe_id
             or "sunton_2432s028r_320x240"
         )
-        recipe_path = _find_recipe_path_by_id(hass, recipe_id) or (RECIPES_BUILTIN_DIR / f"{recipe_id}.yaml")
-        recipe_text = recipe_path.read_text("utf-8") if recipe_path.exists() else ""
+
+        compile_fn = {
+            "request": _compile_for_view_memory_profiled,
+            "option": _compile_for_view_profiled,
+        }.get(profiling, _compile_for_view)
 
         if project_override is not None or recipe_override is not None:
-            original_project = device.project
-            original_recipe = device.hardware_recipe_id
+            # Compile a copy with the overrides applied; the stored device is never touched.
+            preview = dataclasses.replace(
+                device,
+                project=project_override if project_override is not None else device.project,
+                hardware_recipe_id=recipe_override if recipe_override is not None else device.hardware_recipe_id,
+            )
+            proj = preview.project or {}
+            rid = (proj.get("hardware") or {}).get("recipe_id") or preview.hardware_recipe_id or recipe_id
+            rtext = await _async_recipe_text(hass, rid)
             try:
-                if project_override is not None:
-                    device.project = project_override
-                if recipe_override is not None:
-                    device.hardware_recipe_id = recipe_override
-                # Re-resolve recipe_id and recipe_text when override is present
-                proj = device.project or {}
-                rid = (proj.get("hardware") or {}).get("recipe_id") or device.hardware_recipe_id or recipe_id
-                rpath = _find_recipe_path_by_id(hass, rid) or (RECIPES_BUILTIN_DIR / f"{rid}.yaml")
-                rtext = rpath.read_text("utf-8") if rpath.exists() else ""
-                yaml_text = compile_to_esphome_yaml(device, recipe_text=rtext)
-            finally:
-                device.project = original_project
-                device.hardware_recipe_id = original_recipe
-            yaml_text = yaml_text.replace(ETD_DEVICE_NAME_PLACEHOLDER, json.dumps(device.slug or "device"))
-            warnings = _compile_warnings(device.project or {})
-            return self.json({"ok": True, "yaml": yaml_text, "warnings": warnings, "mode": "preview"})
-
-        yaml_text = compile_to_esphome_yaml(device, recipe_text=recipe_text)
-        yaml_text = yaml_text.replace(ETD_DEVICE_NAME_PLACEHOLDER, json.dumps(device.slug or "device"))
-        warnings = _compile_warnings(device.project or {})
-        return self.json({"ok": True, "yaml": yaml_text, "warnings": warnings, "mode": "stored"})
+                (yaml_text, warnings, profile), superseded = await _COMPILE_POOL.run_preview(
+                    device_id, compile_fn, preview, rtext
+                )
+            except CompileSuperseded:
+                return self.json({"ok": False, "error": "superseded"}, status_code=409)
+            resp = {"ok": True, "yaml": yaml_text, "warnings": warnings, "mode": "preview"}
+            if superseded:
+                resp["superseded"] = True
+            if profile is not None:
+                resp["profile"] = profile
+            return self.json(resp)
+
+        recipe_text = await _async_recipe_text(hass, recipe_id)
+        yaml_text, warnings, profile = await _COMPILE_POOL.run(device_id, compile_fn, device, recipe_text)
+        resp = {"ok": True, "yaml": yaml_text, "warnings": warnings, "mode": "stored"}
+        if profile is not None:
+            resp["profile"] = profile
+        return self.json(resp)
 
 
 class ValidateYamlView(HomeAssistantView):
@@ -5280,7 +7190,7 @@ class DeployView(HomeAssistantView):
         device_id = body["device_id"]
 
         storage = _get_storage(hass, entry_id)
-        device = storage.get_device(device_id)
+        device = await storage.async_get_device(device_id)
         if not device:
             return self.json({"ok": False, "error": "device_not_found"}, status_code=404)
 
@@ -5298,10 +7208,16 @@ class DeployView(HomeAssistantView):
         )
 
         esphome_dir = Path(hass.config.path("esphome"))
+        target = await hass.async_add_executor_job(self._write_yaml, esphome_dir, device.slug, yaml_text)
+        return self.json({"ok": True, "path": str(target)})
+
+    @staticmethod
+    def _write_yaml(esphome_dir: Path, slug: str, yaml_text: str) -> Path:
+        """Atomic write of <slug>.yaml (previous file kept as .bak)."""
         esphome_dir.mkdir(parents=True, exist_ok=True)
-        target = esphome_dir / f"{device.slug}.yaml"
-        tmp = esphome_dir / f".{device.slug}.yaml.tmp"
-        bak = esphome_dir / f"{device.slug}.yaml.bak"
+        target = esphome_dir / f"{slug}.yaml"
+        tmp = esphome_dir / f".{slug}.yaml.tmp"
+        bak = esphome_dir / f"{slug}.yaml.bak"
 
         if target.exists():
             try:
@@ -5311,8 +7227,7 @@ class DeployView(HomeAssistantView):
 
         tmp.write_text(yaml_text, encoding="utf-8")
         tmp.replace(target)
-
-        return self.json({"ok": True, "path": str(target)})
+        return target
 
 
 class DeployBuildView(HomeAssistantView):
@@ -5339,7 +7254,8 @@ class DeployBuildView(HomeAssistantView):
             return self.json({"ok": False, "error": "missing_device_id"}, status_code=400)
 
         storage = _get_storage(hass, entry_id)
-        device = storage.get_device(device_id)
+        # Only the slug is needed: read the index, not the project shard
+        device = storage.get_summary(device_id)
         if not device:
             return self.json({
                 "ok": False,
@@ -5350,18 +7266,17 @@ class DeployBuildView(HomeAssistantView):
         esphome_dir = Path(hass.config.path("esphome"))
         fname = f"{device.slug or device.device_id}.yaml"
         yaml_path = esphome_dir / fname
-        if not yaml_path.exists():
+        try:
+            yaml_content = await _async_read_text(hass, yaml_path, default=None)
+        except Exception as e:
+            return self.json({"ok": False, "error": "read_failed", "detail": str(e)}, status_code=500)
+        if yaml_content is None:
             return self.json({
                 "ok": False,
                 "error": "file_not_found",
                 "detail": f"Export the device first so {fname} exists in /config/esphome/.",
             }, status_code=404)
 
-        try:
-            yaml_content = yaml_path.read_text("utf-8")
-        except Exception as e:
-            return self.json({"ok": False, "error": "read_failed", "detail": str(e)}, status_code=500)
-
         entry = hass.config_entries.async_get_entry(entry_id) if entry_id else None
         opts = (entry.options or {}) if entry else {}
         base_url = (opts.get(CONF_ESPHOME_ADDON_URL) or "").strip() or ESPHOME_ADDON_API_URL
@@ -5383,6 +7298,12 @@ class DeployBuildView(HomeAssistantView):
         })
 
 
+async def async_preload_compiler_caches(hass: HomeAssistant) -> None:
+    """Warm process-wide compiler caches off the event loop (called from async_setup_entry)."""
+    await hass.async_add_executor_job(_WIDGET_SCHEMAS.preload)
+    await hass.async_add_executor_job(_BUILTIN_BUNDLE.load)
+
+
 def register_api_views(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Register all HTTP API views for the integration."""
     hass.http.register_view(ContextView)
@@ -5423,6 +7344,7 @@ def register_api_views(hass: HomeAssistant, entry: ConfigEntry) -> None:
     hass.http.register_view(DeployBuildView)
     hass.http.register_view(DeviceExportPreviewView)
     hass.http.register_view(DeviceExportView)
+    hass.http.register_view(FleetCompileView)
 
     # Project backup/restore
     hass.http.register_view(DeviceProjectExportView)
@@ -5434,6 +7356,7 @@ def register_api_views(hass: HomeAssistant, entry: ConfigEntry) -> None:
 
     # Home Assistant entity helpers
     hass.http.register_view(EntitiesView)
+    hass.http.register_view(EntitySearchView)
     hass.http.register_view(EntityView)
     hass.http.register_view(StateBatchView)
     hass.http.register_view(CallServiceView)
@@ -5456,6 +7379,10 @@ class AssetsListView(HomeAssistantView):
 
     async def get(self, request):
         hass: HomeAssistant = request.app["hass"]
+        return self.json(await hass.async_add_executor_job(self._list_assets, hass))
+
+    @staticmethod
+    def _list_assets(hass: HomeAssistant) -> list[dict]:
         p = _assets_dir(hass)
         items = []
         for f in sorted(p.iterdir()):
@@ -5463,7 +7390,7 @@ class AssetsListView(HomeAssistantView):
                 ext = f.suffix.lower().lstrip(".")
                 kind = "font" if ext in ("ttf", "otf") else ("image" if ext in ("png", "jpg", "jpeg", "webp", "bmp") else "file")
                 items.append({"name": f.name, "size": f.stat().st_size, "kind": kind})
-        return self.json(items)
+        return items
 
 class AssetsUploadView(HomeAssistantView):
     url = "/api/esphome_touch_designer/assets/upload"
@@ -5478,10 +7405,13 @@ class AssetsUploadView(HomeAssistantView):
         if not name or not data_b64:
             return self.json({"error":"name and data_base64 required"}, status_code=400)
         raw = base64.b64decode(data_b64)
-        outp = _assets_dir(hass) / name
-        outp.write_bytes(raw)
+        await hass.async_add_executor_job(self._write_asset, hass, name, raw)
         return self.json({"ok": True, "name": name, "size": len(raw)})
 
+    @staticmethod
+    def _write_asset(hass: HomeAssistant, name: str, raw: bytes) -> None:
+        (_assets_dir(hass) / name).write_bytes(raw)
+
 import yaml
 
 import hashlib
@@ -5637,13 +7567,8 @@ def _normalize_recipe_yaml(raw_text: str, label: str | None = None) -> tuple[str
     return dumped, meta
 
 def _find_recipe_path_by_id(hass: HomeAssistant, recipe_id: str) -> Path | None:
-    for r in list_all_recipes(hass):
-        if r.get("id") == recipe_id:
-            try:
-                return Path(str(r.get("path")))
-            except Exception:
-                return None
-    return None
+    entry = _RECIPES.get(hass, recipe_id)
+    return entry.path if entry is not None else None
 
 
 
@@ -5730,15 +7655,21 @@ class RecipeCloneView(HomeAssistantView):
         if label is not None and (not isinstance(label, str) or not label.strip()):
             return self.json({"ok": False, "error": "invalid_label"}, status_code=400)
 
+        payload, status = await hass.async_add_executor_job(self._clone, hass, source_id, dest_id, label)
+        _RECIPES.invalidate()
+        return self.json(payload, status_code=status)
+
+    @staticmethod
+    def _clone(hass: HomeAssistant, source_id: str, dest_id: str | None, label: str | None) -> tuple[dict, int]:
         all_recipes = list_all_recipes(hass)
         src = next((r for r in all_recipes if r.get("id") == source_id), None)
         if not src:
-            return self.json({"ok": False, "error": "recipe_not_found"}, status_code=404)
+            return {"ok": False, "error": "recipe_not_found"}, 404
 
         try:
             src_text = _read_recipe_file(Path(src.get("path")))
         except Exception as e:
-            return self.json({"ok": False, "error": "read_failed", "detail": str(e)}, status_code=500)
+            return {"ok": False, "error": "read_failed", "detail": str(e)}, 500
 
         base = re.sub(r"[^a-zA-Z0-9_\-]+", "_", (dest_id or source_id).strip()).strip("_") or "recipe"
         dest_id = base
@@ -5761,7 +7692,7 @@ class RecipeCloneView(HomeAssistantView):
         meta["cloned_from"] = source_id
         (v2_dir / "metadata.json").write_text(json.dumps(meta, indent=2, sort_keys=True), encoding="utf-8")
 
-        return self.json({"ok": True, "id": dest_id, "label": meta.get("label")})
+        return {"ok": True, "id": dest_id, "label": meta.get("label")}, 200
 
 
 class RecipeExportView(HomeAssistantView):
@@ -5773,15 +7704,20 @@ class RecipeExportView(HomeAssistantView):
 
     async def get(self, request, recipe_id: str):
         hass = request.app["hass"]
+        payload, status = await hass.async_add_executor_job(self._export, hass, recipe_id)
+        return self.json(payload, status_code=status)
+
+    @staticmethod
+    def _export(hass: HomeAssistant, recipe_id: str) -> tuple[dict, int]:
         all_recipes = list_all_recipes(hass)
         r = next((x for x in all_recipes if x.get("id") == recipe_id), None)
         if not r:
-            return self.json({"ok": False, "error": "recipe_not_found"}, status_code=404)
+            return {"ok": False, "error": "recipe_not_found"}, 404
 
         try:
             yaml_text = _read_recipe_file(Path(r.get("path")))
         except Exception as e:
-            return self.json({"ok": False, "error": "read_failed", "detail": str(e)}, status_code=500)
+            return {"ok": False, "error": "read_failed", "detail": str(e)}, 500
 
         meta = {}
         if r.get("builtin"):
@@ -5799,7 +7735,7 @@ class RecipeExportView(HomeAssistantView):
             if r.get("label") and "label" not in meta:
                 meta["label"] = r.get("label")
 
-        return self.json({"ok": True, "id": recipe_id, "label": r.get("label"), "yaml": yaml_text, "metadata": meta})
+        return {"ok": True, "id": recipe_id, "label": r.get("label"), "yaml": yaml_text, "metadata": meta}, 200
 
 class RecipeValidateView(HomeAssistantView):
     url = f"/api/{DOMAIN}/recipes/validate"
@@ -5813,13 +7749,12 @@ class RecipeValidateView(HomeAssistantView):
         if not recipe_id:
             return self.json({"error": "recipe_id required"}, status_code=400)
 
-        recipe_path = _find_recipe_path_by_id(hass, recipe_id)
-        if not recipe_path or not recipe_path.exists():
+        recipe_text = await _async_recipe_text(hass, recipe_id, fallback_builtin=False)
+        if not recipe_text:
             return self.json({"error": "recipe not found"}, status_code=404)
 
-        recipe_text = recipe_path.read_text("utf-8")
         issues = _validate_recipe_text(recipe_text)
-        meta = _extract_recipe_metadata_from_text(recipe_text)
+        meta = _RECIPE_ANALYSIS.metadata(recipe_text)
         return self.json({"ok": len(issues) == 0, "issues": issues, "meta": meta})
 
 
@@ -5853,6 +7788,18 @@ class RecipeImportView(HomeAssistantView):
             return self.json({"ok": False, "error": "import_failed", "detail": str(e)}, status_code=400)
 
         rid = _slugify(recipe_id or meta.get("label") or "recipe")
+        target_dir = await hass.async_add_executor_job(self._write_recipe, hass, rid, norm_yaml, meta)
+        _RECIPES.invalidate()
+        return self.json({
+            "ok": True,
+            "id": target_dir.name,
+            "label": meta.get("label"),
+            "path": str(target_dir / "recipe.yaml"),
+            "meta": meta,
+        })
+
+    @staticmethod
+    def _write_recipe(hass: HomeAssistant, rid: str, norm_yaml: str, meta: dict) -> Path:
         # Avoid collisions by suffixing hash
         root = _user_recipes_root(hass) / "user"
         root.mkdir(parents=True, exist_ok=True)
@@ -5864,14 +7811,7 @@ class RecipeImportView(HomeAssistantView):
         target_dir.mkdir(parents=True, exist_ok=True)
         (target_dir / "recipe.yaml").write_text(norm_yaml, encoding="utf-8")
         (target_dir / "metadata.json").write_text(json.dumps(meta, indent=2, sort_keys=True), encoding="utf-8")
-
-        return self.json({
-            "ok": True,
-            "id": target_dir.name,
-            "label": meta.get("label"),
-            "path": str(target_dir / "recipe.yaml"),
-            "meta": meta,
-        })
+        return target_dir
 
 
 class DeviceProjectExportView(HomeAssistantView):
@@ -5887,7 +7827,7 @@ class DeviceProjectExportView(HomeAssistantView):
         if not entry_id:
             return self.json({"ok": False, "error": "no_active_entry"}, status_code=500)
         storage = _get_storage(hass, entry_id)
-        device = storage.get_device(device_id)
+        device = await storage.async_get_device(device_id)
         if not device:
             return self.json({"ok": False, "error": "device_not_found"}, status_code=404)
 
@@ -5915,7 +7855,7 @@ class DeviceProjectImportView(HomeAssistantView):
         if not entry_id:
             return self.json({"ok": False, "error": "no_active_entry"}, status_code=500)
         storage = _get_storage(hass, entry_id)
-        device = storage.get_device(device_id)
+        device = await storage.async_get_device(device_id)
         if not device:
             return self.json({"ok": False, "error": "device_not_found"}, status_code=404)
 
@@ -5939,7 +7879,7 @@ class DeviceProjectImportView(HomeAssistantView):
             device.api_key = str(export["api_key"]).strip() or None
 
         storage.upsert_device(device)
-        await storage.async_save()
+        storage.async_schedule_save(device.device_id)
         return self.json({"ok": True})
 
 
@@ -5980,6 +7920,19 @@ def _export_merge_yaml(existing: str, generated_block: str, begin_marker: str, e
     return new_text, "new"
 
 
+EXPORT_BEGIN_MARKER = "# --- BEGIN ESPHOME_TOUCH_DESIGNER GENERATED ---"
+EXPORT_END_MARKER = "# --- END ESPHOME_TOUCH_DESIGNER GENERATED ---"
+
+
+def _read_export_target(esphome_dir: Path, fname: str) -> tuple[Path, str, bool]:
+    """(path, current text or "", existed) for /config/esphome/<fname>; creates the directory."""
+    esphome_dir.mkdir(parents=True, exist_ok=True)
+    outp = esphome_dir / fname
+    if not outp.exists():
+        return outp, "", False
+    return outp, outp.read_text("utf-8", errors="ignore"), True
+
+
 class DeviceExportPreviewView(HomeAssistantView):
     """Preview an export (safe-merge) and return a diff + expected hash."""
 
@@ -5994,22 +7947,19 @@ class DeviceExportPreviewView(HomeAssistantView):
             return self.json({"ok": False, "error": "missing_entry_id"}, status_code=400)
 
         storage = _get_storage(hass, entry_id)
-        device = storage.get_device(device_id)
+        device = await storage.async_get_device(device_id)
         if not device:
             return self.json({"ok": False, "error": "device_not_found"}, status_code=404)
 
-        yaml_text = compile_to_esphome_yaml(device)
+        yaml_text = await _COMPILE_POOL.run(device_id, compile_to_esphome_yaml, device)
 
-        BEGIN = "# --- BEGIN ESPHOME_TOUCH_DESIGNER GENERATED ---"
-        END = "# --- END ESPHOME_TOUCH_DESIGNER GENERATED ---"
+        BEGIN, END = EXPORT_BEGIN_MARKER, EXPORT_END_MARKER
 
         esphome_dir = Path(hass.config.path("esphome"))
-        esphome_dir.mkdir(parents=True, exist_ok=True)
         fname = f"{device.slug or device.device_id}.yaml"
-        outp = esphome_dir / fname
+        outp, existing, existed = await hass.async_add_executor_job(_read_export_target, esphome_dir, fname)
 
         generated_block = f"{BEGIN}\n{yaml_text.rstrip()}\n{END}\n"
-        existing = outp.read_text("utf-8", errors="ignore") if outp.exists() else ""
 
         try:
             new_text, mode = _export_merge_yaml(existing, generated_block, BEGIN, END)
@@ -6035,7 +7985,7 @@ class DeviceExportPreviewView(HomeAssistantView):
             "new_hash": new_hash,
             "diff": diff,
             "new_text": new_text,
-            "exists": outp.exists(),
+            "exists": existed,
         })
 
 
@@ -6053,7 +8003,7 @@ class DeviceExportView(HomeAssistantView):
             return self.json({"ok": False, "error": "missing_entry_id"}, status_code=400)
 
         storage = _get_storage(hass, entry_id)
-        device = storage.get_device(device_id)
+        device = await storage.async_get_device(device_id)
         if not device:
             return self.json({"ok": False, "error": "device_not_found"}, status_code=404)
 
@@ -6064,18 +8014,15 @@ class DeviceExportView(HomeAssistantView):
             body = None
         expected_hash = body.get("expected_hash") if isinstance(body, dict) else None
 
-        yaml_text = compile_to_esphome_yaml(device)
+        yaml_text = await _COMPILE_POOL.run(device_id, compile_to_esphome_yaml, device)
 
-        BEGIN = "# --- BEGIN ESPHOME_TOUCH_DESIGNER GENERATED ---"
-        END = "# --- END ESPHOME_TOUCH_DESIGNER GENERATED ---"
+        BEGIN, END = EXPORT_BEGIN_MARKER, EXPORT_END_MARKER
 
         esphome_dir = Path(hass.config.path("esphome"))
-        esphome_dir.mkdir(parents=True, exist_ok=True)
         fname = f"{device.slug or device.device_id}.yaml"
-        outp = esphome_dir / fname
+        outp, existing, existed = await hass.async_add_executor_job(_read_export_target, esphome_dir, fname)
 
         generated_block = f"{BEGIN}\n{yaml_text.rstrip()}\n{END}\n"
-        existing = outp.read_text("utf-8", errors="ignore") if outp.exists() else ""
 
         import hashlib
         existing_hash = hashlib.sha256(existing.encode("utf-8")).hexdigest()
@@ -6087,12 +8034,125 @@ class DeviceExportView(HomeAssistantView):
         except ValueError as e:
             return self.json({"ok": False, "error": "marker_corrupt", "detail": str(e), "path": str(outp)}, status_code=409)
 
-        outp.write_text(new_text, encoding="utf-8")
+        await hass.async_add_executor_job(outp.write_text, new_text, "utf-8")
         new_hash = hashlib.sha256(new_text.encode("utf-8")).hexdigest()
 
         return self.json({"ok": True, "path": str(outp), "mode": mode, "hash": new_hash})
 
 
+def _write_export(esphome_dir: Path, fname: str, yaml_text: str) -> dict:
+    """Safe-merge yaml_text into /config/esphome/<fname> as DeviceExportView does; the file is only
+    rewritten when the merged text differs. Raises ValueError when the marker block is corrupt."""
+    outp, existing, _existed = _read_export_target(esphome_dir, fname)
+    generated_block = f"{EXPORT_BEGIN_MARKER}\n{yaml_text.rstrip()}\n{EXPORT_END_MARKER}\n"
+    new_text, mode = _export_merge_yaml(existing, generated_block, EXPORT_BEGIN_MARKER, EXPORT_END_MARKER)
+    changed = new_text != existing
+    if changed:
+        outp.write_text(new_text, "utf-8")
+    return {"path": str(outp), "mode": mode, "changed": changed, "hash": sha256(new_text)}
+
+
+def _fleet_compile_device(device: DeviceProject, recipe_text: str, esphome_dir: Path | None) -> dict:
+    """One fleet entry (runs on a compile worker): compile, hash, and optionally export the YAML."""
+    start = time.perf_counter()
+    result: dict = {"device_id": device.device_id, "slug": device.slug}
+    try:
+        yaml_text, warnings, _ = _compile_for_view(device, recipe_text)
+    except Exception as e:  # noqa: BLE001 - one broken project must not stop the fleet
+        result.update(ok=False, error=str(e) or type(e).__name__)
+    else:
+        result.update(ok=True, yaml_hash=sha256(yaml_text), warnings=warnings)
+        if esphome_dir is not None:
+            try:
+                result["export"] = _write_export(esphome_dir, f"{device.slug or device.device_id}.yaml", yaml_text)
+            except ValueError as e:
+                result["export"] = {"error": "marker_corrupt", "detail": str(e)}
+            except OSError as e:
+                result["export"] = {"error": "write_failed", "detail": str(e)}
+    result["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+async def _iter_fleet_compile(
+    hass, storage, device_ids: list[str] | None = None, write: bool = False, concurrency: int = COMPILE_WORKERS,
+):
+    """Compile every device (or device_ids) on the compile pool, yielding each result as it finishes.
+
+    At most `concurrency` devices are loaded and compiling at a time, so a large fleet neither keeps
+    every project resident (MAX_LOADED_PROJECTS) nor queues ahead of interactive compiles.
+    """
+    ids = device_ids if device_ids is not None else [s.device_id for s in storage.list_devices()]
+    esphome_dir = Path(hass.config.path("esphome")) if write else None
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(device_id: str) -> dict:
+        async with slots:
+            device = await storage.async_get_device(device_id)
+            if device is None:
+                return {"device_id": device_id, "ok": False, "error": "device_not_found"}
+            project = device.project or {}
+            recipe_id = (
+                (project.get("hardware") or {}).get("recipe_id")
+                or device.hardware_recipe_id
+                or "sunton_2432s028r_320x240"
+            )
+            recipe_text = await _async_recipe_text(hass, recipe_id)
+            return await _COMPILE_POOL.run(device_id, _fleet_compile_device, device, recipe_text, esphome_dir)
+
+    tasks = [asyncio.ensure_future(one(device_id)) for device_id in dict.fromkeys(ids)]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            yield await fut
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+class FleetCompileView(HomeAssistantView):
+    """Compile every device of the entry in parallel and stream one NDJSON line per device.
+
+    POST body (optional): { device_ids?: [..], write?: bool }. Each line is
+    { device_id, slug, ok, yaml_hash, warnings, duration_ms[, export | error] }; with write the YAML
+    is safe-merged into /config/esphome/<slug>.yaml like DeviceExportView (unchanged files are not
+    rewritten). The last line is a summary: { done: true, total, ok, failed, changed, duration_ms }.
+    """
+
+    url = f"/api/{DOMAIN}/fleet/compile"
+    name = f"api:{DOMAIN}:fleet_compile"
+    requires_auth = False
+
+    async def post(self, request):
+        hass = request.app["hass"]
+        entry_id = request.query.get("entry_id") or _active_entry_id(hass)
+        if not entry_id:
+            return self.json({"ok": False, "error": "no_active_entry"}, status_code=500)
+        try:
+            body = await request.json() if request.can_read_body else {}
+        except Exception:
+            return self.json({"ok": False, "error": "invalid_json"}, status_code=400)
+        if not isinstance(body, dict):
+            return self.json({"ok": False, "error": "body must be JSON object"}, status_code=400)
+        device_ids = body.get("device_ids")
+        if device_ids is not None and not (isinstance(device_ids, list) and all(isinstance(d, str) for d in device_ids)):
+            return self.json({"ok": False, "error": "device_ids must be a list of strings"}, status_code=400)
+        storage = _get_storage(hass, entry_id)
+
+        resp = web.StreamResponse(headers={"Content-Type": "application/x-ndjson", "Cache-Control": "no-cache"})
+        await resp.prepare(request)
+        start = time.perf_counter()
+        summary = {"done": True, "total": 0, "ok": 0, "failed": 0, "changed": 0}
+        async for result in _iter_fleet_compile(hass, storage, device_ids, write=bool(body.get("write"))):
+            summary["total"] += 1
+            summary["ok" if result.get("ok") else "failed"] += 1
+            if (result.get("export") or {}).get("changed"):
+                summary["changed"] += 1
+            await resp.write((json.dumps(result) + "\n").encode("utf-8"))
+        summary["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        await resp.write((json.dumps(summary) + "\n").encode("utf-8"))
+        await resp.write_eof()
+        return resp
+
+
 class EntityCapabilitiesView(HomeAssistantView):
 
     url = "/api/esphome_touch_designer/ha/entities/{entity_id}/capabilities"
@@ -6133,6 +8193,10 @@ class PluginsListView(HomeAssistantView):
 
     async def get(self, request):
         hass: HomeAssistant = request.app["hass"]
+        return self.json(await hass.async_add_executor_job(self._list_plugins, hass))
+
+    @staticmethod
+    def _list_plugins(hass: HomeAssistant) -> dict:
         p = _plugins_dir(hass)
         controls=[]
         for f in sorted((p/"controls").glob("*.json")):
@@ -6146,4 +8210,4 @@ class PluginsListView(HomeAssistantView):
                 widgets.append({"name": f.name, "schema": json.loads(f.read_text("utf-8"))})
             except Exception as e:
                 widgets.append({"name": f.name, "error": str(e)})
-        return self.json({"controls": controls, "widgets": widgets, "dir": str(p)})
+        return {"controls": controls, "widgets": widgets, "dir": str(p)}
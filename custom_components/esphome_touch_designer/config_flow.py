@@ -8,8 +8,11 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 
 from .const import (
+    CONF_COMPILE_PROFILING,
     CONF_ESPHOME_ADDON_TOKEN,
     CONF_ESPHOME_ADDON_URL,
+    CONF_STATE_WS_MAX_RATE,
+    DEFAULT_STATE_WS_MAX_RATE,
     DOMAIN,
     ESPHOME_ADDON_API_URL,
 )
@@ -35,7 +38,7 @@ class ESPHomeTouchDesignerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
 
 def _options_schema(entry: config_entries.ConfigEntry) -> vol.Schema:
-    """Build schema for add-on URL and token. Uses entry.options for defaults."""
+    """Build schema for add-on URL, token, compile profiling and live-state rate. Uses entry.options for defaults."""
     opts = entry.options if entry.options is not None else {}
     return vol.Schema(
         {
@@ -47,6 +50,14 @@ def _options_schema(entry: config_entries.ConfigEntry) -> vol.Schema:
                 CONF_ESPHOME_ADDON_TOKEN,
                 default=opts.get(CONF_ESPHOME_ADDON_TOKEN) or "",
             ): str,
+            vol.Optional(
+                CONF_COMPILE_PROFILING,
+                default=bool(opts.get(CONF_COMPILE_PROFILING, False)),
+            ): bool,
+            vol.Optional(
+                CONF_STATE_WS_MAX_RATE,
+                default=float(opts.get(CONF_STATE_WS_MAX_RATE) or DEFAULT_STATE_WS_MAX_RATE),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=60)),
         }
     )
 
@@ -55,11 +66,11 @@ class ESPHomeTouchDesignerOptionsFlow(config_entries.OptionsFlow):
     """Options flow for ESPHome Touch Designer (Configure). Uses self.config_entry from base."""
 
     async def async_step_init(self, user_input=None):
-        """Manage options: ESPHome add-on URL and API token."""
+        """Manage options: ESPHome add-on URL, API token, compile profiling and live-state rate."""
         if user_input is not None:
             return self.async_create_entry(data=user_input)
         return self.async_show_form(
             step_id="init",
             data_schema=_options_schema(self.config_entry),
-            description="Validate YAML and Deploy call the ESPHome API add-on. Set its base URL (e.g. http://localhost:8098 or http://homeassistant:8098) and the API token from the add-on Setup page.",
+            description="Validate YAML and Deploy call the ESPHome API add-on. Set its base URL (e.g. http://localhost:8098 or http://homeassistant:8098) and the API token from the add-on Setup page. Compile profiling records per-stage timings for every compile (see Diagnostics). Live state max rate caps how many times per second the designer canvas receives entity updates.",
         )
@@ -20,5 +20,10 @@ ESPHOME_ADDON_API_URL = "http://localhost:8098"
 # Option keys for Configure (Settings → Integrations → ESPHome Touch Designer → Configure)
 CONF_ESPHOME_ADDON_URL = "esphome_addon_url"
 CONF_ESPHOME_ADDON_TOKEN = "esphome_addon_token"
+# Profile every compile (stage timings in CompileView responses and the DiagnosticsView histogram)
+CONF_COMPILE_PROFILING = "compile_profiling"
+# Max live-state flushes per second per designer WebSocket connection (changes in between are coalesced)
+CONF_STATE_WS_MAX_RATE = "state_ws_max_rate"
+DEFAULT_STATE_WS_MAX_RATE = 10.0
 
 STATIC_URL_PATH = f"/api/{DOMAIN}/static"       # served from custom_components/.../web/dist
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import dataclasses
+import functools
+import hashlib
+import logging
+import re
 import time
+from collections import OrderedDict
 from typing import Any
 
 from homeassistant.core import HomeAssistant
@@ -9,6 +15,8 @@ from homeassistant.helpers.storage import Store
 
 from .const import DOMAIN, STORAGE_VERSION
 
+_LOGGER = logging.getLogger(__name__)
+
 
 def _default_project() -> dict[str, Any]:
     return {
@@ -91,62 +99,284 @@ class DeviceProject:
     project: dict[str, Any] = dataclasses.field(default_factory=_default_project)
 
 
+@dataclasses.dataclass
+class DeviceSummary:
+    """Index entry for a device: what DevicesView lists, without the project body."""
+    device_id: str
+    slug: str
+    name: str
+    hardware_recipe_id: str | None = None
+    api_key: str | None = None
+    device_settings: dict[str, Any] = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def from_device(cls, device: DeviceProject) -> DeviceSummary:
+        return cls(
+            device_id=device.device_id,
+            slug=device.slug,
+            name=device.name,
+            hardware_recipe_id=device.hardware_recipe_id,
+            api_key=device.api_key,
+            device_settings=dict(device.device_settings or {}),
+        )
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> DeviceSummary:
+        return cls(
+            device_id=d["device_id"],
+            slug=d.get("slug") or d["device_id"],
+            name=d.get("name") or d["device_id"],
+            hardware_recipe_id=d.get("hardware_recipe_id"),
+            api_key=d.get("api_key"),
+            device_settings=d.get("device_settings") or {},
+        )
+
+
 @dataclasses.dataclass
 class DashboardState:
-    devices: dict[str, DeviceProject] = dataclasses.field(default_factory=dict)
+    devices: dict[str, DeviceProject] = dataclasses.field(default_factory=dict)  # loaded projects only
     updated_at: float = dataclasses.field(default_factory=lambda: time.time())
 
 
+# Delay (seconds) before a scheduled save is written; edits within the window are coalesced into one write.
+SAVE_DELAY = 2.0
+
+# Index format marker. Legacy stores (no marker) keep every project inline in the index file.
+INDEX_FORMAT = 2
+
+# Projects kept resident after first access; the least recently used clean ones are dropped
+# (and re-read from their shard on next access) so memory does not grow with the fleet.
+MAX_LOADED_PROJECTS = 16
+
+_SHARD_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def _shard_key(entry_id: str, device_id: str) -> str:
+    """Store key of a device's project shard; ids that are not filename-safe are hashed."""
+    if not _SHARD_ID_RE.match(device_id):
+        device_id = "h_" + hashlib.sha256(device_id.encode("utf-8")).hexdigest()[:16]
+    return f"{DOMAIN}.{entry_id}.device.{device_id}"
+
+
 class DashboardStorage:
-    """Per-config-entry storage for device projects."""
+    """Per-config-entry storage for device projects.
+
+    Sharded: a small index Store (f"{DOMAIN}.{entry_id}": DeviceSummary records, no projects)
+    plus one Store per device holding its project. Setup loads only the index; a device's
+    project is read from its shard and migrated on first async_get_device, and at most
+    MAX_LOADED_PROJECTS clean projects stay resident. A legacy single-file store is split into
+    shards on load without migrating or keeping any project in memory.
+
+    Designer edits go through async_schedule_save (write-behind via Store.async_delay_save), so
+    a burst of autosaves becomes one write of that device's shard only. async_save writes all
+    pending changes immediately and async_flush does the same only if something is pending
+    (used on unload). HA flushes pending delayed saves on shutdown (final write) by itself.
+    """
 
     def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._hass = hass
+        self._entry_id = entry_id
         self._store = Store[dict[str, Any]](hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
-        self.state = DashboardState()
+        self._shards: dict[str, Store] = {}
+        self._load_locks: dict[str, asyncio.Lock] = {}
+        self._index: dict[str, DeviceSummary] = {}
+        self.state = DashboardState()  # devices whose project shard is loaded
+        self._dirty: set[str] = set()  # devices with a pending shard write
+        self._removed: set[str] = set()  # deleted devices whose shard file must be removed
+        self._index_pending = False
+        self._scheduled: set[str | None] = set()  # shards (device_id) and index (None) with a delayed save pending
+        self.save_requests = 0
+        self.writes = 0
+        self.saves_avoided = 0  # delayed saves folded into one already pending
+        self.shard_loads = 0
+        self.evictions = 0
+        self._recent: OrderedDict[str, None] = OrderedDict()  # loaded device ids, least recent first
+
+    def _shard(self, device_id: str) -> Store:
+        store = self._shards.get(device_id)
+        if store is None:
+            store = Store[dict[str, Any]](self._hass, STORAGE_VERSION, _shard_key(self._entry_id, device_id))
+            self._shards[device_id] = store
+        return store
 
     async def async_load(self) -> None:
         data = await self._store.async_load()
         if not data:
             return
-        devices: dict[str, DeviceProject] = {}
-        for d in data.get("devices", []):
-            devices[d["device_id"]] = DeviceProject(
-                device_id=d["device_id"],
-                slug=d["slug"],
-                name=d.get("name", d["device_id"]),
-                hardware_recipe_id=d.get("hardware_recipe_id"),
-                api_key=d.get("api_key"),
-                device_settings=d.get("device_settings", {}),
-                project=_migrate_project(d.get("project")),
+        records = [d for d in data.get("devices", []) if isinstance(d, dict) and d.get("device_id")]
+        if data.get("format") != INDEX_FORMAT:
+            await self._async_migrate_legacy(records, data.get("updated_at", time.time()))
+            return
+        self._index = {d["device_id"]: DeviceSummary.from_dict(d) for d in records}
+        self.state = DashboardState(devices={}, updated_at=data.get("updated_at", time.time()))
+
+    async def _async_migrate_legacy(self, records: list[dict[str, Any]], updated_at: float) -> None:
+        """Split a legacy single-file store into shards. Project bodies are copied as stored and
+        migrated when first loaded. Shards are written before the index, so an interrupted
+        migration leaves the legacy file in place and simply runs again."""
+        self._index = {d["device_id"]: DeviceSummary.from_dict(d) for d in records}
+        self.state = DashboardState(devices={}, updated_at=updated_at)
+        for d in records:
+            self.writes += 1
+            await self._shard(d["device_id"]).async_save({"device_id": d["device_id"], "project": d.get("project")})
+        await self._store.async_save(self._index_data())
+        _LOGGER.info("Migrated %d device project(s) to per-device storage", len(records))
+
+    def _index_data(self) -> dict[str, Any]:
+        """Serialize the index; called by the Store when a (delayed) write happens."""
+        self._index_pending = False
+        self._scheduled.discard(None)
+        self.writes += 1
+        return {
+            "format": INDEX_FORMAT,
+            "updated_at": time.time(),
+            "devices": [dataclasses.asdict(summary) for summary in self._index.values()],
+        }
+
+    def _shard_data(self, device_id: str) -> dict[str, Any]:
+        """Serialize one device's project; called by its shard Store at write time."""
+        self._dirty.discard(device_id)
+        self._scheduled.discard(device_id)
+        self.writes += 1
+        device = self.state.devices.get(device_id)
+        return {"device_id": device_id, "project": device.project if device else None}
+
+    async def async_get_device(self, device_id: str) -> DeviceProject | None:
+        """Device with its project, loading the project shard on first access."""
+        device = self.state.devices.get(device_id)
+        if device is not None:
+            self._touch(device_id)
+            return device
+        if device_id not in self._index:
+            return None
+        lock = self._load_locks.setdefault(device_id, asyncio.Lock())
+        async with lock:
+            device = self.state.devices.get(device_id)
+            if device is not None:
+                return device
+            summary = self._index.get(device_id)
+            if summary is None:
+                return None
+            try:
+                data = await self._shard(device_id).async_load()
+            except Exception:  # noqa: BLE001 - a corrupt shard must not take other devices down
+                _LOGGER.exception("Could not load project for device %s; using an empty project", device_id)
+                data = None
+            self.shard_loads += 1
+            device = DeviceProject(
+                device_id=device_id,
+                slug=summary.slug,
+                name=summary.name,
+                hardware_recipe_id=summary.hardware_recipe_id,
+                api_key=summary.api_key,
+                device_settings=dict(summary.device_settings),
+                project=_migrate_project((data or {}).get("project")),
             )
-        self.state = DashboardState(devices=devices, updated_at=data.get("updated_at", time.time()))
+            self.state.devices[device_id] = device
+            self._touch(device_id)
+            self._evict_clean()
+            return device
+
+    def _touch(self, device_id: str) -> None:
+        self._recent.pop(device_id, None)
+        self._recent[device_id] = None
+
+    def _evict_clean(self) -> None:
+        """Drop least recently used projects without pending writes beyond MAX_LOADED_PROJECTS."""
+        for device_id in list(self._recent):
+            if len(self.state.devices) <= MAX_LOADED_PROJECTS:
+                break
+            if device_id in self._dirty:
+                continue
+            self._recent.pop(device_id, None)
+            if self.state.devices.pop(device_id, None) is not None:
+                self.evictions += 1
 
     async def async_save(self) -> None:
-        payload = {
-            "updated_at": time.time(),
-            "devices": [
-                {
-                    "device_id": d.device_id,
-                    "slug": d.slug,
-                    "name": d.name,
-                    "hardware_recipe_id": d.hardware_recipe_id,
-                    "api_key": d.api_key,
-                    "device_settings": d.device_settings,
-                    "project": d.project,
-                }
-                for d in self.state.devices.values()
-            ],
+        """Write every pending change now (replaces pending delayed saves)."""
+        self.save_requests += 1
+        await self._async_write()
+
+    async def _async_write(self) -> None:
+        for device_id in list(self._removed):
+            self._removed.discard(device_id)
+            self._dirty.discard(device_id)
+            self._scheduled.discard(device_id)
+            store = self._shard(device_id)
+            self._shards.pop(device_id, None)
+            await store.async_remove()
+        for device_id in list(self._dirty):
+            await self._shard(device_id).async_save(self._shard_data(device_id))
+        await self._store.async_save(self._index_data())
+
+    def async_schedule_save(self, device_id: str | None = None) -> None:
+        """Schedule a coalesced write after SAVE_DELAY seconds: device_id's shard, plus the index
+        when device metadata changed (or no device is given)."""
+        self.save_requests += 1
+        if device_id and device_id in self.state.devices:
+            self._dirty.add(device_id)
+            self._mark_scheduled(device_id)
+            self._shard(device_id).async_delay_save(functools.partial(self._shard_data, device_id), SAVE_DELAY)
+        if device_id is None or self._index_pending:
+            self._mark_scheduled(None)
+            self._store.async_delay_save(self._index_data, SAVE_DELAY)
+
+    def _mark_scheduled(self, target: str | None) -> None:
+        """Note a delayed save for a shard (device_id) or the index (None); one already pending absorbs it."""
+        if target in self._scheduled:
+            self.saves_avoided += 1
+        self._scheduled.add(target)
+
+    async def async_flush(self) -> None:
+        """Write pending changes now (unload). No-op when nothing is pending."""
+        if self._dirty or self._removed or self._index_pending:
+            await self._async_write()
+
+    def save_stats(self) -> dict[str, Any]:
+        return {
+            "save_requests": self.save_requests,
+            "writes": self.writes,
+            "saves_avoided": self.saves_avoided,
+            "pending": bool(self._dirty or self._removed or self._index_pending),
+            "dirty_devices": sorted(self._dirty),
+            "devices": len(self._index),
+            "loaded_devices": len(self.state.devices),
+            "shard_loads": self.shard_loads,
+            "evictions": self.evictions,
         }
-        await self._store.async_save(payload)
+
+    @property
+    def device_count(self) -> int:
+        return len(self._index)
+
+    def list_devices(self) -> list[DeviceSummary]:
+        """Summaries (metadata only, no project) for every device, without loading shards."""
+        return list(self._index.values())
+
+    def get_summary(self, device_id: str) -> DeviceSummary | None:
+        return self._index.get(device_id)
 
     def get_device(self, device_id: str) -> DeviceProject | None:
+        """Device if its project is already loaded; use async_get_device to load it."""
         return self.state.devices.get(device_id)
 
     def upsert_device(self, device: DeviceProject) -> None:
         self.state.devices[device.device_id] = device
+        self._touch(device.device_id)
+        self._removed.discard(device.device_id)
+        self._dirty.add(device.device_id)
+        summary = DeviceSummary.from_device(device)
+        if self._index.get(device.device_id) != summary:
+            self._index[device.device_id] = summary
+            self._index_pending = True
 
     def delete_device(self, device_id: str) -> bool:
-        if device_id in self.state.devices:
-            self.state.devices.pop(device_id)
+        if device_id in self._index:
+            self._index.pop(device_id)
+            self.state.devices.pop(device_id, None)
+            self._recent.pop(device_id, None)
+            self._dirty.discard(device_id)
+            self._removed.add(device_id)
+            self._index_pending = True
             return True
         return False
@@ -1,7 +1,7 @@
 import React, { useCallback, useEffect, useMemo, useRef, useState } from "react";
 import packageJson from "../package.json";
 import Canvas from "./Canvas";
-import {listRecipes, compileYaml, validateYaml, parseYamlSyntax, listEntities, getEntity, importRecipe, updateRecipeLabel, deleteRecipe, cloneRecipe, exportRecipe, listCards, getCard, saveCard, deleteCard, previewWidgetYaml} from "./lib/api";
+import {listRecipes, compileYaml, validateYaml, parseYamlSyntax, listEntitySummaries, searchEntities, getEntity, importRecipe, updateRecipeLabel, deleteRecipe, cloneRecipe, exportRecipe, listCards, getCard, saveCard, deleteCard, previewWidgetYaml} from "./lib/api";
 import { collectWidgetIds, updateSectionsWidgetRef } from "./projectSections";
 import { CONTROL_TEMPLATES, type ControlTemplate } from "./controls";
 import { PREBUILT_WIDGETS, type PrebuiltWidget } from "./prebuiltWidgets";
@@ -17,7 +17,7 @@ import {
   formatActionBindingSummary,
   displayActionRequiresNumericSource,
 } from "./bindings/bindingConfig";
-import { entityMatchesBindingSearch } from "./bindings/entitySearch";
+import { bindingPickerEntities } from "./bindings/entitySearch";
 import { getMatchingActionBindings, INPUT_WIDGET_TYPES, OPTION_SELECT_WIDGET_TYPES, CLICK_TOGGLE_WIDGET_TYPES } from "./bindings/matchingActions";
 import {
   deleteDevice,
@@ -244,6 +244,22 @@ function canCreateNativeComponentForWidget(widgetType: string): boolean {
   return !!c && c.types.length > 0;
 }
 
+/** Binding picker list for query: ranked results from the server-side entity index (debounced), local matching until they arrive. */
+function useEntitySearch(query: string, entities: any[]) {
+  const [ranked, setRanked] = useState<Awaited<ReturnType<typeof searchEntities>> | null>(null);
+  const q = query.trim();
+  useEffect(() => {
+    if (!q) return;
+    let cancelled = false;
+    const t = setTimeout(() => {
+      searchEntities(q, 50)
+        .then((r) => { if (!cancelled) setRanked(r); })
+        .catch(() => { if (!cancelled) setRanked(null); });
+    }, 150);
+    return () => { cancelled = true; clearTimeout(t); };
+  }, [q]);
+  return useMemo(() => bindingPickerEntities(q, entities, ranked), [q, entities, ranked]);
+}
 
 function useHistory<T>(initial: T) {
   const [present, setPresent] = useState<T>(initial);
@@ -421,6 +437,8 @@ export default function App() {
   const [actionService, setActionService] = useState<string>("");
   const [actionEntity, setActionEntity] = useState<string>("");
   const [actionEntityDropdownOpen, setActionEntityDropdownOpen] = useState(false);
+  const builderEntityOptions = useEntitySearch(entityQuery, entities);
+  const actionEntityOptions = useEntitySearch(actionEntity, entities);
   const [editingLinkOverride, setEditingLinkOverride] = useState<{ widgetId: string; entityId: string; attribute: string; action: string } | null>(null);
   const [editingOverrideYaml, setEditingOverrideYaml] = useState<string>("");
   /** Fetched entity details for Binding Builder attribute list (so dropdown has full attributes e.g. temperature, current_temperature). */
@@ -694,8 +712,9 @@ const [lintOpen, setLintOpen] = useState<boolean>(false);
   }, [selectedRecipeId]);
 
 useEffect(() => {
-  // Design-time entity picker (poll-free): fetch snapshot when panel opens.
-  listEntities()
+  // Design-time entity picker (poll-free): fetch an attribute-free snapshot when panel opens.
+  // Attributes of the entity being bound come from getEntity (bindingEntityDetails).
+  listEntitySummaries()
     .then((x) => setEntities(Array.isArray(x) ? x : []))
     .catch(() => setEntities([]));
 }, []);
@@ -711,7 +730,7 @@ useEffect(() => {
     let cancelled = false;
     setWidgetYamlPreviewLoading(true);
     setWidgetYamlPreviewError(null);
-    previewWidgetYaml(project, widgetId, safePageIndex)
+    previewWidgetYaml(project, widgetId, safePageIndex, selectedDevice || undefined)
       .then(({ yaml, event_snippets }) => {
         if (!cancelled) {
           setWidgetYamlPreview(yaml);
@@ -720,7 +739,8 @@ useEffect(() => {
         }
       })
       .catch((e: any) => {
-        if (!cancelled) {
+        // "superseded": a newer preview request owns the panel state.
+        if (!cancelled && String(e?.message) !== "superseded") {
           setWidgetYamlPreview(null);
           setWidgetYamlPreviewError(String(e?.message || e));
         }
@@ -729,7 +749,7 @@ useEffect(() => {
         if (!cancelled) setWidgetYamlPreviewLoading(false);
       });
     return () => { cancelled = true; };
-  }, [inspectorTab, selectedWidgetIds.join(","), project, safePageIndex]);
+  }, [inspectorTab, selectedWidgetIds.join(","), project, safePageIndex, selectedDevice]);
 
 useEffect(() => {
   // Binding Builder: when user selects an entity, fetch its full details so the Attribute dropdown has all keys (e.g. temperature, current_temperature).
@@ -815,20 +835,48 @@ useEffect(() => {
   const proto = window.location.protocol === "https:" ? "wss:" : "ws:";
   const wsUrl = `${proto}//${window.location.host}/api/esphome_touch_designer/state/ws`;
   let ws: WebSocket | null = null;
+  // Delta protocol: full state first (seq 1), then changed attributes only; a seq gap asks for a resync.
+  let mirror: Record<string, { state: string; attributes: Record<string, any>; seq: number }> = {};
+  const applyWs = (items: any[]) => {
+    const batch: Record<string, { state: string; attributes: Record<string, any> }> = {};
+    const stale: string[] = [];
+    for (const s of items) {
+      const eid = s?.entity_id;
+      if (!eid) continue;
+      if (s.type === "delta") {
+        const prev = mirror[eid];
+        if (!prev || s.seq !== prev.seq + 1) {
+          stale.push(eid);
+          continue;
+        }
+        const attributes = { ...prev.attributes, ...(s.attributes ?? {}) };
+        for (const k of s.removed ?? []) delete attributes[k];
+        mirror[eid] = { state: s.state ?? prev.state, attributes, seq: s.seq };
+      } else {
+        mirror[eid] = { state: s.state ?? "", attributes: s.attributes ?? {}, seq: s.seq ?? 0 };
+      }
+      batch[eid] = { state: mirror[eid].state, attributes: mirror[eid].attributes };
+    }
+    if (stale.length && ws) ws.send(JSON.stringify({ type: "resync", entity_ids: stale }));
+    applyBatch(batch);
+  };
   const connect = () => {
     if (cancelled) return;
     try {
       ws = new WebSocket(wsUrl);
       ws.onopen = () => {
         if (cancelled || !ws) return;
-        ws.send(JSON.stringify({ type: "subscribe", entity_ids: entityIds }));
+        mirror = {};
+        ws.send(JSON.stringify({ type: "subscribe", entity_ids: entityIds, batch: true, delta: true }));
       };
       ws.onmessage = (event) => {
         if (cancelled) return;
         try {
           const data = JSON.parse(event.data);
-          if (data?.type === "state" && data?.entity_id) {
-            applyBatch({ [data.entity_id]: { state: data.state ?? "", attributes: data.attributes ?? {} } });
+          if ((data?.type === "state" || data?.type === "delta") && data?.entity_id) {
+            applyWs([data]);
+          } else if (data?.type === "states" && Array.isArray(data.states)) {
+            applyWs(data.states);
           }
         } catch (_) {}
       };
@@ -4677,16 +4725,14 @@ function nudgeSelected(dx: number, dy: number, step: number) {
                   const eventOptions = spinboxChildId ? getEventsForType("spinbox") : getEventsForType(widgetType);
                   const bindDomain = domainFromEntityId(bindEntity || actionEntity || "");
                   const serviceOptions = getServicesForDomain(bindDomain);
-                  const filteredEntities = entities.filter(
-                    (e) => e?.entity_id && entityMatchesBindingSearch(e, entityQuery)
-                  ).slice(0, 200);
+                  const filteredEntities = builderEntityOptions;
                   const effectiveDisplayAction = displayActions.includes(bindAction as any) ? bindAction : (displayActions[0] || "label_text");
                   const requiresNumeric = displayActionRequiresNumericSource(effectiveDisplayAction);
                   const selectedEntityAttrs = (() => {
                       if (!bindEntity) return [];
                       const attrs = bindingEntityDetails?.entity_id === bindEntity
                         ? bindingEntityDetails?.attributes
-                        : entities.find((x) => x && x.entity_id === bindEntity)?.attributes;
+                        : undefined;
                       if (!attrs) return [];
                       const keys = Object.keys(attrs).sort();
                       if (!requiresNumeric) return keys;
@@ -4922,7 +4968,7 @@ function nudgeSelected(dx: number, dy: number, step: number) {
                               linkAttr = "color_temp";
                             } else if (act === "widget_checked") kind = "binary";
                             else if (attr) kind = "attribute_number";
-                            const v = entities.find((x)=>x.entity_id===ent)?.attributes?.[linkAttr || attr];
+                            const v = bindingEntityDetails?.entity_id === ent ? bindingEntityDetails?.attributes?.[linkAttr || attr] : undefined;
                             if ((linkAttr || attr) && (typeof v === "string" || Array.isArray(v) || (v && typeof v === "object"))) kind = "attribute_text";
                             if (!linkAttr && !attr && act === "label_text") kind = "state";
                             (p2 as any).bindings.push({ entity_id: ent, kind, attribute: linkAttr || attr || undefined });
@@ -5018,19 +5064,16 @@ function nudgeSelected(dx: number, dy: number, step: number) {
                                 />
                                 {actionEntityDropdownOpen && (
                                   <div style={{ maxHeight: 180, overflowY: "auto", border: "1px solid var(--divider-color)", borderRadius: 4, marginTop: 2, background: "var(--panel-bg, #1e293b)" }}>
-                                    {entities
-                                      .filter((e) => e?.entity_id && entityMatchesBindingSearch(e, actionEntity))
-                                      .slice(0, 200)
-                                      .map((e) => (
-                                        <div
-                                          key={e.entity_id}
-                                          onClick={() => { setActionEntity(e.entity_id); setActionEntityDropdownOpen(false); }}
-                                          style={{ padding: "6px 10px", cursor: "pointer", fontSize: 12, borderBottom: "1px solid rgba(255,255,255,.06)" }}
-                                        >
-                                          {e.entity_id}{e.friendly_name ? ` — ${e.friendly_name}` : ""}
-                                        </div>
-                                      ))}
-                                    {entities.filter((e) => !e?.entity_id ? false : !actionEntity.trim() ? true : (String(e.entity_id).toLowerCase().includes(actionEntity.trim().toLowerCase()) || String(e?.friendly_name || "").toLowerCase().includes(actionEntity.trim().toLowerCase()))).length === 0 && <div className="muted" style={{ padding: 8, fontSize: 12 }}>No matching entities.</div>}
+                                    {actionEntityOptions.map((e) => (
+                                      <div
+                                        key={e.entity_id}
+                                        onClick={() => { setActionEntity(e.entity_id); setActionEntityDropdownOpen(false); }}
+                                        style={{ padding: "6px 10px", cursor: "pointer", fontSize: 12, borderBottom: "1px solid rgba(255,255,255,.06)" }}
+                                      >
+                                        {e.entity_id}{e.friendly_name ? ` — ${e.friendly_name}` : ""}
+                                      </div>
+                                    ))}
+                                    {actionEntityOptions.length === 0 && <div className="muted" style={{ padding: 8, fontSize: 12 }}>No matching entities.</div>}
                                   </div>
                                 )}
                                 {linksForWidget.length > 0 && (
@@ -5109,13 +5152,13 @@ function nudgeSelected(dx: number, dy: number, step: number) {
                                 if (!project || selectedWidgetIds.length !== 1) return;
                                 setWidgetYamlPreviewLoading(true);
                                 setWidgetYamlPreviewError(null);
-                                previewWidgetYaml(project, selectedWidgetIds[0], safePageIndex)
+                                previewWidgetYaml(project, selectedWidgetIds[0], safePageIndex, selectedDevice || undefined)
                                   .then(({ yaml, event_snippets }) => {
                                     setWidgetYamlPreview(yaml);
                                     setWidgetYamlEventSnippets(event_snippets ?? {});
                                     setWidgetYamlPreviewError(null);
                                   })
-                                  .catch((e: any) => { setWidgetYamlPreviewError(String(e?.message || e)); })
+                                  .catch((e: any) => { if (String(e?.message) !== "superseded") setWidgetYamlPreviewError(String(e?.message || e)); })
                                   .finally(() => setWidgetYamlPreviewLoading(false));
                               }}
                             >
@@ -5134,13 +5177,13 @@ function nudgeSelected(dx: number, dy: number, step: number) {
                                 if (!project || selectedWidgetIds.length !== 1) return;
                                 setWidgetYamlPreviewLoading(true);
                                 setWidgetYamlPreviewError(null);
-                                previewWidgetYaml(project, selectedWidgetIds[0], safePageIndex)
+                                previewWidgetYaml(project, selectedWidgetIds[0], safePageIndex, selectedDevice || undefined)
                                   .then(({ yaml, event_snippets }) => {
                                     setWidgetYamlPreview(yaml);
                                     setWidgetYamlEventSnippets(event_snippets ?? {});
                                     setWidgetYamlPreviewError(null);
                                   })
-                                  .catch((e: any) => { setWidgetYamlPreviewError(String(e?.message || e)); })
+                                  .catch((e: any) => { if (String(e?.message) !== "superseded") setWidgetYamlPreviewError(String(e?.message || e)); })
                                   .finally(() => setWidgetYamlPreviewLoading(false));
                               }}
                             >
@@ -2,7 +2,7 @@
  * Entity search for Binding Builder: word-based matching (§4.2 UX).
  */
 import { describe, it, expect } from "vitest";
-import { entityMatchesBindingSearch } from "./entitySearch";
+import { bindingPickerEntities, entityMatchesBindingSearch } from "./entitySearch";
 
 describe("entityMatchesBindingSearch", () => {
   it("matches when query is empty (show all)", () => {
@@ -44,3 +44,25 @@ describe("entityMatchesBindingSearch", () => {
     expect(entityMatchesBindingSearch({} as any, "shed")).toBe(false);
   });
 });
+
+describe("bindingPickerEntities", () => {
+  const local = [
+    { entity_id: "light.shed", friendly_name: "Shed" },
+    { entity_id: "sensor.shed_temperature", friendly_name: "Shed temperature" },
+    { entity_id: "light.kitchen", friendly_name: "Kitchen" },
+  ];
+  const ranked = { query: "shed temp", items: [{ entity_id: "sensor.shed_temperature", name: "Shed temperature" }] };
+
+  it("uses ranked server results that answer the current query", () => {
+    expect(bindingPickerEntities(" shed temp ", local, ranked)).toEqual([
+      { entity_id: "sensor.shed_temperature", friendly_name: "Shed temperature" },
+    ]);
+    expect(bindingPickerEntities("shed temp", local, { query: "shed temp", items: [] })).toEqual([]);
+  });
+
+  it("falls back to local matching for an empty, stale or missing search", () => {
+    expect(bindingPickerEntities("", local, ranked)).toEqual(local);
+    expect(bindingPickerEntities("kitchen", local, ranked)).toEqual([local[2]]);
+    expect(bindingPickerEntities("shed", local, null, 1)).toEqual([local[0]]);
+  });
+});
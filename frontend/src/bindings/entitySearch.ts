@@ -15,3 +15,22 @@ export function entityMatchesBindingSearch(
   const searchText = eid + " " + name;
   return words.every((w) => searchText.includes(w));
 }
+
+type PickerEntity = { entity_id?: string; friendly_name?: string };
+type RankedSearch = { query: string; items: { entity_id: string; name?: string | null }[] };
+
+/** Entities to list in a binding picker: the server's ranked results once they answer the current query, otherwise local word matching (empty query, request in flight or failed). */
+export function bindingPickerEntities(
+  query: string,
+  entities: PickerEntity[],
+  ranked: RankedSearch | null,
+  limit = 200
+): { entity_id: string; friendly_name?: string }[] {
+  const q = String(query || "").trim();
+  if (q && ranked && ranked.query.trim() === q) {
+    return ranked.items.map((i) => ({ entity_id: i.entity_id, friendly_name: i.name ?? undefined }));
+  }
+  return entities
+    .filter((e): e is { entity_id: string; friendly_name?: string } => !!e?.entity_id && entityMatchesBindingSearch(e, q))
+    .slice(0, limit);
+}
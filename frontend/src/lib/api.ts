@@ -37,16 +37,18 @@ export async function cleanupOrphanedComponents(project: any): Promise<{ ok: boo
 /** Per-event snippet from widget YAML preview. source: "empty" | "auto" | "edited" */
 export type WidgetYamlEventSnippet = { yaml: string; source: string };
 
-/** Preview the exact YAML the compiler would emit for one widget (props, style, action bindings). Returns yaml and per-event snippets. */
+/** Preview the exact YAML the compiler would emit for one widget (props, style, action bindings). Returns yaml and per-event snippets.
+ * A newer preview for the same device supersedes this one: it then rejects with Error("superseded"). */
 export async function previewWidgetYaml(
   project: any,
   widgetId: string,
-  pageIndex: number
+  pageIndex: number,
+  deviceId?: string
 ): Promise<{ yaml: string; event_snippets: Record<string, WidgetYamlEventSnippet> }> {
   const r = await fetch("/api/esphome_touch_designer/preview-widget-yaml", {
     method: "POST",
     headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ project, widget_id: widgetId, page_index: pageIndex }),
+    body: JSON.stringify({ project, widget_id: widgetId, page_index: pageIndex, device_id: deviceId }),
   });
   const data = await r.json().catch(() => ({}));
   if (!r.ok || data?.ok === false) throw new Error(data?.error || `preview failed: ${r.status}`);
@@ -97,6 +99,36 @@ export async function listEntities() {
   return await r.json();
 }
 
+/** One page of entities filtered server-side; attributes only when listed in fields. */
+export async function queryEntities(params: { domain?: string; q?: string; fields?: string; limit?: number; cursor?: string }) {
+  const qs = new URLSearchParams();
+  for (const [k, v] of Object.entries(params)) if (v !== undefined && v !== "") qs.set(k, String(v));
+  const r = await fetch(`/api/esphome_touch_designer/entities?${qs.toString()}`);
+  if (!r.ok) throw new Error('Failed to query entities');
+  return await r.json() as { items: any[]; total: number; next_cursor: string | null };
+}
+
+/** Every entity without attributes (entity_id, state, friendly_name, icon, device_class, unit), fetched page by page. */
+export async function listEntitySummaries(pageSize = 1000) {
+  const all: any[] = [];
+  let cursor: string | undefined;
+  do {
+    const page = await queryEntities({ limit: pageSize, cursor });
+    all.push(...page.items);
+    cursor = page.next_cursor ?? undefined;
+  } while (cursor);
+  return all;
+}
+
+/** Ranked server-side entity search (entity_id, friendly_name, area, device_class). */
+export async function searchEntities(q: string, limit = 20, domain?: string) {
+  const qs = new URLSearchParams({ q, limit: String(limit) });
+  if (domain) qs.set('domain', domain);
+  const r = await fetch(`/api/esphome_touch_designer/entities/search?${qs.toString()}`);
+  if (!r.ok) throw new Error('Failed to search entities');
+  return await r.json() as { query: string; items: { entity_id: string; name: string | null; area: string | null; device_class: string | null; score: number }[] };
+}
+
 export async function getEntity(entity_id: string) {
   const safe = entity_id.replace('.', ',');
   const r = await fetch(`/api/esphome_touch_designer/entity/${safe}`);
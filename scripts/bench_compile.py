@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Compile benchmark: time, peak memory and output size per compiler stage on synthetic projects.
+
+Runs offline with the same Home Assistant mocks as scripts/trace_compile.py. Projects come from
+tests/fixtures/synthetic_projects.py (10/100/1,000/5,000 widgets across all compilable types).
+
+Usage (from repo root):
+  python scripts/bench_compile.py                       # run and print a table
+  python scripts/bench_compile.py --check               # compare against the JSON baseline (exit 1 on regression)
+  python scripts/bench_compile.py --update-baseline     # rewrite the baseline
+  python scripts/bench_compile.py --sizes 10,100 --json out.json
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import unittest.mock as mock  # noqa: E402
+for m in (
+    "homeassistant",
+    "homeassistant.core",
+    "homeassistant.helpers",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.event",
+    "homeassistant.components",
+    "homeassistant.components.http",
+    "homeassistant.config_entries",
+):
+    if m not in sys.modules:
+        sys.modules[m] = mock.MagicMock()
+
+from custom_components.esphome_touch_designer.storage import DeviceProject  # noqa: E402
+from custom_components.esphome_touch_designer.api import views as V  # noqa: E402
+from tests.fixtures.synthetic_projects import BENCH_SIZES, build_synthetic_project  # noqa: E402
+
+BASELINE_PATH = REPO_ROOT / "scripts" / "bench_compile_baseline.json"
+RECIPE_ID = "jc1060p470_esp32p4_1024x600"
+# Timings vary between machines and runs; only flag a stage when it is this much slower/larger.
+DEFAULT_TOLERANCE = 0.5
+# Stages faster than this are dominated by timer noise and are never flagged for time.
+MIN_FLAGGED_SECONDS = 0.002
+
+
+def _output_bytes(value) -> int:
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, dict):
+        return sum(_output_bytes(v) for v in value.values())
+    if isinstance(value, (tuple, list)):
+        return sum(_output_bytes(v) for v in value)
+    return 0
+
+
+def _stages(project: dict, device: DeviceProject, recipe_text: str) -> list[tuple[str, object, object]]:
+    """(name, setup, run) per stage. setup runs untimed before every run."""
+    index = V.ProjectIndex.build(project)
+    _, font_id_map = V._compile_fonts_from_project(project, index)
+    cpicker = V._collect_color_picker_defaults(project, index)
+    wpicker = V._collect_white_picker_defaults(project, index)
+    moved = copy.deepcopy(project)
+    moved["pages"][0]["widgets"][0]["x"] += 1
+    moved_device = copy.copy(device)
+    moved_device.project = moved
+
+    def cold():
+        V._SECTION_MEMO.clear()
+
+    def warm():
+        V._SECTION_MEMO.clear()
+        V._build_compiler_sections(project, device)
+
+    return [
+        ("index", None, lambda: V.ProjectIndex.build(project)),
+        ("ha_bindings", None, lambda: V._compile_ha_bindings(project, index)),
+        ("fonts", None, lambda: V._compile_fonts_from_project(project, index)[0]),
+        ("assets", None, lambda: V._compile_assets(project, index)),
+        ("lock_globals", None, lambda: V._compile_ui_lock_globals(project, index)),
+        ("prebuilt", None, lambda: V._compile_prebuilt_components(project, include_user_components=False, index=index)),
+        ("lvgl_pages", None, lambda: V._compile_lvgl_pages_schema_driven(
+            project, cpicker_defaults=cpicker, wpicker_defaults=wpicker, index=index, font_id_map=font_id_map,
+        )),
+        ("sections", cold, lambda: V._build_compiler_sections(project, device)),
+        ("section_merge", warm, lambda: V._compile_to_esphome_yaml_section_based(device, recipe_text)),
+        ("compile", cold, lambda: V.compile_to_esphome_yaml(device, recipe_text)),
+        ("compile_geometry_edit", warm, lambda: V.compile_to_esphome_yaml(moved_device, recipe_text)),
+    ]
+
+
+def _measure(setup, run, repeat: int) -> dict:
+    best = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        out = run()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    # Peak memory in a separate, untimed pass (tracemalloc slows allocation-heavy code).
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": round(best, 6), "peak_bytes": peak, "output_bytes": _output_bytes(out)}
+
+
+def run_benchmark(sizes=BENCH_SIZES, repeat: int = 3) -> dict:
+    """Benchmark every stage for each project size. Returns the JSON-serialisable result document."""
+    recipe_text = (V.RECIPES_BUILTIN_DIR / f"{RECIPE_ID}.yaml").read_text("utf-8")
+    recipe_text = V._apply_user_injection(recipe_text, {})
+    V._WIDGET_SCHEMAS.preload()
+    results: dict[str, dict] = {}
+    for n in sizes:
+        project = build_synthetic_project(n, RECIPE_ID)
+        device = DeviceProject(
+            device_id=f"bench_{n}", slug=f"bench_{n}", name=f"Bench {n}",
+            hardware_recipe_id=RECIPE_ID, api_key="k3NlzHoGkcmsMq0rxB8DUjwfTC+1MzeJFVoCgQd12IA=",
+            project=project,
+        )
+        results[str(n)] = {name: _measure(setup, run, repeat) for name, setup, run in _stages(project, device, recipe_text)}
+    V._SECTION_MEMO.clear()
+    return {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(), "repeat": repeat, "recipe": RECIPE_ID},
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """Regressions of current vs baseline: slower or larger beyond tolerance, or changed output size."""
+    problems: list[str] = []
+    for size, stages in (current.get("results") or {}).items():
+        base_stages = (baseline.get("results") or {}).get(size) or {}
+        for name, cur in stages.items():
+            base = base_stages.get(name)
+            if not base:
+                continue
+            if cur["seconds"] >= MIN_FLAGGED_SECONDS and cur["seconds"] > base["seconds"] * (1 + tolerance):
+                problems.append(f"{size}/{name}: time {base['seconds']:.4f}s -> {cur['seconds']:.4f}s")
+            if cur["peak_bytes"] > base["peak_bytes"] * (1 + tolerance):
+                problems.append(f"{size}/{name}: peak memory {base['peak_bytes']} -> {cur['peak_bytes']} bytes")
+            if cur["output_bytes"] != base["output_bytes"]:
+                problems.append(f"{size}/{name}: output size {base['output_bytes']} -> {cur['output_bytes']} bytes")
+    return problems
+
+
+def _print_table(doc: dict) -> None:
+    print(f"{'size':>6} {'stage':<22} {'ms':>10} {'peak KiB':>10} {'out KiB':>10}")
+    for size, stages in doc["results"].items():
+        for name, r in stages.items():
+            print(f"{size:>6} {name:<22} {r['seconds'] * 1000:>10.2f} {r['peak_bytes'] / 1024:>10.1f} {r['output_bytes'] / 1024:>10.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(str(s) for s in BENCH_SIZES), help="comma-separated widget counts")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage (best is kept)")
+    parser.add_argument("--json", metavar="PATH", help="also write results to PATH")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="baseline JSON path")
+    parser.add_argument("--check", action="store_true", help="exit 1 when a stage regresses against the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed relative slowdown/growth")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    doc = run_benchmark(sizes, repeat=max(1, args.repeat))
+    _print_table(doc)
+    if args.json:
+        Path(args.json).write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {baseline_path}")
+        return 0
+    if args.check:
+        if not baseline_path.exists():
+            print(f"No baseline at {baseline_path}; run with --update-baseline first.")
+            return 1
+        problems = compare(doc, json.loads(baseline_path.read_text("utf-8")), args.tolerance)
+        for p in problems:
+            print("REGRESSION", p)
+        if problems:
+            print("If the change is intended, refresh the baseline with --update-baseline.")
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
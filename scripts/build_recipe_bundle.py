@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Build the precompiled builtin recipe bundle (recipes/builtin_bundle.json).
+
+The bundle holds every builtin recipe's text, parsed sections, default section pieces, display
+id, metadata and label, so the integration loads them with one file read instead of parsing
+YAML per request. Re-run after editing or adding a file under recipes/builtin/ (the integration
+ignores a bundle that no longer matches the recipe files, and tests/test_recipe_bundle.py fails).
+
+Usage (from repo root):
+  python scripts/build_recipe_bundle.py           # rewrite the bundle
+  python scripts/build_recipe_bundle.py --check   # exit 1 when the bundle is stale
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import unittest.mock as mock  # noqa: E402
+for m in (
+    "homeassistant",
+    "homeassistant.core",
+    "homeassistant.helpers",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.event",
+    "homeassistant.components",
+    "homeassistant.components.http",
+    "homeassistant.config_entries",
+):
+    if m not in sys.modules:
+        sys.modules[m] = mock.MagicMock()
+
+from custom_components.esphome_touch_designer.api import views as V  # noqa: E402
+
+
+def render_bundle() -> str:
+    """Bundle JSON text (deterministic, compact)."""
+    return json.dumps(V.build_recipe_bundle(), sort_keys=True, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="exit 1 when the bundle does not match the recipes")
+    args = parser.parse_args()
+
+    text = render_bundle()
+    path = V.RECIPE_BUNDLE_PATH
+    if args.check:
+        current = path.read_text("utf-8") if path.exists() else ""
+        if current != text:
+            print(f"{path} is stale; run python scripts/build_recipe_bundle.py")
+            return 1
+        print("Recipe bundle is up to date.")
+        return 0
+    path.write_text(text, encoding="utf-8")
+    print(f"Wrote {path} ({len(text.encode('utf-8')) // 1024} KiB, {len(json.loads(text)['recipes'])} recipes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,7 @@ for m in (
     "homeassistant.core",
     "homeassistant.helpers",
     "homeassistant.helpers.storage",
+    "homeassistant.helpers.event",
     "homeassistant.components",
     "homeassistant.components.http",
     "homeassistant.config_entries",
@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
@@ -25,11 +26,14 @@ for mod in (
     "homeassistant.config_entries",
     "homeassistant.helpers",
     "homeassistant.helpers.storage",
+    "homeassistant.helpers.event",
     "homeassistant.components",
     "homeassistant.components.http",
 ):
     if mod not in sys.modules:
         sys.modules[mod] = mock.MagicMock()
+# @callback only tags a function for HA's job runner; keep decorated methods callable in tests
+sys.modules["homeassistant.core"].callback = lambda func: func
 
 
 @pytest.fixture
@@ -71,6 +75,23 @@ def make_device(default_project):
     return _make
 
 
+@pytest.fixture
+def fake_hass(tmp_path):
+    """Minimal hass with config.path under tmp_path and an inline async_add_executor_job that records
+    each function's name in hass.executor_calls."""
+    calls: list[str] = []
+
+    async def add_executor_job(func, *args):
+        calls.append(getattr(func, "__name__", repr(func)))
+        return func(*args)
+
+    return SimpleNamespace(
+        config=SimpleNamespace(path=lambda *parts: str(tmp_path.joinpath(*parts))),
+        async_add_executor_job=add_executor_job,
+        executor_calls=calls,
+    )
+
+
 @pytest.fixture
 def repo_root():
     """Repo root path (same as REPO_ROOT in conftest)."""
@@ -0,0 +1,127 @@
+"""
+Synthetic projects for compile benchmarks (scripts/bench_compile.py, tests/test_bench_compile.py).
+
+build_synthetic_project(n) returns a deterministic project with n widgets cycling through every
+type in COMPILABLE_WIDGET_TYPES, spread over pages of WIDGETS_PER_PAGE, with parent_id groups,
+display links, action bindings, color/white pickers and esphome_components.
+"""
+from __future__ import annotations
+
+from custom_components.esphome_touch_designer.api.views import COMPILABLE_WIDGET_TYPES
+from custom_components.esphome_touch_designer.storage import _default_project
+
+BENCH_SIZES = (10, 100, 1000, 5000)
+WIDGETS_PER_PAGE = 50
+SCREEN_W, SCREEN_H = 1024, 600
+CELL_W, CELL_H = 120, 56
+
+# Props that make each type compile to something representative (types not listed use {}).
+_TYPE_PROPS: dict[str, dict] = {
+    "label": {"text": "Label", "font": "asset:Roboto.ttf:20"},
+    "button": {"text": "Go"},
+    "slider": {"value": 50, "min_value": 0, "max_value": 100},
+    "bar": {"value": 60, "min_value": 0, "max_value": 100},
+    "arc": {"value": 50, "min_value": 0, "max_value": 100},
+    "arc_labeled": {"value": 20, "min_value": 5, "max_value": 30},
+    "dropdown": {"options": "Off\nHeat\nCool"},
+    "roller": {"options": "One\nTwo\nThree"},
+    "spinbox": {"value": 0, "range_from": -10, "range_to": 10},
+    "line": {"points": ["0,0", "80,2", "100,0"]},
+    "image": {"src": "asset:bench.png"},
+    "qrcode": {"text": "https://example.com"},
+    "textarea": {"text": "Notes"},
+    "color_picker": {"value": "#4080FF"},
+    "white_picker": {"value": 250},
+}
+
+# Display link action and source per widget type (only types with a display action are linked).
+_TYPE_LINKS: dict[str, tuple[str, str, str, str]] = {
+    "label": ("label_text", "sensor", "state", ""),
+    "arc": ("arc_value", "light", "attribute_number", "brightness"),
+    "bar": ("bar_value", "light", "attribute_number", "brightness"),
+    "slider": ("slider_value", "light", "attribute_number", "brightness"),
+    "switch": ("widget_checked", "switch", "binary", ""),
+    "checkbox": ("widget_checked", "switch", "binary", ""),
+    "dropdown": ("dropdown_selected", "input_select", "state", ""),
+    "roller": ("roller_selected", "input_select", "state", ""),
+    "spinbox": ("spinbox_value", "sensor", "state", ""),
+    "color_picker": ("color_picker", "light", "binary", ""),
+    "white_picker": ("white_picker", "light", "binary", ""),
+}
+
+# Action binding (event, domain, service) per widget type.
+_TYPE_ACTIONS: dict[str, tuple[str, str, str]] = {
+    "button": ("on_click", "light", "toggle"),
+    "switch": ("on_click", "switch", "toggle"),
+    "slider": ("on_value", "light", "turn_on"),
+    "dropdown": ("on_value", "input_select", "select_option"),
+    "color_picker": ("on_value", "light", "turn_on"),
+    "white_picker": ("on_value", "light", "turn_on"),
+}
+
+# Entities are shared between widgets the way a real dashboard reuses a handful of devices.
+_ENTITIES_PER_DOMAIN = 8
+
+
+def _widget(wid: str, wtype: str, slot: int) -> dict:
+    col = slot % (SCREEN_W // CELL_W)
+    row = (slot // (SCREEN_W // CELL_W)) % (SCREEN_H // CELL_H)
+    return {
+        "id": wid,
+        "type": wtype,
+        "x": col * CELL_W,
+        "y": row * CELL_H,
+        "w": CELL_W - 8,
+        "h": CELL_H - 8,
+        "props": dict(_TYPE_PROPS.get(wtype, {})),
+        "style": {},
+    }
+
+
+def build_synthetic_project(n_widgets: int, recipe_id: str = "jc1060p470_esp32p4_1024x600") -> dict:
+    """Deterministic project with n_widgets widgets covering every compilable type."""
+    proj = _default_project()
+    proj["device"] = {"hardware_recipe_id": recipe_id, "screen": {"width": SCREEN_W, "height": SCREEN_H}}
+    types = sorted(COMPILABLE_WIDGET_TYPES)
+    pages: list[dict] = []
+    links: list[dict] = []
+    bindings: dict[str, dict] = {}
+    action_bindings: list[dict] = []
+    for i in range(n_widgets):
+        page_idx, slot = divmod(i, WIDGETS_PER_PAGE)
+        if slot == 0:
+            pages.append({"page_id": f"page_{page_idx}", "name": f"Page {page_idx}", "widgets": []})
+        wtype = types[i % len(types)]
+        wid = f"{wtype}_{i}"
+        w = _widget(wid, wtype, slot)
+        page_widgets = pages[-1]["widgets"]
+        # Every container adopts the two widgets that follow it on the same page.
+        prev = page_widgets[-2:] if slot >= 2 else page_widgets[-1:] if slot >= 1 else []
+        for p in reversed(prev):
+            if p["type"] == "container":
+                w["parent_id"] = p["id"]
+                w["x"], w["y"] = 4, 4
+                break
+        page_widgets.append(w)
+        if wtype in _TYPE_LINKS:
+            action, domain, kind, attribute = _TYPE_LINKS[wtype]
+            entity_id = f"{domain}.bench_{i % _ENTITIES_PER_DOMAIN}"
+            source = {"entity_id": entity_id, "kind": kind, "attribute": attribute}
+            bindings.setdefault(f"{entity_id}|{kind}|{attribute}", dict(source))
+            links.append({"source": source, "target": {"widget_id": wid, "action": action}})
+        if wtype in _TYPE_ACTIONS:
+            event, domain, service = _TYPE_ACTIONS[wtype]
+            action_bindings.append({
+                "widget_id": wid,
+                "event": event,
+                "call": {"domain": domain, "service": service, "entity_id": f"{domain}.bench_{i % _ENTITIES_PER_DOMAIN}", "data": {}},
+            })
+    proj["pages"] = pages or proj["pages"]
+    proj["bindings"] = list(bindings.values())
+    proj["links"] = links
+    proj["action_bindings"] = action_bindings
+    proj["esphome_components"] = [
+        "sensor:\n  - platform: wifi_signal\n    id: bench_wifi_signal\n    update_interval: 10s\n",
+        "switch:\n  - platform: template\n    id: bench_template_switch\n    name: Bench\n    optimistic: true\n",
+    ]
+    return proj
@@ -0,0 +1,49 @@
+"""
+File I/O helpers used by the API views: reads and recipe lookups run through
+hass.async_add_executor_job instead of blocking the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.esphome_touch_designer.api.views import (
+    RECIPES_BUILTIN_DIR,
+    _async_list_all_recipes,
+    _async_read_text,
+    _async_recipe_text,
+    _read_export_target,
+)
+
+
+def test_recipe_text_goes_through_executor(tmp_path, fake_hass):
+    """Builtin and user recipes resolve off the loop; unknown ids give "" unless the builtin fallback finds a file."""
+    hass, calls = fake_hass, fake_hass.executor_calls
+    user_dir = tmp_path / "esphome_touch_designer" / "recipes" / "user" / "mine"
+    user_dir.mkdir(parents=True)
+    (user_dir / "recipe.yaml").write_text("esphome:\n  name: mine\n", encoding="utf-8")
+
+    builtin_id = "jc1060p470_esp32p4_1024x600"
+    text = asyncio.run(_async_recipe_text(hass, builtin_id))
+    assert text == (RECIPES_BUILTIN_DIR / f"{builtin_id}.yaml").read_text("utf-8")
+    assert asyncio.run(_async_recipe_text(hass, "mine", fallback_builtin=False)).startswith("esphome:")
+    assert asyncio.run(_async_recipe_text(hass, "does_not_exist")) == ""
+    assert calls == ["_resolve_recipe_text"] * 3
+
+    recipes = asyncio.run(_async_list_all_recipes(hass))
+    assert {"mine", builtin_id} <= {r["id"] for r in recipes}
+
+
+def test_read_text_default_and_export_target(tmp_path, fake_hass):
+    """Missing files return the default (None for the deploy 404 path); export target reports existence."""
+    hass, calls = fake_hass, fake_hass.executor_calls
+    assert asyncio.run(_async_read_text(hass, tmp_path / "missing.yaml", default=None)) is None
+    (tmp_path / "a.yaml").write_bytes(b"ok\xff")
+    assert asyncio.run(_async_read_text(hass, tmp_path / "a.yaml", errors="ignore")) == "ok"
+    assert calls == ["_read_text_if_exists"] * 2
+
+    esphome_dir = tmp_path / "esphome"
+    outp, existing, existed = _read_export_target(esphome_dir, "dev.yaml")
+    assert esphome_dir.is_dir() and outp == esphome_dir / "dev.yaml"
+    assert (existing, existed) == ("", False)
+    outp.write_text("x: 1\n", encoding="utf-8")
+    assert _read_export_target(esphome_dir, "dev.yaml")[1:] == ("x: 1\n", True)
@@ -0,0 +1,70 @@
+"""
+Compile benchmark suite (scripts/bench_compile.py): synthetic projects cover every compilable type,
+the small sizes run end to end, and the baseline comparison flags regressions.
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+
+import yaml
+
+from custom_components.esphome_touch_designer.api.views import COMPILABLE_WIDGET_TYPES, compile_to_esphome_yaml
+from tests.fixtures.synthetic_projects import BENCH_SIZES, build_synthetic_project
+
+
+def _bench_module(repo_root):
+    spec = importlib.util.spec_from_file_location("bench_compile", repo_root / "scripts" / "bench_compile.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _yaml_loader():
+    class Loader(yaml.SafeLoader):
+        pass
+
+    Loader.add_multi_constructor("!", lambda loader, suffix, node: None)
+    return Loader
+
+
+def test_synthetic_project_covers_all_types(make_device):
+    """100 widgets: every compilable type, links, action bindings and pickers; output is valid YAML."""
+    proj = build_synthetic_project(100)
+    types = {w["type"] for page in proj["pages"] for w in page["widgets"]}
+    assert types == set(COMPILABLE_WIDGET_TYPES)
+    assert sum(len(p["widgets"]) for p in proj["pages"]) == 100
+    assert proj["links"] and proj["action_bindings"] and proj["esphome_components"]
+    assert any(w.get("parent_id") for page in proj["pages"] for w in page["widgets"])
+    assert build_synthetic_project(100) == proj
+    dev = make_device(project=proj, recipe_id="jc1060p470_esp32p4_1024x600", slug="bench")
+    out = compile_to_esphome_yaml(dev)
+    doc = yaml.load(out, Loader=_yaml_loader())
+    assert "lvgl" in doc and "sensor" in doc
+
+
+def test_benchmark_runs_and_compares(repo_root):
+    """Small sizes produce every stage; identical results pass the check, a slower or changed stage fails it."""
+    bench = _bench_module(repo_root)
+    doc = bench.run_benchmark(sizes=(10,), repeat=1)
+    stages = doc["results"]["10"]
+    assert {"index", "ha_bindings", "lvgl_pages", "sections", "compile"} <= set(stages)
+    assert all(r["seconds"] >= 0 and r["peak_bytes"] > 0 for r in stages.values() if r["output_bytes"])
+    assert bench.compare(doc, doc) == []
+    worse = json.loads(json.dumps(doc))
+    worse["results"]["10"]["compile"]["seconds"] = stages["compile"]["seconds"] * 10 + 1
+    worse["results"]["10"]["lvgl_pages"]["output_bytes"] += 1
+    problems = bench.compare(worse, doc)
+    assert any("10/compile: time" in p for p in problems)
+    assert any("10/lvgl_pages: output size" in p for p in problems)
+
+
+def test_baseline_covers_bench_sizes(repo_root):
+    """The committed baseline has an entry per size and per stage, with output sizes matching the compiler."""
+    bench = _bench_module(repo_root)
+    baseline = json.loads(bench.BASELINE_PATH.read_text("utf-8"))
+    assert set(baseline["results"]) == {str(n) for n in BENCH_SIZES}
+    current = bench.run_benchmark(sizes=(10,), repeat=1)
+    assert set(baseline["results"]["10"]) == set(current["results"]["10"])
+    for name, r in current["results"]["10"].items():
+        assert r["output_bytes"] == baseline["results"]["10"][name]["output_bytes"], name
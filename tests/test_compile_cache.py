@@ -0,0 +1,153 @@
+"""
+Compile cache: identical inputs reuse the cached YAML, any input change misses, LRU is bounded.
+"""
+from __future__ import annotations
+
+import copy
+
+from custom_components.esphome_touch_designer.api.views import (
+    _CompileCache,
+    compile_to_esphome_yaml,
+    compile_to_esphome_yaml_cached,
+)
+from custom_components.esphome_touch_designer.api import views
+
+
+def _label_project(default_project, text="Hello"):
+    proj = copy.deepcopy(default_project)
+    proj["pages"][0]["widgets"] = [
+        {"id": "lbl1", "type": "label", "x": 10, "y": 10, "w": 100, "h": 30, "props": {"text": text}, "style": {}},
+    ]
+    return proj
+
+
+def test_cached_compile_matches_uncached(make_device, default_project, jc1060_recipe_text):
+    """Cached result is byte-identical to a direct compile."""
+    views._COMPILE_CACHE.clear()
+    device = make_device(project=_label_project(default_project))
+    yaml_text, warnings = compile_to_esphome_yaml_cached(device, jc1060_recipe_text)
+    assert yaml_text == compile_to_esphome_yaml(device, recipe_text=jc1060_recipe_text)
+    assert warnings == []
+
+
+def test_cache_hit_and_miss(make_device, default_project, jc1060_recipe_text):
+    """Second compile of the same inputs is a hit; editing the project or api_key misses."""
+    views._COMPILE_CACHE.clear()
+    before = views._COMPILE_CACHE.stats()
+    device = make_device(project=_label_project(default_project))
+    first, _ = compile_to_esphome_yaml_cached(device, jc1060_recipe_text)
+    second, _ = compile_to_esphome_yaml_cached(device, jc1060_recipe_text)
+    assert first == second
+    stats = views._COMPILE_CACHE.stats()
+    assert stats["hits"] - before["hits"] == 1
+    assert stats["misses"] - before["misses"] == 1
+
+    device.project = _label_project(default_project, text="Changed")
+    third, _ = compile_to_esphome_yaml_cached(device, jc1060_recipe_text)
+    assert "Changed" in third
+    device.api_key = "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA="
+    fourth, _ = compile_to_esphome_yaml_cached(device, jc1060_recipe_text)
+    assert "AAAAAAAA" in fourth
+    assert views._COMPILE_CACHE.stats()["misses"] - before["misses"] == 3
+
+
+def test_cache_key_ignores_dict_order(make_device, default_project):
+    """Key is computed from canonical JSON, so key order in the project does not matter."""
+    proj = _label_project(default_project)
+    reordered = dict(reversed(list(proj.items())))
+    a = _CompileCache.key_for(make_device(project=proj), "recipe")
+    b = _CompileCache.key_for(make_device(project=reordered), "recipe")
+    assert a == b
+    assert a != _CompileCache.key_for(make_device(project=proj), "other recipe")
+
+
+def test_cache_is_bounded():
+    """Oldest entries are evicted once max_entries is exceeded."""
+    cache = _CompileCache(max_entries=2)
+    for i in range(3):
+        cache.put(f"k{i}", (f"yaml{i}", []))
+    assert cache.get("k0") is None
+    assert cache.get("k2") == ("yaml2", [])
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+
+
+def _many_widgets_project(default_project, n=300):
+    proj = copy.deepcopy(default_project)
+    proj["pages"][0]["widgets"] = [
+        {"id": f"lbl{i}", "type": "label", "x": i % 20 * 10, "y": i // 20 * 10, "w": 50, "h": 20, "props": {"text": f"L{i}"}, "style": {}}
+        for i in range(n)
+    ]
+    proj["bindings"] = [{"entity_id": "sensor.temp", "kind": "state", "attribute": ""}]
+    proj["links"] = [{
+        "source": {"entity_id": "sensor.temp", "kind": "state", "attribute": ""},
+        "target": {"widget_id": "lbl0", "action": "label_text"},
+    }]
+    return proj
+
+
+def test_geometry_edit_only_regenerates_lvgl(default_project):
+    """Moving a widget misses the whole-map memo but re-runs only the lvgl producer; other sections come from the section memo."""
+    views._SECTION_MEMO.clear()
+    proj = _many_widgets_project(default_project)
+    first = views._build_compiler_sections(proj)
+    before = views._SECTION_MEMO.stats()
+    proj["pages"][0]["widgets"][5]["x"] += 7
+    second = views._build_compiler_sections(proj)
+    after = views._SECTION_MEMO.stats()
+    missed = {name for name in after if after[name]["misses"] != before.get(name, {}).get("misses", 0)}
+    assert missed == {"compiler_sections", "lvgl"}
+    assert second["text_sensor"] == first["text_sensor"]
+    assert second["lvgl"] != first["lvgl"]
+
+
+def test_section_memo_matches_fresh_build(default_project):
+    """Memoized section output equals a build from an empty memo after an edit that changes links."""
+    views._SECTION_MEMO.clear()
+    proj = _many_widgets_project(default_project, n=20)
+    views._build_compiler_sections(proj)
+    proj["links"][0]["target"]["widget_id"] = "lbl1"
+    warm = views._build_compiler_sections(proj)
+    views._SECTION_MEMO.clear()
+    assert views._build_compiler_sections(proj) == warm
+
+
+def test_compiler_sections_shared_between_panel_and_compile(make_device, default_project, jc1060_recipe_text):
+    """Panel data, then a compile of the same project build the compiler sections once; results are fresh dicts."""
+    views._SECTION_MEMO.clear()
+    proj = _many_widgets_project(default_project, n=20)
+    dev = make_device(project=proj, api_key="k" * 44)
+    before = views._SECTION_MEMO.stats()
+    views._build_sections_panel_data_v2(proj, dev, jc1060_recipe_text)
+    compile_to_esphome_yaml(dev, recipe_text=jc1060_recipe_text)
+    after = views._SECTION_MEMO.stats()
+
+    def delta(name, kind):
+        return after[name][kind] - before.get(name, {}).get(kind, 0)
+
+    assert (delta("compiler_sections", "misses"), delta("compiler_sections", "hits")) == (1, 1)
+    assert delta("lvgl", "misses") == 1 and delta("lvgl", "hits") == 0
+    with_key = views._build_compiler_sections(proj, dev)
+    with_key["script"] = "mutated"
+    assert "api" in with_key and "api" not in views._build_compiler_sections(proj)
+    assert views._build_compiler_sections(proj).get("script") != "mutated"
+
+
+def test_recipe_analysis_parsed_once_per_text(make_device, default_project, jc1060_recipe_text, monkeypatch):
+    """Compiles of different projects on one recipe split it into sections once; results are copies."""
+    analysis = views._RecipeAnalysis()
+    monkeypatch.setattr(views, "_RECIPE_ANALYSIS", analysis)
+    parses = []
+    real_parse = views._parse_recipe_into_sections
+    monkeypatch.setattr(views, "_parse_recipe_into_sections", lambda text: parses.append(1) or real_parse(text))
+    views._SECTION_MEMO.clear()
+    for text in ("One", "Two", "Three"):
+        compile_to_esphome_yaml(make_device(project=_label_project(default_project, text)), recipe_text=jc1060_recipe_text)
+    assert len(parses) == 1
+    assert analysis.stats()["entries"] == 1 and analysis.stats()["hits"] > 0
+
+    sections = analysis.sections(jc1060_recipe_text)
+    sections.clear()
+    assert analysis.sections(jc1060_recipe_text)
+    assert analysis.resolution(jc1060_recipe_text, "jc1060p470_esp32p4_1024x600") == {"width": 1024, "height": 600}
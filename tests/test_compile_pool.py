@@ -0,0 +1,102 @@
+"""
+Compile worker pool: compiles run in worker threads, at most one per device, newer preview
+compiles supersede older ones (which answer with the newest result), and queue metrics.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from custom_components.esphome_touch_designer.api.views import (
+    _COMPILE_CACHE,
+    _ACTIVE_PROFILE,
+    _CompilePool,
+    _compile_for_view,
+    _profiled,
+    compile_to_esphome_yaml_cached,
+)
+
+
+@_profiled("test_stage")
+def _stage(value):
+    return value
+
+
+def test_run_uses_worker_threads_and_device_limit():
+    """Same-device compiles are serialised, different devices overlap; the caller's context reaches the worker."""
+    pool = _CompilePool(max_workers=4, per_device=1)
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def work(key):
+        with lock:
+            active[key] = active.get(key, 0) + 1
+            peak[key] = max(peak.get(key, 0), active[key])
+        time.sleep(0.02)
+        with lock:
+            active[key] -= 1
+        return threading.current_thread().name, _ACTIVE_PROFILE.get()
+
+    async def main():
+        token = _ACTIVE_PROFILE.set("marker")
+        try:
+            return await asyncio.gather(*(pool.run(k, work, k) for k in ("a", "a", "a", "b", "b")))
+        finally:
+            _ACTIVE_PROFILE.reset(token)
+
+    results = asyncio.run(main())
+    assert all(name.startswith("etd_compile") and ctx == "marker" for name, ctx in results)
+    assert peak == {"a": 1, "b": 1}
+    stats = pool.stats()
+    assert stats["submitted"] == stats["completed"] == 5
+    assert stats["max_depth"] >= 3 and stats["queue_depth"] == 0
+    pool.shutdown()
+
+
+def test_preview_supersedes_older_requests():
+    """A running preview stops at its next stage and a queued one never starts; both return the newest result."""
+    pool = _CompilePool(max_workers=2, per_device=1)
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[str] = []
+
+    def slow(value):
+        calls.append(value)
+        started.set()
+        release.wait(5)
+        return _stage(value)
+
+    def fast(value):
+        calls.append(value)
+        return _stage(value)
+
+    async def main():
+        first = asyncio.create_task(pool.run_preview("dev", slow, "v1"))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        second = asyncio.create_task(pool.run_preview("dev", fast, "v2"))
+        await asyncio.sleep(0)
+        third = asyncio.create_task(pool.run_preview("dev", fast, "v3"))
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(first, second, third)
+
+    results = asyncio.run(main())
+    assert results == [("v3", True), ("v3", True), ("v3", False)]
+    assert calls == ["v1", "v3"]
+    stats = pool.stats()
+    assert stats["superseded"] == 2 and stats["completed"] == 1
+    pool.shutdown()
+
+
+def test_pool_compile_matches_inline(make_device, default_project):
+    """A compile through the pool returns the same YAML and warnings as the inline cached compile."""
+    _COMPILE_CACHE.clear()
+    dev = make_device(project=default_project)
+    expected = compile_to_esphome_yaml_cached(dev, "")
+    pool = _CompilePool()
+    (yaml_text, warnings, profile), superseded = asyncio.run(pool.run_preview(dev.device_id, _compile_for_view, dev, ""))
+    assert (yaml_text, warnings) == expected
+    assert profile is None and not superseded
+    pool.shutdown()
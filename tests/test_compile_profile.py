@@ -0,0 +1,102 @@
+"""
+Opt-in compile profiling: per-stage timings, call counts and allocated bytes, the rolling
+histogram reported by DiagnosticsView, and the ?profile=1 / options toggle (memory tracing
+only for ?profile=1, one traced compile at a time).
+"""
+from __future__ import annotations
+
+import threading
+import tracemalloc
+from types import SimpleNamespace
+
+from custom_components.esphome_touch_designer.api.views import (
+    _ACTIVE_PROFILE,
+    _COMPILE_CACHE,
+    _PROFILE_HISTORY,
+    _RECIPE_ANALYSIS,
+    _SECTION_MEMO,
+    _TRACE_MEMORY_LOCK,
+    _compile_profiling_requested,
+    compile_to_esphome_yaml,
+    compile_to_esphome_yaml_cached,
+    compile_to_esphome_yaml_profiled,
+)
+from custom_components.esphome_touch_designer.const import CONF_COMPILE_PROFILING
+from tests.fixtures.synthetic_projects import build_synthetic_project
+
+
+def test_profiled_compile_matches_and_reports_stages(make_device, jc1060_recipe_text):
+    """Profiled YAML equals the plain compile; stages carry time, calls and bytes; memo hits are counted."""
+    _SECTION_MEMO.clear()
+    _COMPILE_CACHE.clear()
+    _PROFILE_HISTORY.clear()
+    dev = make_device(project=build_synthetic_project(40), recipe_id="jc1060p470_esp32p4_1024x600", slug="prof")
+    expected, _ = compile_to_esphome_yaml_cached(dev, jc1060_recipe_text)
+    _COMPILE_CACHE.clear()
+    _SECTION_MEMO.clear()
+    _RECIPE_ANALYSIS.clear()
+
+    yaml_text, warnings, profile = compile_to_esphome_yaml_profiled(dev, jc1060_recipe_text, trace_memory=True)
+    assert yaml_text == expected
+    assert profile["memory_traced"] and not tracemalloc.is_tracing()
+    assert warnings == []
+    stages = profile["stages"]
+    for name in ("compile", "sections", "lvgl_pages", "ha_bindings", "section_merge", "recipe_parse", "index"):
+        assert stages[name]["calls"] >= 1, name
+        assert stages[name]["ms"] >= 0
+    assert stages["lvgl_pages"]["alloc_bytes"] > 0
+    assert stages["sections"]["ms"] >= stages["lvgl_pages"]["ms"]
+    assert profile["counters"]["memo_miss:lvgl"] == 1
+    assert profile["counters"]["memo_miss:recipe"] >= 1
+
+    _, _, again = compile_to_esphome_yaml_profiled(dev, jc1060_recipe_text)
+    assert not again["memory_traced"] and again["peak_bytes"] == 0
+    assert all(st["alloc_bytes"] == 0 for st in again["stages"].values())
+    assert again["counters"]["memo_hit:compiler_sections"] == 1
+    assert "memo_hit:lvgl" not in again["counters"]
+    assert "memo_miss:recipe" not in again["counters"]
+    assert "lvgl_pages" not in again["stages"] and "recipe_parse" not in again["stages"]
+    assert _ACTIVE_PROFILE.get() is None
+
+
+def test_profile_history_histogram(make_device, jc1060_recipe_text):
+    """Each profiled compile lands in the rolling window; plain compiles are not recorded."""
+    _PROFILE_HISTORY.clear()
+    dev = make_device(project=build_synthetic_project(10), recipe_id="jc1060p470_esp32p4_1024x600", slug="hist")
+    compile_to_esphome_yaml(dev, recipe_text=jc1060_recipe_text)
+    assert _PROFILE_HISTORY.stats()["profiles"] == 0
+    for _ in range(3):
+        compile_to_esphome_yaml_profiled(dev, jc1060_recipe_text)
+    stats = _PROFILE_HISTORY.stats()
+    assert stats["profiles"] == 3
+    total = stats["stages"]["total"]
+    assert total["count"] == 3
+    assert sum(total["histogram"]) == 3
+    assert len(total["histogram"]) == len(stats["buckets_ms"]) + 1
+    assert total["p50_ms"] <= total["max_ms"]
+
+
+def test_profiling_requested_by_query_or_option():
+    """?profile=1 turns profiling on for one request; the options toggle turns it on for all."""
+    entry = SimpleNamespace(options={})
+    hass = SimpleNamespace(config_entries=SimpleNamespace(async_get_entry=lambda eid: entry))
+    assert _compile_profiling_requested(SimpleNamespace(query={}), hass, "e1") is None
+    assert _compile_profiling_requested(SimpleNamespace(query={"profile": "1"}), hass, "e1") == "request"
+    entry.options = {CONF_COMPILE_PROFILING: True}
+    assert _compile_profiling_requested(SimpleNamespace(query={}), hass, "e1") == "option"
+    assert _compile_profiling_requested(SimpleNamespace(query={"profile": "yes"}), hass, "e1") == "request"
+
+
+def test_memory_traced_compiles_are_serialized(make_device, jc1060_recipe_text):
+    """A traced compile waits for the trace lock; untraced profiled compiles never take it."""
+    dev = make_device(project=build_synthetic_project(5), recipe_id="jc1060p470_esp32p4_1024x600", slug="lock")
+    done = threading.Event()
+    with _TRACE_MEMORY_LOCK:
+        compile_to_esphome_yaml_profiled(dev, jc1060_recipe_text)
+        worker = threading.Thread(
+            target=lambda: (compile_to_esphome_yaml_profiled(dev, jc1060_recipe_text, trace_memory=True), done.set())
+        )
+        worker.start()
+        assert not done.wait(0.2)
+    worker.join(10)
+    assert done.is_set() and not tracemalloc.is_tracing()
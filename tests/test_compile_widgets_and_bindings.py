@@ -204,3 +204,16 @@ def test_compile_checkbox(jc1060_recipe_text, make_device):
     out = compile_to_esphome_yaml(dev, recipe_text=jc1060_recipe_text)
     assert "- checkbox:" in out or "checkbox:" in out
     assert "id: ch1" in out
+
+
+def test_compile_asset_font_resolved_at_emission(jc1060_recipe_text, make_device):
+    """style.text_font "asset:<file>:<size>" is declared under font: and emitted as the generated id; project is untouched."""
+    widget = _minimal_widget("l1", "label", props={"text": "Hi"})
+    widget["style"] = {"text_font": "asset:Roboto.ttf:24"}
+    proj = _minimal_project_with_widget(widget)
+    dev = make_device(project=proj, recipe_id="jc1060p470_esp32p4_1024x600", slug="t")
+    out = compile_to_esphome_yaml(dev, recipe_text=jc1060_recipe_text)
+    assert "id: font_Roboto_24_1" in out
+    assert 'text_font: "font_Roboto_24_1"' in out
+    assert "asset:Roboto.ttf" not in out
+    assert proj["pages"][0]["widgets"][0]["style"]["text_font"] == "asset:Roboto.ttf:24"
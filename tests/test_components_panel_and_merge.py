@@ -3,6 +3,7 @@ Components panel and section merge: section_overrides ignored, list sections mer
 """
 from __future__ import annotations
 
+import copy
 import re
 import yaml
 from pathlib import Path
@@ -15,6 +16,8 @@ from custom_components.esphome_touch_designer.api.views import (
     _compile_to_esphome_yaml_section_based,
     _collect_widget_ids_from_project,
     _ensure_project_sections,
+    _list_item_key,
+    _merge_list_section_bodies,
     _normalize_section_body_indent,
     _parse_recipe_into_sections,
     _remove_orphaned_widget_refs_from_sections,
@@ -290,3 +293,109 @@ def test_list_section_deduplication_no_duplicate_blocks(default_project):
     assert out.count("platform: monochromatic") == 1, "light section must not duplicate monochromatic block"
     assert out.count('name: "Relay 1"') == 1, "switch section must not duplicate Relay 1 block"
     assert out.count("output: internal_relay_1") == 1, "switch section must not duplicate internal_relay_1 block"
+
+
+def test_list_merge_keys_items_and_keeps_user_edits():
+    """A user copy of a compiler item (same platform/id) keeps its own text and gains the compiler's keys it lacks;
+    nested ids do not count as the item's key; keyless items dedupe on normalized text."""
+    auto = (
+        "  - platform: homeassistant\n    id: ha_temp\n    entity_id: sensor.temp\n"
+        "    on_value:\n      then:\n        - lvgl.label.update:\n            id: lbl_1\n"
+        "  - platform: wifi_signal\n    name: WiFi\n"
+        "  - platform: uptime\n    id: up"
+    )
+    user = (
+        "- platform: homeassistant\n    id: \"ha_temp\"\n    entity_id: sensor.temp\n    filters:\n      - round: 1  # user\n"
+        "  - platform:   wifi_signal\n    name: WiFi\n"
+        "  - platform: template\n    id: mine"
+    )
+    assert _list_item_key(auto.split("\n  - platform: wifi")[0]) == ("homeassistant", "ha_temp", None)
+    assert _list_item_key("  - platform: wifi_signal\n    name: WiFi") is None
+    merged = _merge_list_section_bodies(auto, user)
+    items = merged.split("\n\n")
+    assert [i.splitlines()[0] for i in items] == [
+        "  - platform: homeassistant", "  - platform:   wifi_signal", "  - platform: uptime", "  - platform: template",
+    ]
+    assert "round: 1  # user" in items[0] and "lvgl.label.update" in items[0] and 'id: "ha_temp"' in items[0]
+    assert merged.count("wifi_signal") == 1
+    first = yaml.safe_load("sensor:\n" + merged)["sensor"][0]
+    assert first["filters"] == [{"round": 1}] and first["on_value"]["then"][0]["lvgl.label.update"]["id"] == "lbl_1"
+
+
+def test_list_merge_keeps_user_changes_to_compiler_keys():
+    """A user's on_value and attribute on a compiler item are kept; compiler actions the user lacks are appended."""
+    auto = (
+        "  - platform: homeassistant\n    id: ha_t\n    entity_id: climate.x\n    attribute: temperature\n"
+        "    on_value:\n      then:\n        - lvgl.label.update:\n            id: l1\n"
+        "        - lvgl.label.update:\n            id: l2"
+    )
+    user = (
+        "  - platform: homeassistant\n    id: ha_t\n    entity_id: climate.x\n    attribute: current_temperature\n"
+        "    on_value:\n      then:\n      - logger.log: changed\n"
+        "      - lvgl.label.update:\n          id: l1"
+    )
+    item = yaml.safe_load("sensor:\n" + _merge_list_section_bodies(auto, user))["sensor"][0]
+    assert item["attribute"] == "current_temperature"
+    assert item["on_value"]["then"] == [
+        {"logger.log": "changed"}, {"lvgl.label.update": {"id": "l1"}}, {"lvgl.label.update": {"id": "l2"}},
+    ]
+    inline = user.split("    on_value:")[0] + "    on_value: !lambda return;"
+    assert "on_value: !lambda return;" in _merge_list_section_bodies(auto, inline)
+
+
+def test_list_merge_keeps_id_less_items_on_one_entity():
+    """Items without an id are not keyed by entity_id: two attributes of one entity both survive."""
+    user = (
+        "  - platform: homeassistant\n    entity_id: climate.x\n    attribute: current_temperature\n"
+        "  - platform: homeassistant\n    entity_id: climate.x\n    attribute: temperature"
+    )
+    assert _list_item_key(user.split("\n  - ")[0]) is None
+    for merged in (_merge_list_section_bodies("", user), _merge_list_section_bodies(user, user)):
+        parsed = yaml.safe_load("sensor:\n" + merged)["sensor"]
+        assert [p["attribute"] for p in parsed] == ["current_temperature", "temperature"]
+
+
+def test_saved_panel_keeps_later_compiler_changes(make_device, default_project, jc1060_recipe_text):
+    """Saving the panel stores the compiler's sensor item; a binding added afterwards still reaches the compile."""
+    from custom_components.esphome_touch_designer.api.views import _build_sections_panel_data_v2, _sections_to_yaml
+
+    project = copy.deepcopy(default_project)
+    project["pages"][0]["widgets"] = [
+        {"id": wid, "type": "label", "x": 0, "y": i * 40, "w": 100, "h": 30, "props": {"text": "-"}, "style": {}}
+        for i, wid in enumerate(("l1", "l2"))
+    ]
+
+    def link(wid):
+        return {"source": {"entity_id": "sensor.temp", "kind": "state", "attribute": ""},
+                "target": {"widget_id": wid, "action": "label_text"}}
+
+    project["bindings"] = [{"entity_id": "sensor.temp", "kind": "state", "attribute": ""}]
+    project["links"] = [link("l1")]
+    dev = make_device(project=project, recipe_id="jc1060p470_esp32p4_1024x600")
+    panel = _build_sections_panel_data_v2(project, dev, jc1060_recipe_text)
+    assert "lvgl.label.update" in panel["sections"]["text_sensor"]
+    # What SectionsSaveView stores: the panel's sections over the recipe defaults, with a filter added by the user
+    saved = {k: panel["sections"][k] or panel["default_sections"][k] for k in panel["sections"]}
+    saved = {k: v for k, v in saved.items() if v}
+    saved["text_sensor"] = saved["text_sensor"].replace("entity_id: sensor.temp", "entity_id: sensor.temp\n    filters:\n      - lambda: return x;", 1)
+    project["esphome_yaml"] = _sections_to_yaml(saved)
+
+    project["links"].append(link("l2"))
+    out = _compile_to_esphome_yaml_section_based(dev, jc1060_recipe_text)
+    body = _section_body_from_value(_parse_recipe_into_sections(out)["text_sensor"], "text_sensor")
+    sensors = [s for s in yaml.safe_load("text_sensor:\n" + body)["text_sensor"] if s.get("entity_id") == "sensor.temp"]
+    assert len(sensors) == 1
+    updates = yaml.dump(sensors[0]["on_value"])
+    assert "l1" in updates and "l2" in updates
+    assert sensors[0]["filters"] == [{"lambda": "return x;"}]
+
+
+def test_list_merge_large_sections():
+    """Hundreds of items merge with one copy per key, auto order kept and new user items appended."""
+    auto = "\n".join(f"  - platform: homeassistant\n    id: s{i}\n    entity_id: sensor.s{i}" for i in range(600))
+    user = "\n".join(f"  - platform: homeassistant\n    id: s{i}\n    entity_id: sensor.s{i}\n    internal: true" for i in range(300, 900))
+    merged = _merge_list_section_bodies(auto, user)
+    parsed = yaml.safe_load("sensor:\n" + merged)["sensor"]
+    assert [p["id"] for p in parsed] == [f"s{i}" for i in range(900)]
+    assert sum(1 for p in parsed if p.get("internal")) == 600
+
@@ -12,7 +12,9 @@ from custom_components.esphome_touch_designer.api.views import (
     _parse_recipe_into_sections,
     _build_default_section_pieces,
     _compile_to_esphome_yaml_section_based,
+    _merge_section_document,
     ETD_DEVICE_NAME_PLACEHOLDER,
+    SectionDocument,
 )
 from custom_components.esphome_touch_designer.storage import DeviceProject, _default_project
 
@@ -38,6 +40,22 @@ def test_section_helpers():
     assert _section_body_from_value("  name: only", "esphome") == "  name: only"
 
 
+
+def test_section_document_bodies_and_render():
+    """Bodies are stored as a full-block round trip leaves them; render emits SECTION_ORDER once; merge takes the user's body."""
+    doc = SectionDocument()
+    for body in ("  a: 1\n\n", "\n  a: 1\r\n  b: 2  ", "  t: x\u2028y", ""):
+        doc.set("logger", body)
+        assert doc.get("logger") == _section_body_from_value(_section_full_block("logger", body), "logger")
+    doc.set("logger", "  level: DEBUG")
+    doc.set("esphome", "  name: " + ETD_DEVICE_NAME_PLACEHOLDER)
+    doc.substitute(ETD_DEVICE_NAME_PLACEHOLDER, '"dev"')
+    assert doc.render("---\n") == '---\nesphome:\n  name: "dev"\n\nlogger:\n  level: DEBUG\n'
+    assert doc.blocks()["logger"] == "logger:\n  level: DEBUG"
+
+    merged = _merge_section_document(doc, {"logger": "  level: INFO\n"}, {})
+    assert merged.get("logger") == "  level: INFO" and merged.get("esphome") == '  name: "dev"'
+
 def test_recipe_parse_and_full_block(jc1060_recipe_text):
     """Parse real recipe; esphome section becomes valid full block."""
     sections = _parse_recipe_into_sections(jc1060_recipe_text)
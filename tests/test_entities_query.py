@@ -0,0 +1,94 @@
+"""
+EntitiesView queries: domain/text filtering, field projection without attributes by default,
+entity_id cursor pagination, and ETags that change only when a listed entity does and that
+skip serializing the page when If-None-Match matches.
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.esphome_touch_designer.api import views as V
+from custom_components.esphome_touch_designer.api.views import (
+    ENTITY_DEFAULT_FIELDS,
+    _entity_item,
+    _etag_matches,
+    _query_entities,
+)
+
+
+def _st(eid, state="on", updated="t0", **attrs):
+    return SimpleNamespace(entity_id=eid, state=state, attributes=attrs, last_updated=updated)
+
+
+STATES = [
+    _st("sensor.kitchen_temp", "21", friendly_name="Kitchen Temperature", device_class="temperature"),
+    _st("light.kitchen", friendly_name="Kitchen Ceiling"),
+    _st("light.bedroom", friendly_name="Bedroom"),
+    _st("switch.kettle", "off", friendly_name="Kettle"),
+    _st("light.hall", friendly_name="Hallway"),
+]
+
+
+def test_filter_and_projection():
+    """domain and q narrow the list; attributes appear only when requested in fields."""
+    result, _ = _query_entities(STATES, {"domain": "light,switch", "q": "kitchen"})
+    assert result == {
+        "items": [_entity_item(STATES[1], ENTITY_DEFAULT_FIELDS)], "total": 1, "next_cursor": None,
+    }
+    assert "attributes" not in result["items"][0]
+
+    result, _ = _query_entities(STATES, {"q": "KITCHEN", "fields": "state,attributes,bogus"})
+    assert result["items"] == [
+        {"entity_id": "light.kitchen", "state": "on", "attributes": {"friendly_name": "Kitchen Ceiling"}},
+        {"entity_id": "sensor.kitchen_temp", "state": "21", "attributes": STATES[0].attributes},
+    ]
+    assert list(_entity_item(STATES[0])) == [
+        "entity_id", "state", "attributes", "friendly_name", "icon", "device_class", "unit_of_measurement",
+    ]
+
+
+def test_cursor_pagination():
+    """Pages follow entity_id order; the cursor resumes after the last id even if it was removed."""
+    seen, cursor = [], None
+    while True:
+        query = {"limit": "2"} if cursor is None else {"limit": "2", "cursor": cursor}
+        result, _ = _query_entities(STATES, query)
+        assert result["total"] == 5
+        seen += [i["entity_id"] for i in result["items"]]
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == sorted(s.entity_id for s in STATES)
+
+    result, _ = _query_entities([s for s in STATES if s.entity_id != "light.hall"], {"cursor": "light.hall"})
+    assert [i["entity_id"] for i in result["items"]] == ["light.kitchen", "sensor.kitchen_temp", "switch.kettle"]
+    with pytest.raises(ValueError):
+        _query_entities(STATES, {"limit": "many"})
+
+
+def test_etag_tracks_listed_entities():
+    """The ETag is stable for an unchanged page and changes with a listed entity or the query."""
+    _, etag = _query_entities(STATES, {"domain": "light"})
+    assert _query_entities(list(reversed(STATES)), {"domain": "light"})[1] == etag
+    assert _query_entities(STATES, {"domain": "light", "fields": "attributes"})[1] != etag
+    changed = [_st("light.hall", "off", "t1") if s.entity_id == "light.hall" else s for s in STATES]
+    assert _query_entities(changed, {"domain": "light"})[1] != etag
+    other = [_st("switch.kettle", "on", "t1") if s.entity_id == "switch.kettle" else s for s in STATES]
+    assert _query_entities(other, {"domain": "light"})[1] == etag
+
+    assert _etag_matches(f'W/{etag}, "other"', etag)
+    assert _etag_matches("*", etag)
+    assert not _etag_matches(None, etag) and not _etag_matches('"other"', etag)
+
+
+def test_matching_etag_skips_serialization(monkeypatch):
+    """A matching If-None-Match returns no result and never builds page items."""
+    _, etag = _query_entities(STATES, {"domain": "light", "fields": "attributes"})
+
+    def _no_items(*_args, **_kwargs):
+        raise AssertionError("page serialized for a matching ETag")
+
+    monkeypatch.setattr(V, "_entity_item", _no_items)
+    assert _query_entities(STATES, {"domain": "light", "fields": "attributes"}, f'"x", {etag}') == (None, etag)
@@ -0,0 +1,100 @@
+"""
+Entity search index: exact/prefix/infix/fuzzy word matching over entity_id, friendly_name, area
+and device_class, top-k ranking, and updates from state_changed and registry events.
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from custom_components.esphome_touch_designer.api import views as V
+
+
+def _index():
+    idx = V._EntitySearchIndex()
+    idx.upsert("sensor.kitchen_temperature", "Kitchen Temperature", "Kitchen", "temperature")
+    idx.upsert("light.kitchen", "Kitchen Ceiling", "Kitchen")
+    idx.upsert("light.shed", "Shed Light", "Garden")
+    idx.upsert("sensor.shed_humidity", "Shed Humidity", "Garden", "humidity")
+    idx.upsert("switch.kettle", "Kettle", "Kitchen")
+    return idx
+
+
+def _ids(results):
+    return [r["entity_id"] for r in results]
+
+
+def test_prefix_token_and_fuzzy_matching():
+    """Every word must match; prefix, area, device_class and one-typo words all find entities."""
+    idx = _index()
+    assert _ids(idx.search("kitchen temp")) == ["sensor.kitchen_temperature"]
+    assert _ids(idx.search("garden")) == ["light.shed", "sensor.shed_humidity"]
+    assert _ids(idx.search("humidity")) == ["sensor.shed_humidity"]
+    assert _ids(idx.search("temprature")) == ["sensor.kitchen_temperature"]
+    assert _ids(idx.search("shed", domain="light")) == ["light.shed"]
+    assert "sensor.kitchen_temperature" in _ids(idx.search("perat"))
+    assert idx.search("shed kettle") == [] and idx.search("  ") == []
+
+
+def test_ranking_and_limit():
+    """Exact words beat prefixes, entities whose id or name starts with the query get a boost."""
+    idx = _index()
+    results = idx.search("kitchen")
+    assert _ids(results)[0] == "light.kitchen"
+    assert {"sensor.kitchen_temperature", "switch.kettle"} <= set(_ids(results))
+    assert results[0] == {"entity_id": "light.kitchen", "name": "Kitchen Ceiling", "area": "Kitchen",
+                          "device_class": None, "score": 4.0}
+    assert _ids(idx.search("kitchen", limit=1)) == ["light.kitchen"]
+
+
+def test_updates_and_removal():
+    """Renames re-index only changed words; removed entities and their words disappear."""
+    idx = _index()
+    idx.upsert("light.shed", "Workshop Lamp", "Garden")
+    assert _ids(idx.search("workshop")) == ["light.shed"]
+    assert _ids(idx.search("shed light")) == ["light.shed"]  # still matches via entity_id words
+    updates = idx.updates
+    idx.upsert("light.shed", "Workshop Lamp", "Garden")
+    assert idx.updates == updates
+    idx.remove("light.shed")
+    assert idx.search("workshop") == [] and len(idx) == 4
+    assert "workshop" not in idx._postings and all("workshop" not in t for t in idx._fuzzy.values())
+
+
+def test_attach_follows_state_and_registry_events(monkeypatch):
+    """The hass feed indexes states with registry areas and follows state/registry updates."""
+    areas = {"a1": SimpleNamespace(name="Kitchen"), "a2": SimpleNamespace(name="Pantry")}
+    devices = {"dev1": SimpleNamespace(area_id="a1")}
+    entries = {"light.counter": SimpleNamespace(entity_id="light.counter", area_id=None, device_id="dev1")}
+    ent_reg = SimpleNamespace(entities=entries, async_get=entries.get)
+    monkeypatch.setattr(V, "er", SimpleNamespace(
+        async_get=lambda hass: ent_reg,
+        async_entries_for_device=lambda reg, device_id: [e for e in entries.values() if e.device_id == device_id],
+    ))
+    monkeypatch.setattr(V, "dr", SimpleNamespace(async_get=lambda hass: SimpleNamespace(async_get=devices.get)))
+    monkeypatch.setattr(V, "ar", SimpleNamespace(async_get=lambda hass: SimpleNamespace(async_get_area=areas.get)))
+
+    states = {"light.counter": SimpleNamespace(entity_id="light.counter", state="on", attributes={"friendly_name": "Counter"})}
+    listeners = {}
+    hass = SimpleNamespace(
+        data={},
+        states=SimpleNamespace(get=states.get, async_all=lambda: list(states.values())),
+        bus=SimpleNamespace(async_listen=lambda name, cb: listeners.setdefault(name, cb) and (lambda: listeners.pop(name))),
+    )
+    idx = V._entity_index(hass)
+    assert V._entity_index(hass) is idx
+    assert idx.search("kitchen counter")[0]["area"] == "Kitchen"
+
+    new = SimpleNamespace(entity_id="sensor.fridge", state="4", attributes={"friendly_name": "Fridge", "device_class": "temperature"})
+    states["sensor.fridge"] = new
+    listeners["state_changed"](SimpleNamespace(data={"entity_id": "sensor.fridge", "new_state": new}))
+    assert _ids(idx.search("fridge temp")) == ["sensor.fridge"]
+
+    entries["light.counter"].area_id = "a2"
+    listeners["entity_registry_updated"](SimpleNamespace(data={"action": "update", "entity_id": "light.counter"}))
+    assert _ids(idx.search("pantry")) == ["light.counter"] and idx.search("kitchen") == []
+
+    listeners["state_changed"](SimpleNamespace(data={"entity_id": "sensor.fridge", "new_state": None}))
+    assert idx.search("fridge") == []
+
+    V.shutdown_entity_index(hass)
+    assert listeners == {} and "entity_index" not in hass.data
@@ -0,0 +1,97 @@
+"""
+Fleet compile: every device compiled on the compile pool with one result per device (hash, warnings,
+duration), a bounded number of devices loaded at a time, optional safe-merge export that skips
+unchanged files and reports corrupt marker blocks.
+"""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from custom_components.esphome_touch_designer.api import views as V
+from custom_components.esphome_touch_designer.api.views import (
+    EXPORT_BEGIN_MARKER,
+    EXPORT_END_MARKER,
+    RECIPES_BUILTIN_DIR,
+    _COMPILE_CACHE,
+    _iter_fleet_compile,
+    compile_to_esphome_yaml_cached,
+    sha256,
+)
+
+
+class _FakeStorage:
+    def __init__(self, devices):
+        self.devices = {d.device_id: d for d in devices}
+        self.loads = 0
+
+    def list_devices(self):
+        return [SimpleNamespace(device_id=d) for d in self.devices]
+
+    async def async_get_device(self, device_id):
+        self.loads += 1
+        return self.devices.get(device_id)
+
+
+def _run(hass, storage, **kwargs):
+    async def main():
+        return [r async for r in _iter_fleet_compile(hass, storage, **kwargs)]
+
+    return {r["device_id"]: r for r in asyncio.run(main())}
+
+
+def test_fleet_compile_results(tmp_path, fake_hass, make_device):
+    """Each device yields one ok result whose hash matches a direct compile; unknown ids report not found."""
+    _COMPILE_CACHE.clear()
+    devices = [make_device(device_id=f"d{i}", slug=f"panel_{i}", recipe_id="jc1060p470_esp32p4_1024x600") for i in range(3)]
+    hass = fake_hass
+    results = _run(hass, _FakeStorage(devices), device_ids=["d0", "d1", "d2", "gone"])
+    assert results["gone"] == {"device_id": "gone", "ok": False, "error": "device_not_found"}
+    recipe_text = (RECIPES_BUILTIN_DIR / "jc1060p470_esp32p4_1024x600.yaml").read_text("utf-8")
+    for dev in devices:
+        r = results[dev.device_id]
+        yaml_text, warnings = compile_to_esphome_yaml_cached(dev, recipe_text)
+        assert r["ok"] and r["slug"] == dev.slug and r["yaml_hash"] == sha256(yaml_text)
+        assert r["warnings"] == warnings and r["duration_ms"] >= 0 and "export" not in r
+    assert not (tmp_path / "esphome").exists()
+
+
+def test_fleet_compile_loads_a_bounded_number_of_devices(fake_hass, make_device, monkeypatch):
+    """Devices are loaded only when a slot is free: loaded-but-unfinished devices never exceed the concurrency."""
+    storage = _FakeStorage([make_device(device_id=f"d{i}", slug=f"panel_{i}") for i in range(6)])
+    done, resident = [0], []
+    compile_device = V._fleet_compile_device
+
+    def tracked(device, recipe_text, esphome_dir):
+        resident.append(storage.loads - done[0])
+        try:
+            return compile_device(device, recipe_text, esphome_dir)
+        finally:
+            done[0] += 1
+
+    monkeypatch.setattr(V, "_fleet_compile_device", tracked)
+    results = _run(fake_hass, storage, concurrency=2)
+    assert len(results) == 6 and all(r["ok"] for r in results.values())
+    assert storage.loads == 6 and max(resident) <= 2
+
+
+def test_fleet_compile_writes_changed_files_only(tmp_path, fake_hass, make_device):
+    """write=True safe-merges each file, leaves unchanged files alone and reports a corrupt marker block."""
+    devices = [make_device(device_id="a", slug="panel_a"), make_device(device_id="b", slug="panel_b")]
+    hass = fake_hass
+    esphome_dir = tmp_path / "esphome"
+    esphome_dir.mkdir()
+    (esphome_dir / "panel_b.yaml").write_text(f"{EXPORT_END_MARKER}\nbroken\n{EXPORT_BEGIN_MARKER}\n", encoding="utf-8")
+
+    first = _run(hass, _FakeStorage(devices), write=True)
+    assert first["a"]["export"]["changed"] and first["a"]["export"]["mode"] == "new"
+    assert (esphome_dir / "panel_a.yaml").read_text("utf-8").startswith(EXPORT_BEGIN_MARKER)
+    assert first["b"]["ok"] and first["b"]["export"]["error"] == "marker_corrupt"
+
+    _run(hass, _FakeStorage(devices), device_ids=["a"], write=True)  # first merge into the marker block
+    text = (esphome_dir / "panel_a.yaml").read_text("utf-8")
+    mtime = (esphome_dir / "panel_a.yaml").stat().st_mtime_ns
+    again = _run(hass, _FakeStorage(devices), device_ids=["a"], write=True)
+    assert again["a"]["export"]["changed"] is False and again["a"]["export"]["mode"] == "merged"
+    assert again["a"]["export"]["hash"] == sha256(text)
+    assert (esphome_dir / "panel_a.yaml").stat().st_mtime_ns == mtime
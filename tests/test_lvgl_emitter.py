@@ -0,0 +1,68 @@
+"""
+LVGL pages emitter: widgets are written straight into one buffer at their final indent, matching
+the old emit-at-8/12-spaces-then-re-indent output; section bodies are sliced without re-splitting.
+"""
+from __future__ import annotations
+
+from custom_components.esphome_touch_designer.api.views import (
+    _compile_lvgl_pages_schema_driven,
+    _emit_widget_from_schema,
+    _load_widget_schema,
+    _section_body_from_value,
+)
+
+
+def _reindent(raw: str, indent: str) -> str:
+    """The per-widget re-indent the pages compiler used before emitting at the final indent."""
+    out = []
+    for ln in raw.splitlines(True):
+        if ln.startswith("            "):
+            out.append(indent + "    " + ln[12:])
+        elif ln.startswith("        "):
+            out.append(indent + ln[8:])
+        else:
+            out.append(indent + ln)
+    return "".join(out)
+
+
+def test_buffer_emit_matches_reindented_string():
+    """Emitting into a buffer at any indent equals the default 8/12-space string re-indented."""
+    widget = {
+        "id": "b1", "type": "button", "x": 10, "y": 20, "w": 100, "h": 40,
+        "props": {"text": "Go"},
+        "events": {"on_click": "then:\n  - logger.log: hi\n  - delay: 50ms"},
+    }
+    schema = _load_widget_schema("button")
+    raw = _emit_widget_from_schema(widget, schema)
+    assert raw.startswith("        - button:\n            id: b1\n")
+    for indent in ("      ", "              "):
+        buf = ["head\n"]
+        assert _emit_widget_from_schema(widget, schema, indent=indent, out=buf) == ""
+        assert buf[0] == "head\n"
+        assert "".join(buf[1:]) == _reindent(raw, indent)
+
+
+def test_nested_and_arc_labeled_indent():
+    """Children nest 6 in from their parent; an arc_labeled arc keeps its keys 2 in from its list item."""
+    project = {
+        "pages": [{"page_id": "main", "widgets": [
+            {"id": "c1", "type": "container", "x": 0, "y": 0, "w": 200, "h": 200},
+            {"id": "l1", "type": "label", "x": 5, "y": 5, "w": 50, "h": 20, "parent_id": "c1", "props": {"text": "Hi"}},
+            {"id": "g1", "type": "arc_labeled", "x": 0, "y": 0, "w": 100, "h": 100, "props": {"min_value": 0, "max_value": 4}},
+        ]}],
+    }
+    out = _compile_lvgl_pages_schema_driven(project)
+    assert "        - container:\n            id: c1\n" in out
+    assert "            widgets:\n              - label:\n                  id: l1\n" in out
+    assert "            widgets:\n              - arc:\n                id: g1\n" in out
+
+
+def test_section_body_slice_matches_split():
+    """The sliced body equals the split/re-join result, including text with other line breaks."""
+    def split_body(value: str, key: str) -> str:
+        lines = value.strip().splitlines()
+        return "\n".join(lines[1:]).rstrip() if len(lines) > 1 else ""
+
+    for value in ("lvgl:\n  pages:\n    - id: main\n\n", "lvgl:", "lvgl: # x\n\n  a: 1", "lvgl:\r\n  a: 1\r\n  b: 2", "lvgl:\n  t: \"a\u2028b\""):
+        assert _section_body_from_value(value, "lvgl") == split_body(value, "lvgl"), repr(value)
+    assert _section_body_from_value("  a: 1\n", "lvgl") == "  a: 1\n"
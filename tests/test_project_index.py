@@ -0,0 +1,80 @@
+"""
+ProjectIndex: one traversal over pages (flat parent_id and nested widgets) and top_layer feeds every compiler stage.
+"""
+from __future__ import annotations
+
+import copy
+
+from custom_components.esphome_touch_designer.api.views import (
+    ProjectIndex,
+    _collect_widget_ids_from_project,
+    _compile_assets,
+    _compile_fonts_from_project,
+    _compile_ui_lock_globals,
+    _widget_bounds_by_id,
+)
+
+
+def _project(default_project):
+    proj = copy.deepcopy(default_project)
+    proj["pages"][0]["widgets"] = [
+        {"id": "grp", "type": "container", "x": 0, "y": 0, "w": 200, "h": 48},
+        {"id": "spin", "type": "spinbox", "parent_id": "grp", "x": 44, "y": 0, "w": 112, "h": 48},
+        {"id": "dd", "type": "dropdown", "props": {"options": "A\nB"}},
+        {"id": "outer", "type": "container", "x": 5, "y": 5, "w": 100, "h": 100, "widgets": [
+            {"id": "mid", "type": "container", "widgets": [
+                {"id": "deep", "type": "image", "x": 1, "y": 2, "w": 3, "h": 4,
+                 "props": {"src": "asset:deep.png", "font": "asset:Deep.ttf:12"}},
+            ]},
+        ]},
+    ]
+    proj["lvgl_config"] = {"top_layer": {"widgets": [
+        {"id": "tl", "type": "label", "props": {"font": "asset:Top.ttf:20"}},
+    ]}}
+    proj["action_bindings"] = [{"widget_id": "dd", "event": "on_click"}, {"widget_id": "dd", "event": "on_value"}]
+    proj["links"] = [{"source": {"entity_id": "sensor.t"}, "target": {"widget_id": "grp", "action": "label_text"}}]
+    return proj
+
+
+def test_index_covers_nested_and_top_layer(default_project):
+    """ids, types, parents, options, bindings and links are collected in a single build."""
+    idx = ProjectIndex.build(_project(default_project))
+    assert idx.ids == {"grp", "spin", "dd", "outer", "mid", "deep", "tl"}
+    assert idx.type_by_id["deep"] == "image"
+    assert idx.parent_by_id["spin"] == "grp"
+    assert idx.parent_by_id["deep"] == "mid"
+    assert idx.options_by_id["dd"] == ["A", "B"]
+    assert idx.container_spinbox_child == {"grp": "spin"}
+    assert [w["id"] for w in idx.page_children[0]["grp"]] == ["spin"]
+    assert len(idx.action_bindings_by_widget["dd"]) == 2
+    assert idx.on_click_bound == {"dd"}
+    assert list(idx.links_by_entity) == ["sensor.t"]
+    assert [w["id"] for w in idx.widgets][-1] == "tl"
+
+
+def test_stages_see_nested_widgets(default_project):
+    """Fonts, images, bounds and ids reach widgets below the top level of a page."""
+    proj = _project(default_project)
+    fonts_yaml, font_map = _compile_fonts_from_project(proj)
+    assert set(font_map) == {"asset:Deep.ttf:12", "asset:Top.ttf:20"}
+    assert "asset_deep_png" in _compile_assets(proj)
+    assert _widget_bounds_by_id(proj, "deep") == (1, 2, 3, 4)
+    assert "tl" in _collect_widget_ids_from_project(proj)
+
+
+def test_lock_globals_use_spinbox_child(default_project):
+    """A label_text link to a spinbox container locks the spinbox child, not the container."""
+    out = _compile_ui_lock_globals(_project(default_project))
+    assert "etd_lock_sensor_t_spin" in out
+    assert "etd_lock_sensor_t_grp" not in out
+
+
+def test_index_does_not_cast_geometry(make_device, default_project, jc1060_recipe_text):
+    """Bounds are read only for widgets that need them, so odd geometry on another widget cannot fail the compile."""
+    from custom_components.esphome_touch_designer.api.views import compile_to_esphome_yaml
+
+    proj = copy.deepcopy(default_project)
+    proj["pages"][0]["widgets"] = [{"id": "odd", "type": "mystery_widget", "x": None, "y": "top", "props": {}, "style": {}}]
+    idx = ProjectIndex.build(proj)
+    assert idx.widget_by_id["odd"]["x"] is None
+    compile_to_esphome_yaml(make_device(project=proj, recipe_id="jc1060p470_esp32p4_1024x600"), jc1060_recipe_text)
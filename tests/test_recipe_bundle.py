@@ -0,0 +1,78 @@
+"""
+Precompiled builtin recipe bundle: committed file is current, loading seeds the recipe analysis
+cache so builtin recipes are not parsed at request time, and a stale bundle (sizes or content)
+is ignored.
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+
+from custom_components.esphome_touch_designer.api import views as V
+
+
+def _bundle_script(repo_root):
+    spec = importlib.util.spec_from_file_location("build_recipe_bundle", repo_root / "scripts" / "build_recipe_bundle.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_committed_bundle_is_current(repo_root):
+    """Fails when recipes/builtin or the recipe analysis changed without re-running scripts/build_recipe_bundle.py."""
+    script = _bundle_script(repo_root)
+    assert V.RECIPE_BUNDLE_PATH.read_text("utf-8") == script.render_bundle(), (
+        "builtin_bundle.json is stale; run python scripts/build_recipe_bundle.py"
+    )
+
+
+def test_loaded_bundle_serves_builtins_without_parsing(monkeypatch, jc1060_recipe_text):
+    """Listing matches a folder scan; sections, defaults and metadata come from the bundle."""
+    analysis = V._RecipeAnalysis()
+    bundle = V._BuiltinRecipeBundle()
+    monkeypatch.setattr(V, "_RECIPE_ANALYSIS", analysis)
+    monkeypatch.setattr(V, "_BUILTIN_BUNDLE", bundle)
+    assert bundle.load() and bundle.stats()["recipes"] == len(V._scan_builtin_recipes())
+    assert V.list_builtin_recipes() == V._scan_builtin_recipes()
+    assert bundle.text("jc1060p470_esp32p4_1024x600") == jc1060_recipe_text
+
+    def _no_parse(*_args, **_kwargs):
+        raise AssertionError("builtin recipe parsed at request time")
+
+    monkeypatch.setattr(V, "_parse_recipe_into_sections", _no_parse)
+    monkeypatch.setattr(V, "_extract_recipe_metadata_from_text", _no_parse)
+    assert "display" in analysis.sections(jc1060_recipe_text)
+    assert analysis.resolution(jc1060_recipe_text, "jc1060p470_esp32p4_1024x600") == {"width": 1024, "height": 600}
+    defaults = V._build_recipe_default_sections(jc1060_recipe_text, None)
+    assert defaults["wifi"] and analysis.stats()["misses"] == 0
+
+
+def test_stale_bundle_is_ignored(tmp_path):
+    """A bundle whose recipe sizes do not match the files on disk is not used."""
+    doc = json.loads(V.RECIPE_BUNDLE_PATH.read_text("utf-8"))
+    next(iter(doc["recipes"].values()))["size"] += 1
+    stale = tmp_path / "bundle.json"
+    stale.write_text(json.dumps(doc), encoding="utf-8")
+    bundle = V._BuiltinRecipeBundle(stale)
+    assert bundle.load() is False
+    assert bundle.listing() is None and bundle.text("jc1060p470_esp32p4_1024x600") is None
+    assert "changed" in bundle.stats()["error"]
+
+
+def test_same_size_edit_makes_bundle_stale(tmp_path, monkeypatch):
+    """A recipe edited without changing its size no longer matches the bundle's sha256."""
+    builtin = tmp_path / "builtin"
+    builtin.mkdir()
+    for p in V.RECIPES_BUILTIN_DIR.glob("*.yaml"):
+        (builtin / p.name).write_bytes(p.read_bytes())
+    monkeypatch.setattr(V, "RECIPES_BUILTIN_DIR", builtin)
+    assert V._BuiltinRecipeBundle().load() is True
+
+    target = builtin / "jc1060p470_esp32p4_1024x600.yaml"
+    text = target.read_text("utf-8")
+    edited = text.replace("priority: 600", "priority: 601", 1)
+    assert edited != text and len(edited.encode("utf-8")) == len(text.encode("utf-8"))
+    target.write_text(edited, encoding="utf-8")
+    bundle = V._BuiltinRecipeBundle()
+    assert bundle.load() is False and bundle.text("jc1060p470_esp32p4_1024x600") is None
+    assert target.name in bundle.stats()["error"]
@@ -0,0 +1,70 @@
+"""
+Recipe registry: id lookups without folder scans, rebuilds when recipe folders change or a
+recipe view invalidates, text reloads on file edits, cached sections/metadata.
+"""
+from __future__ import annotations
+
+import json
+import os
+
+from custom_components.esphome_touch_designer.api import views as V
+
+
+def _add_user_recipe(config_dir, rid, text, label=None):
+    d = config_dir / "esphome_touch_designer" / "recipes" / "user" / rid
+    d.mkdir(parents=True)
+    (d / "recipe.yaml").write_text(text, encoding="utf-8")
+    if label:
+        (d / "metadata.json").write_text(json.dumps({"label": label}), encoding="utf-8")
+    return d
+
+
+def test_lookup_matches_scan_and_skips_rescans(tmp_path, fake_hass, monkeypatch):
+    """Registry lookups agree with a full scan; repeated lookups do not rescan until a folder changes."""
+    reg = V._RecipeRegistry()
+    monkeypatch.setattr(V, "_RECIPES", reg)
+    hass = fake_hass
+    _add_user_recipe(tmp_path, "mine", "esphome:\n  name: mine\n", label="Mine")
+
+    assert V.list_all_recipes(hass) == V._scan_recipes(hass)
+    for r in V._scan_recipes(hass):
+        assert V._find_recipe_path_by_id(hass, r["id"]) is not None
+    assert V._find_recipe_path_by_id(hass, "mine").name == "recipe.yaml"
+    assert V._find_recipe_path_by_id(hass, "missing") is None
+    assert reg.stats()["rebuilds"] == 1
+
+    _add_user_recipe(tmp_path, "second", "esphome:\n  name: second\n")
+    assert V._resolve_recipe_text(hass, "second", fallback_builtin=False).startswith("esphome:")
+    assert reg.stats()["rebuilds"] == 2
+
+
+def test_invalidate_and_text_reload(tmp_path, fake_hass, monkeypatch):
+    """Label edits show up after invalidate(); a rewritten recipe file is re-read and re-derived."""
+    reg = V._RecipeRegistry()
+    monkeypatch.setattr(V, "_RECIPES", reg)
+    hass = fake_hass
+    d = _add_user_recipe(tmp_path, "mine", "display:\n  - platform: x\n    id: disp_a\n    width: 320\n    height: 240\n", "Old")
+
+    entry = reg.get(hass, "mine")
+    assert entry.display_id() == "disp_a"
+    assert "display" in entry.sections()
+    assert V._resolve_recipe_metadata(hass, "mine")["resolution"] == {"width": 320, "height": 240}
+
+    (d / "metadata.json").write_text(json.dumps({"label": "New"}), encoding="utf-8")
+    reg.invalidate()
+    assert next(r for r in V.list_all_recipes(hass) if r["id"] == "mine")["label"] == "New"
+
+    recipe = d / "recipe.yaml"
+    recipe.write_text("display:\n  - platform: x\n    id: disp_b\n", encoding="utf-8")
+    st = recipe.stat()
+    os.utime(recipe, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert reg.get(hass, "mine").display_id() == "disp_b"
+
+
+def test_builtin_wins_over_user_recipe_with_same_id(tmp_path, fake_hass, monkeypatch):
+    """As with the old scan, the first listed (builtin) recipe wins for a duplicate id."""
+    monkeypatch.setattr(V, "_RECIPES", V._RecipeRegistry())
+    hass = fake_hass
+    rid = "jc1060p470_esp32p4_1024x600"
+    _add_user_recipe(tmp_path, rid, "esphome:\n  name: shadow\n")
+    assert V._find_recipe_path_by_id(hass, rid) == V.RECIPES_BUILTIN_DIR / f"{rid}.yaml"
@@ -0,0 +1,242 @@
+"""
+Live state hub: one shared state-change tracker for the union of entity ids every WebSocket
+connection watches, re-tracked only when that union changes, with per-entity fan-out; per-connection
+senders coalesce changes, rate-limit flushes, batch frames, send attribute deltas and drop
+clients that fall behind.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.esphome_touch_designer.api import views as V
+from custom_components.esphome_touch_designer.const import CONF_STATE_WS_MAX_RATE, DEFAULT_STATE_WS_MAX_RATE
+
+
+class _Tracker:
+    """Stand-in for async_track_state_change_event that records live subscriptions."""
+
+    def __init__(self):
+        self.live = {}
+        self.calls = 0
+
+    def __call__(self, hass, entity_ids, action):
+        self.calls += 1
+        token = object()
+        self.live[token] = (list(entity_ids), action)
+
+        def unsub():
+            del self.live[token]
+
+        return unsub
+
+    def fire(self, entity_id):
+        for ids, action in list(self.live.values()):
+            if entity_id in ids:
+                action(SimpleNamespace(data={"entity_id": entity_id}))
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    t = _Tracker()
+    monkeypatch.setattr(V, "async_track_state_change_event", t)
+    return t
+
+
+def test_union_subscription_and_fan_out(tracker):
+    """Overlapping connections share one tracker; events reach only the connections watching them."""
+    hass = SimpleNamespace(data={})
+    hub = V._state_hub(hass)
+    assert V._state_hub(hass) is hub
+    got_a, got_b = [], []
+    hub.subscribe(got_a.append, ["light.a", "sensor.t"])
+    hub.subscribe(got_b.append, ["sensor.t"])
+    assert tracker.calls == 1 and len(tracker.live) == 1
+    assert next(iter(tracker.live.values()))[0] == ["light.a", "sensor.t"]
+
+    tracker.fire("sensor.t")
+    tracker.fire("light.a")
+    assert got_a == ["sensor.t", "light.a"] and got_b == ["sensor.t"]
+    assert hub.stats() == {"connections": 2, "entities": 2, "events": 2, "deliveries": 3, "retracks": 1}
+
+
+def test_retrack_only_when_union_changes(tracker):
+    """Re-subscribing within the union keeps the tracker; the last unsubscribe releases it."""
+    hub = V._StateHub(SimpleNamespace(data={}))
+    got_a, got_b = [], []
+    hub.subscribe(got_a.append, ["light.a", "sensor.t"])
+    hub.subscribe(got_b.append, ["light.a"])
+    hub.subscribe(got_b.append, ["sensor.t"])
+    assert tracker.calls == 1
+    assert hub.watched(got_b.append) == {"sensor.t"}
+
+    hub.unsubscribe(got_a.append)
+    assert tracker.calls == 2 and next(iter(tracker.live.values()))[0] == ["sensor.t"]
+    tracker.fire("light.a")
+    assert got_a == [] and got_b == []
+
+    hub.unsubscribe(got_b.append)
+    assert tracker.live == {} and hub.stats()["connections"] == 0
+
+
+class _FakeWs:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.sent = []
+        self.closed = None
+
+    async def send_str(self, text):
+        await asyncio.sleep(self.delay)
+        self.sent.append((asyncio.get_running_loop().time(), json.loads(text)))
+
+    async def close(self, code=None, message=b""):
+        self.closed = code
+
+
+def _states_hass(values):
+    return SimpleNamespace(states=SimpleNamespace(
+        get=lambda eid: SimpleNamespace(state=values[eid], attributes={"unit": "W"}) if eid in values else None
+    ))
+
+
+def test_sender_coalesces_and_batches():
+    """Repeated changes before a flush send one latest value per entity in one batch frame."""
+    values = {"sensor.p": "1", "light.a": "on"}
+
+    async def main():
+        ws = _FakeWs()
+        sender = V._StateSender(_states_hass(values), ws, batch=True, max_rate=1000)
+        for v in ("2", "3", "4"):
+            values["sensor.p"] = v
+            sender.notify("sensor.p")
+        sender.notify("light.a")
+        sender.notify("sensor.gone")
+        task = asyncio.ensure_future(sender.run())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        return ws, sender
+
+    ws, sender = asyncio.run(main())
+    assert [m for _, m in ws.sent] == [{"type": "states", "states": [
+        {"type": "state", "entity_id": "sensor.p", "state": "4", "attributes": {"unit": "W"}},
+        {"type": "state", "entity_id": "light.a", "state": "on", "attributes": {"unit": "W"}},
+    ]}]
+    assert sender.coalesced == 2 and sender.frames == 1 and sender.states == 2
+
+
+def test_sender_rate_limit_and_single_messages():
+    """Without batch each entity is its own state message; flushes are at least 1/max_rate apart."""
+    values = {"sensor.p": "1"}
+
+    async def main():
+        ws = _FakeWs()
+        sender = V._StateSender(_states_hass(values), ws, max_rate=10)
+        task = asyncio.ensure_future(sender.run())
+        sender.notify("sensor.p")
+        await asyncio.sleep(0.01)
+        for v in ("2", "3"):
+            values["sensor.p"] = v
+            sender.notify("sensor.p")
+        await asyncio.sleep(0.2)
+        task.cancel()
+        return ws
+
+    ws = asyncio.run(main())
+    assert [m["state"] for _, m in ws.sent] == ["1", "3"]
+    assert all(m["type"] == "state" for _, m in ws.sent)
+    assert ws.sent[1][0] - ws.sent[0][0] >= 0.09
+
+
+def test_sender_disconnects_slow_clients():
+    """A stalled send or a backlog held at the high-water mark closes the socket."""
+    values = {f"sensor.s{i}": "1" for i in range(50)}
+
+    async def stalled():
+        ws = _FakeWs(delay=10)
+        sender = V._StateSender(_states_hass(values), ws, behind_s=0.05)
+        sender.notify("sensor.s0")
+        await asyncio.wait_for(sender.run(), 1)
+        return ws, sender
+
+    async def backlog():
+        ws = _FakeWs()
+        sender = V._StateSender(_states_hass(values), ws, max_rate=100, max_batch=1, high_water=2, behind_s=0.03)
+        for eid in values:
+            sender.notify(eid)
+        await asyncio.wait_for(sender.run(), 1)
+        return ws, sender
+
+    for ws, sender in (asyncio.run(stalled()), asyncio.run(backlog())):
+        assert ws.closed == 1013 and sender.dropped_slow
+    assert 2 <= len(ws.sent) < 10
+
+
+def test_sender_survives_unencodable_attributes():
+    """Datetimes are encoded as ISO strings; an attribute json cannot encode skips only that entity."""
+    import datetime
+
+    when = datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+    states = {
+        "automation.a": SimpleNamespace(state="on", attributes={"last_triggered": when}),
+        "sensor.bad": SimpleNamespace(state="1", attributes={"x": {1j: 1}}),
+        "light.b": SimpleNamespace(state="on", attributes={}),
+    }
+    hass = SimpleNamespace(states=SimpleNamespace(get=states.get))
+
+    async def main():
+        ws = _FakeWs()
+        sender = V._StateSender(hass, ws, batch=True, max_rate=1000)
+        task = asyncio.ensure_future(sender.run())
+        sender.notify("automation.a")
+        sender.notify("sensor.bad")
+        await asyncio.sleep(0.02)
+        sender.notify("light.b")
+        await asyncio.sleep(0.02)
+        assert not task.done()
+        task.cancel()
+        return ws, sender
+
+    ws, sender = asyncio.run(main())
+    frames = [m["states"] for _, m in ws.sent]
+    assert [[s["entity_id"] for s in f] for f in frames] == [["automation.a"], ["light.b"]]
+    assert frames[0][0]["attributes"]["last_triggered"] == "2026-01-02T03:04:05+00:00"
+    assert sender.encode_errors == 1
+
+
+def test_sender_attribute_deltas_and_resync():
+    """Delta mode sends the full state once, then only changed/removed attributes with seq + 1."""
+    attrs = {"temperature": 20, "hvac_modes": ["heat", "off"], "preset": "eco"}
+    st = SimpleNamespace(state="heat", attributes=attrs)
+    hass = SimpleNamespace(states=SimpleNamespace(get=lambda eid: st))
+    sender = V._StateSender(hass, _FakeWs(), delta=True)
+
+    first = sender._payload("climate.x", st)
+    assert first == {"type": "state", "entity_id": "climate.x", "state": "heat", "attributes": attrs, "seq": 1}
+    assert sender._payload("climate.x", st) == {"type": "delta", "entity_id": "climate.x", "seq": 2, "state": "heat"}
+
+    st = SimpleNamespace(state="off", attributes={"temperature": 21, "hvac_modes": ["heat", "off"]})
+    assert sender._payload("climate.x", st) == {
+        "type": "delta", "entity_id": "climate.x", "seq": 3, "state": "off",
+        "attributes": {"temperature": 21}, "removed": ["preset"],
+    }
+    sender.resync(["climate.x"])
+    again = sender._payload("climate.x", st)
+    assert again["type"] == "state" and again["seq"] == 1 and again["attributes"] == st.attributes
+    assert "seq" not in V._StateSender(hass, _FakeWs())._payload("climate.x", st)
+
+
+def test_state_ws_max_rate_option():
+    """The integration option sets the flush rate; missing or invalid values use the default."""
+    entry = SimpleNamespace(options={})
+    hass = SimpleNamespace(
+        data={"esphome_touch_designer": {"active_entry_id": "e1", "e1": {"storage": None}}},
+        config_entries=SimpleNamespace(async_get_entry=lambda eid: entry),
+    )
+    assert V._state_ws_max_rate(hass) == DEFAULT_STATE_WS_MAX_RATE
+    entry.options = {CONF_STATE_WS_MAX_RATE: 2.5}
+    assert V._state_ws_max_rate(hass) == 2.5
+    entry.options = {CONF_STATE_WS_MAX_RATE: "fast"}
+    assert V._state_ws_max_rate(hass) == DEFAULT_STATE_WS_MAX_RATE
@@ -1,7 +1,7 @@
 """
-Tests for storage module: _default_project and _migrate_project.
+Tests for storage module: _default_project, _migrate_project and DashboardStorage write-behind.
 
-No Home Assistant server required; these are pure data-shape and migration logic.
+No Home Assistant server required; the HA Store is replaced by an in-memory fake.
 """
 from __future__ import annotations
 
@@ -85,3 +85,183 @@ def test_migrate_project_preserves_unknown_fields():
     proj = {"model_version": 1, "pages": [{"page_id": "main", "name": "Main", "widgets": []}], "custom_key": "keep"}
     out = _migrate_project(proj)
     assert out.get("custom_key") == "keep"
+
+
+class _FakeStore:
+    """In-memory stand-in for homeassistant.helpers.storage.Store; files are shared per key and
+    delayed saves fire on demand (fire_all_delayed)."""
+
+    files: dict = {}
+    instances: dict = {}
+
+    def __class_getitem__(cls, item):
+        return cls
+
+    def __init__(self, hass, version, key):
+        self.key = key
+        self.writes = 0
+        self.loads = 0
+        self.delayed = None
+        _FakeStore.instances[key] = self
+
+    async def async_load(self):
+        self.loads += 1
+        return _FakeStore.files.get(self.key)
+
+    async def async_save(self, data):
+        self.delayed = None
+        _FakeStore.files[self.key] = data
+        self.writes += 1
+
+    def async_delay_save(self, data_func, delay):
+        self.delayed = data_func
+
+    async def async_remove(self):
+        self.delayed = None
+        _FakeStore.files.pop(self.key, None)
+
+    @classmethod
+    def fire_all_delayed(cls):
+        for store in list(cls.instances.values()):
+            if store.delayed is not None:
+                func, store.delayed = store.delayed, None
+                cls.files[store.key] = func()
+                store.writes += 1
+
+
+@pytest.fixture
+def fake_store(monkeypatch):
+    from custom_components.esphome_touch_designer import storage as storage_mod
+
+    monkeypatch.setattr(storage_mod, "Store", _FakeStore)
+    monkeypatch.setattr(_FakeStore, "files", {})
+    monkeypatch.setattr(_FakeStore, "instances", {})
+    return _FakeStore
+
+
+def _new_storage():
+    from custom_components.esphome_touch_designer.storage import DashboardStorage
+
+    return DashboardStorage(None, "entry1")
+
+
+def test_schedule_save_coalesces_edits(fake_store):
+    """Many scheduled saves produce one shard write at the end of the delay; stats count the avoided writes."""
+    import asyncio
+    from custom_components.esphome_touch_designer.storage import DeviceProject
+
+    storage = _new_storage()
+    dev = DeviceProject(device_id="hall", slug="hall", name="Hall")
+    storage.upsert_device(dev)
+    asyncio.run(storage.async_save())
+    shard = fake_store.instances["esphome_touch_designer.entry1.device.hall"]
+    index = fake_store.instances["esphome_touch_designer.entry1"]
+    assert (shard.writes, index.writes) == (1, 1)
+    for i in range(10):
+        dev.project["pages"][0]["name"] = f"Main {i}"
+        storage.upsert_device(dev)
+        storage.async_schedule_save("hall")
+    assert storage.save_stats()["dirty_devices"] == ["hall"]
+    fake_store.fire_all_delayed()
+    assert shard.writes == 2
+    assert index.writes == 1  # metadata unchanged: only the shard is rewritten
+    assert fake_store.files[shard.key]["project"]["pages"][0]["name"] == "Main 9"
+    stats = storage.save_stats()
+    assert (stats["save_requests"], stats["writes"], stats["saves_avoided"]) == (11, 3, 9)
+    assert not stats["pending"] and stats["dirty_devices"] == []
+    asyncio.run(storage.async_flush())
+    assert shard.writes == 2
+
+    storage.async_schedule_save("hall")  # nothing pending after the write: a new save, not avoided
+    storage.async_schedule_save(None)
+    storage.async_schedule_save(None)
+    assert storage.save_stats()["saves_avoided"] == 10
+    asyncio.run(storage.async_save())
+    storage.async_schedule_save(None)
+    assert storage.save_stats()["saves_avoided"] == 10
+
+
+def test_flush_writes_pending_and_delete_removes_shard(fake_store):
+    """async_flush writes pending saves now; deleting a device removes its shard and index entry."""
+    import asyncio
+    from custom_components.esphome_touch_designer.storage import DeviceProject
+
+    storage = _new_storage()
+    storage.upsert_device(DeviceProject(device_id="a", slug="a", name="A"))
+    storage.async_schedule_save("a")
+    asyncio.run(storage.async_flush())
+    assert fake_store.instances["esphome_touch_designer.entry1.device.a"].delayed is None
+    assert [d["device_id"] for d in fake_store.files["esphome_touch_designer.entry1"]["devices"]] == ["a"]
+    assert "project" not in fake_store.files["esphome_touch_designer.entry1"]["devices"][0]
+    storage.async_schedule_save("a")
+    storage.delete_device("a")
+    asyncio.run(storage.async_save())
+    fake_store.fire_all_delayed()
+    assert "esphome_touch_designer.entry1.device.a" not in fake_store.files
+    assert fake_store.files["esphome_touch_designer.entry1"]["devices"] == []
+
+
+def test_legacy_store_migrates_to_shards_and_loads_lazily(fake_store):
+    """A single-file store is split into index + shards; projects are migrated only when a device is first requested."""
+    import asyncio
+
+    fake_store.files["esphome_touch_designer.entry1"] = {
+        "updated_at": 1.0,
+        "devices": [
+            {"device_id": "a", "slug": "a", "name": "A", "api_key": "k", "project": {"pages": [{"page_id": "p", "name": "P", "widgets": []}]}},
+            {"device_id": "b c", "slug": "bc", "name": "B", "project": None},
+        ],
+    }
+    storage = _new_storage()
+    asyncio.run(storage.async_load())
+    index = fake_store.files["esphome_touch_designer.entry1"]
+    assert index["format"] == 2
+    assert all("project" not in d for d in index["devices"])
+    assert fake_store.files["esphome_touch_designer.entry1.device.a"]["project"] == {"pages": [{"page_id": "p", "name": "P", "widgets": []}]}
+    assert storage.state.devices == {}
+    shard_keys = [k for k in fake_store.files if ".device." in k]
+    assert len(shard_keys) == 2 and "esphome_touch_designer.entry1.device.a" in shard_keys
+    assert not any(" " in k for k in shard_keys)
+
+    fresh = _new_storage()
+    asyncio.run(fresh.async_load())
+    assert [d.device_id for d in fresh.list_devices()] == ["a", "b c"]
+    assert fresh.get_summary("a").api_key == "k"
+    assert fresh.get_device("a") is None
+    assert fresh.save_stats()["shard_loads"] == 0
+    dev = asyncio.run(fresh.async_get_device("a"))
+    assert dev.api_key == "k"
+    assert dev.project["pages"][0]["page_id"] == "p"
+    assert "palette" in dev.project  # migrated on load
+    assert fresh.get_device("a") is dev
+    assert asyncio.run(fresh.async_get_device("missing")) is None
+    assert fresh.save_stats()["shard_loads"] == 1
+
+
+def test_loaded_projects_are_bounded(fake_store, monkeypatch):
+    """Only MAX_LOADED_PROJECTS projects stay resident; clean ones are evicted LRU and reloaded on demand, dirty ones are kept."""
+    import asyncio
+    from custom_components.esphome_touch_designer import storage as storage_mod
+    from custom_components.esphome_touch_designer.storage import DeviceProject
+
+    monkeypatch.setattr(storage_mod, "MAX_LOADED_PROJECTS", 2)
+    storage = _new_storage()
+    for did in ("a", "b", "c"):
+        storage.upsert_device(DeviceProject(device_id=did, slug=did, name=did.upper()))
+    asyncio.run(storage.async_save())
+    fresh = _new_storage()
+    asyncio.run(fresh.async_load())
+
+    async def load(*ids):
+        return [await fresh.async_get_device(i) for i in ids]
+
+    a, b = asyncio.run(load("a", "b"))
+    a.project["pages"][0]["name"] = "edited"
+    fresh.upsert_device(a)
+    fresh.async_schedule_save("a")
+    asyncio.run(load("c"))
+    assert set(fresh.state.devices) == {"a", "c"}  # b evicted, dirty a kept
+    assert fresh.save_stats()["evictions"] == 1
+    (b2,) = asyncio.run(load("b"))
+    assert b2 is not b and b2.name == "B"
+    assert fresh.get_device("a").project["pages"][0]["name"] == "edited"
@@ -0,0 +1,92 @@
+"""
+Widget schema registry: schemas are loaded and merged once, served read-only, and reloaded on mtime change.
+"""
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from custom_components.esphome_touch_designer.api import views
+
+
+def test_registry_returns_merged_schema_once():
+    """Repeated lookups return the same pre-merged object without re-reading the file."""
+    registry = views._WidgetSchemaRegistry()
+    registry.preload()
+    loads = registry.loads
+    first = registry.get("label")
+    second = registry.get("label")
+    assert first is second
+    assert registry.loads == loads
+    assert "esphome" in first
+    assert registry.get("no_such_widget") is None
+
+
+def test_registry_schema_is_read_only():
+    """Cached schemas cannot be mutated; dict() gives a writable copy."""
+    schema = views._load_widget_schema("button")
+    with pytest.raises(TypeError):
+        schema["type"] = "x"
+    with pytest.raises(TypeError):
+        schema["esphome"].setdefault("props", {})
+    copy_ = dict(schema)
+    copy_["type"] = "x"
+    assert schema.get("type") != "x"
+
+
+def test_registry_hot_reloads_on_mtime_change(tmp_path, monkeypatch):
+    """Editing a schema file (new mtime) is picked up on the next lookup after the recheck interval."""
+    widgets_dir = tmp_path / "widgets"
+    widgets_dir.mkdir()
+    path = widgets_dir / "demo.json"
+    path.write_text(json.dumps({"type": "demo", "title": "One", "esphome": {"root_key": "obj"}}), "utf-8")
+    monkeypatch.setattr(views, "_schemas_dir", lambda: widgets_dir)
+    monkeypatch.setattr(views, "_common_extras_dir", lambda: tmp_path)
+    registry = views._WidgetSchemaRegistry()
+    registry.RECHECK_SECONDS = 0
+    assert registry.get("demo")["title"] == "One"
+
+    path.write_text(json.dumps({"type": "demo", "title": "Two", "esphome": {"root_key": "obj"}}), "utf-8")
+    st = path.stat()
+    os.utime(path, (st.st_atime, st.st_mtime + 5))
+    assert registry.get("demo")["title"] == "Two"
+    loads = registry.loads
+    assert registry.get("demo")["title"] == "Two"
+    assert registry.loads == loads
+
+
+def test_schema_edit_invalidates_compile_cache_and_memo(tmp_path, monkeypatch, make_device, default_project, jc1060_recipe_text):
+    """A reloaded schema bumps the registry generation, so cached and memoized compiles re-emit widgets."""
+    import copy
+    import shutil
+
+    schemas = tmp_path / "schemas"
+    shutil.copytree(views._common_extras_dir(), schemas)
+    monkeypatch.setattr(views, "_schemas_dir", lambda: schemas / "widgets")
+    monkeypatch.setattr(views, "_common_extras_dir", lambda: schemas)
+    registry = views._WidgetSchemaRegistry()
+    registry.RECHECK_SECONDS = 0
+    monkeypatch.setattr(views, "_WIDGET_SCHEMAS", registry)
+    views._COMPILE_CACHE.clear()
+    views._SECTION_MEMO.clear()
+
+    project = copy.deepcopy(default_project)
+    project["pages"][0]["widgets"] = [{"id": "lbl", "type": "label", "x": 0, "y": 0, "w": 80, "h": 20, "props": {"text": "Hi"}, "style": {}}]
+    dev = make_device(project=project, recipe_id="jc1060p470_esp32p4_1024x600")
+    before, _ = views.compile_to_esphome_yaml_cached(dev, jc1060_recipe_text)
+    generation = registry.generation
+    assert "text: " in before and "caption: " not in before
+
+    path = schemas / "widgets" / "label.json"
+    schema = json.loads(path.read_text("utf-8"))
+    schema["esphome"]["props"]["text"] = "caption"
+    path.write_text(json.dumps(schema), "utf-8")
+    st = path.stat()
+    os.utime(path, (st.st_atime, st.st_mtime + 5))
+
+    after, _ = views.compile_to_esphome_yaml_cached(dev, jc1060_recipe_text)
+    assert registry.generation == generation + 1
+    assert "caption: " in after
+    assert views.compile_to_esphome_yaml(dev, recipe_text=jc1060_recipe_text) == after